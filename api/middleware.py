@@ -0,0 +1,90 @@
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+from django.utils.regex_helper import _lazy_re_compile
+from django.utils.text import compress_string
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli is optional
+    brotli = None
+
+ENCODING_RE = _lazy_re_compile(r"\s*([\w*-]+)\s*(?:;\s*q\s*=\s*([\d.]+))?")
+
+
+def accepted_encodings(header: str) -> dict:
+    """Maps the codings of an ``Accept-Encoding`` header to their q-values."""
+    encodings = {}
+    for part in header.split(","):
+        match = ENCODING_RE.match(part)
+        if not match:
+            continue
+        try:
+            encodings[match[1].lower()] = float(match[2] or 1)
+        except ValueError:
+            continue
+    return encodings
+
+
+class CompressionMiddleware(MiddlewareMixin):
+    """Compresses API responses of at least ``RESPONSE_COMPRESSION_MIN_LENGTH`` bytes.
+
+    Only JSON responses of views in the ``api`` namespace that set no CSRF
+    cookie are compressed. HTML pages such as the admin and the browsable
+    API reflect user input next to CSRF tokens, and compressing them would
+    expose the tokens to BREACH; they are served uncompressed, as before.
+
+    Brotli is preferred when the client accepts it and the ``brotli`` package
+    is installed, gzip otherwise. Like Django's ``GZipMiddleware`` it skips
+    responses that are already encoded and weakens strong ETags. Streaming
+    responses pass through untouched: they pick their own compression, e.g.
+    ``products/export/?gzip=1``.
+    """
+
+    def process_response(self, request, response):
+        if not self.is_compressible(request, response):
+            return response
+
+        patch_vary_headers(response, ("Accept-Encoding",))
+        encoding = self.select_encoding(request.META.get("HTTP_ACCEPT_ENCODING", ""))
+        if encoding is None:
+            return response
+
+        if encoding == "br":
+            compressed = brotli.compress(
+                response.content, quality=settings.RESPONSE_BROTLI_QUALITY
+            )
+        else:
+            compressed = compress_string(response.content, max_random_bytes=100)
+        if len(compressed) >= len(response.content):
+            return response
+
+        response.content = compressed
+        response.headers["Content-Length"] = str(len(compressed))
+        response.headers["Content-Encoding"] = encoding
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response.headers["ETag"] = "W/" + etag
+        return response
+
+    @staticmethod
+    def is_compressible(request, response) -> bool:
+        if response.streaming or response.has_header("Content-Encoding"):
+            return False
+        resolver_match = getattr(request, "resolver_match", None)
+        if resolver_match is None or resolver_match.namespaces[:1] != ["api"]:
+            return False
+        if not response.get("Content-Type", "").startswith("application/json"):
+            return False
+        if settings.CSRF_COOKIE_NAME in response.cookies:
+            return False
+        return len(response.content) >= settings.RESPONSE_COMPRESSION_MIN_LENGTH
+
+    @staticmethod
+    def select_encoding(header: str):
+        encodings = accepted_encodings(header)
+        if brotli is not None and encodings.get("br", 0) > 0:
+            return "br"
+        if encodings.get("gzip", encodings.get("*", 0)) > 0:
+            return "gzip"
+        return None
@@ -0,0 +1,114 @@
+import hashlib
+import logging
+import time
+from functools import wraps
+from typing import Callable, Iterable, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.translation import get_language
+from rest_framework import status
+from rest_framework.response import Response
+
+from services.cache.generations import CacheGenerations
+from services.cache.single_flight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+OUTCOME_HEADERS = {
+    "leader": "MISS",
+    "stale": "STALE",
+    "coalesced": "COALESCED",
+    "fallback": "MISS",
+}
+
+
+def cached_response(
+    key_prefix: str,
+    scopes: Optional[Callable[..., Iterable[str]]] = None,
+    ttl: Optional[int] = None,
+    fresh_for: Optional[int] = None,
+):
+    """Caches the data of successful responses of an API view method.
+
+    When ``scopes`` is given, the cache key includes the current generations
+    of ``scopes(request, **kwargs)``, so responses are invalidated as soon as
+    their data changes and can be kept for ``ttl`` seconds. After
+    ``fresh_for`` seconds a response is stale. Rebuilding goes through
+    ``SingleFlight``: one request computes the response while the others get
+    the stale copy, or wait for the result when there is none, so an expired
+    popular URL costs one query on the whole cluster.
+    """
+
+    def decorator(method):
+        @wraps(method)
+        def wrapper(view, request, *args, **kwargs):
+            try:
+                generations = (
+                    CacheGenerations().get_many(scopes(request, **kwargs))
+                    if scopes
+                    else {}
+                )
+                key = _cache_key(
+                    key_prefix, request.get_full_path(), get_language(), generations
+                )
+                entry = cache.get(key)
+            except Exception as e:
+                logger.warning(f"Response cache unavailable for {key_prefix}: {e}")
+                return method(view, request, *args, **kwargs)
+
+            if entry is not None and entry["fresh_until"] > time.time():
+                return _cached(entry, "HIT")
+
+            cache_ttl = ttl or settings.API_CACHE_TTL
+            cache_fresh_for = fresh_for or settings.API_CACHE_FRESH_FOR
+            computed = {}
+
+            def compute():
+                response = method(view, request, *args, **kwargs)
+                computed["response"] = response
+                if response.status_code != status.HTTP_200_OK:
+                    return None
+                fresh = {
+                    "data": response.data,
+                    "fresh_until": time.time() + cache_fresh_for,
+                }
+                cache.set(key, fresh, cache_ttl)
+                return fresh
+
+            result, outcome = SingleFlight(f"api:{key_prefix}").run(
+                key,
+                compute,
+                load=lambda: _fresh(cache.get(key)),
+                stale=entry,
+            )
+            state = OUTCOME_HEADERS[outcome]
+            if entry is not None and state == "MISS":
+                state = "REFRESH"
+            if "response" in computed:
+                response = computed["response"]
+                response["X-Cache"] = state
+                return response
+            return _cached(result, state)
+
+        return wrapper
+
+    return decorator
+
+
+def _cache_key(key_prefix: str, path: str, language: str, generations: dict) -> str:
+    version = ",".join(f"{scope}={value}" for scope, value in generations.items())
+    digest = hashlib.md5(f"{path}|{language}|{version}".encode()).hexdigest()
+    return f"api:{key_prefix}:{digest}"
+
+
+def _fresh(entry: Optional[dict]) -> Optional[dict]:
+    if entry is not None and entry["fresh_until"] > time.time():
+        return entry
+    return None
+
+
+def _cached(entry: dict, state: str) -> Response:
+    return Response(
+        entry["data"], status=status.HTTP_200_OK, headers={"X-Cache": state}
+    )
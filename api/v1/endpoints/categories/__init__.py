@@ -1,7 +1,11 @@
 from .list import CategoryListView
 from .detail import CategoryDetailView
+from .products import CategoryProductListView
+from .tree import CategoryTreeView
 
 __all__ = [
     "CategoryListView",
     "CategoryDetailView",
+    "CategoryProductListView",
+    "CategoryTreeView",
 ]
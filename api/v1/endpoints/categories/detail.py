@@ -1,25 +1,35 @@
 import logging
 
-from django.db.models import Prefetch
-from django.utils.decorators import method_decorator
-from django.views.decorators.cache import cache_page
+from django.urls import reverse
 from drf_spectacular.utils import OpenApiResponse, extend_schema
 from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from api.v1.cache import cached_response
 from api.v1.exceptions import CategoryNotFound
+from api.v1.pagination import ProductKeysetPagination
 from api.v1.serializers.category import CategoryDetailSerializer
-from main.models import Category, Product
+from main.models import Category
+from services.cache.generations import CATEGORIES_SCOPE, category_scope
+
+from .products import subtree_products
 
 logger = logging.getLogger(__name__)
 
 
-@method_decorator(name="get", decorator=cache_page(60, key_prefix="category_detail"))
+def category_detail_scopes(request, category_id):
+    """The detail embeds products of the whole subtree, which its scope covers."""
+    return [CATEGORIES_SCOPE, category_scope(category_id)]
+
+
 class CategoryDetailView(APIView):
     @extend_schema(
         summary="Get category details",
-        description="Returns category details with its children and active products.",
+        description=(
+            "Returns category details with its children and the first page of "
+            "active products of its subtree. `products_next` links to the next page."
+        ),
         responses={
             200: CategoryDetailSerializer,
             404: OpenApiResponse(
@@ -32,16 +42,26 @@ class CategoryDetailView(APIView):
             ),
         },
     )
+    @cached_response(
+        key_prefix="category_detail",
+        scopes=category_detail_scopes,
+    )
     def get(self, request, category_id):
         try:
-            category = Category.objects.prefetch_related(
-                Prefetch(
-                    "products",
-                    queryset=Product.objects.filter(is_active=True),
-                    to_attr="active_products",
-                ),
-                "children",
-            ).get(id=category_id, is_active=True)
+            category = Category.objects.prefetch_related("children").get(
+                id=category_id, is_active=True
+            )
+
+            # Only the first page of the subtree listing is embedded; the
+            # rest is served by the category products endpoint.
+            paginator = ProductKeysetPagination()
+            paginator.base_url = request.build_absolute_uri(
+                reverse("api:v1:category-products", args=[category.id])
+            )
+            category.active_products = paginator.paginate_queryset(
+                subtree_products(category), request, view=self
+            )
+            category.products_next = paginator.get_next_link()
 
             serializer = CategoryDetailSerializer(
                 category, context={"request": request}
@@ -1,21 +1,20 @@
 import logging
 
 from django.db.models import Count
-from django.utils.decorators import method_decorator
-from django.views.decorators.cache import cache_page
 from drf_spectacular.utils import OpenApiResponse, extend_schema
 from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from api.v1.cache import cached_response
 from api.v1.exceptions import InvalidCategoryData
 from api.v1.serializers.category import CategoryListSerializer
 from main.models import Category
+from services.cache.generations import CATEGORIES_SCOPE
 
 logger = logging.getLogger(__name__)
 
 
-@method_decorator(name="get", decorator=cache_page(60 * 3, key_prefix="category_list"))
 class CategoryListView(APIView):
     @extend_schema(
         summary="Get list of root categories",
@@ -28,6 +27,9 @@ class CategoryListView(APIView):
             ),
         },
     )
+    @cached_response(
+        key_prefix="category_list", scopes=lambda request: [CATEGORIES_SCOPE]
+    )
     def get(self, request):
         try:
             categories = (
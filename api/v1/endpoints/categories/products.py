@@ -0,0 +1,62 @@
+from django.db.models import QuerySet
+from drf_spectacular.utils import OpenApiParameter, OpenApiTypes, extend_schema
+from rest_framework.generics import ListAPIView
+
+from api.v1.endpoints.products.mixins import ProductRowsListMixin
+from api.v1.exceptions import CategoryNotFound
+from api.v1.pagination import ProductKeysetPagination
+from api.v1.serializers.product import ProductShortSerializer
+from main.models import Category, Product
+
+
+def subtree_products(category: Category) -> QuerySet:
+    """Active products of ``category`` and all its active descendants.
+
+    The descendants are one range of the ``(tree_id, lft)`` index, selected
+    in a subquery, so the category tree is never walked in Python.
+    """
+    descendants = Category.objects.filter(
+        tree_id=category.tree_id,
+        lft__gte=category.lft,
+        lft__lte=category.rght,
+        is_active=True,
+    )
+    return Product.objects.filter(is_active=True, category__in=descendants.values("id"))
+
+
+class CategoryProductListView(ProductRowsListMixin, ListAPIView):
+    serializer_class = ProductShortSerializer
+    pagination_class = ProductKeysetPagination
+
+    @extend_schema(
+        summary="Get products of a category subtree",
+        description=(
+            "Returns active products of the category and all its subcategories, "
+            "one page at a time. Follow `next` for the following page."
+        ),
+        parameters=[
+            OpenApiParameter(
+                name="ordering",
+                type=OpenApiTypes.STR,
+                required=False,
+                enum=list(ProductKeysetPagination.orderings),
+            ),
+            OpenApiParameter(
+                name="fields",
+                type=OpenApiTypes.STR,
+                required=False,
+                description="Comma-separated fields to return, e.g. fields=id,name,price",
+            ),
+        ],
+    )
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
+
+    def get_queryset(self):
+        try:
+            category = Category.objects.get(
+                id=self.kwargs["category_id"], is_active=True
+            )
+        except Category.DoesNotExist:
+            raise CategoryNotFound()
+        return subtree_products(category)
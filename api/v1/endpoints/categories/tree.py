@@ -0,0 +1,50 @@
+import gzip
+
+from django.http import HttpResponse
+from django.utils.http import parse_etags
+from drf_spectacular.utils import OpenApiResponse, extend_schema
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from api.middleware import accepted_encodings
+from services.product.category_tree import CategoryTreeCache
+
+
+def etag_matches(etag: str, if_none_match: str) -> bool:
+    """Weak comparison of ``etag`` with the entity-tags of ``If-None-Match``."""
+    etags = parse_etags(if_none_match)
+    if "*" in etags:
+        return True
+    return etag.removeprefix("W/") in {tag.removeprefix("W/") for tag in etags}
+
+
+class CategoryTreeView(APIView):
+    @extend_schema(
+        summary="Get the full category tree",
+        description=(
+            "Returns all active categories nested under their parents. The "
+            "response carries an ETag and is sent gzipped when the client "
+            "accepts it."
+        ),
+        responses={
+            200: OpenApiResponse(description="Nested list of categories"),
+            304: OpenApiResponse(description="Not modified since the given ETag"),
+        },
+    )
+    def get(self, request):
+        entry = CategoryTreeCache().get()
+        encodings = accepted_encodings(request.headers.get("Accept-Encoding", ""))
+        use_gzip = encodings.get("gzip", encodings.get("*", 0)) > 0
+        # Each encoding is a representation of its own with its own strong ETag.
+        etag = f'{entry["etag"][:-1]}-gz"' if use_gzip else entry["etag"]
+        headers = {"ETag": etag, "Vary": "Accept-Encoding"}
+        if etag_matches(etag, request.headers.get("If-None-Match", "")):
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+        if use_gzip:
+            body = entry["body"]
+            headers["Content-Encoding"] = "gzip"
+        else:
+            body = gzip.decompress(entry["body"])
+        return HttpResponse(body, content_type="application/json", headers=headers)
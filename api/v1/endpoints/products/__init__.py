@@ -1,9 +1,19 @@
 from .list import ProductListView
+from .batch import ProductBatchView
 from .detail import ProductDetailView
+from .export import ProductExportView
+from .facets import ProductFacetsView
+from .indexed import ProductIndexedListView
+from .suggest import SuggestView
 from api.v1.endpoints.stats.statistics import TopViewedProductsView
 
 __all__ = [
     "ProductListView",
+    "ProductBatchView",
     "ProductDetailView",
+    "ProductExportView",
+    "ProductFacetsView",
+    "ProductIndexedListView",
+    "SuggestView",
     "TopViewedProductsView",
 ]
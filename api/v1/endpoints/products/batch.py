@@ -0,0 +1,126 @@
+import logging
+from typing import Dict, Iterable, List
+
+from django.conf import settings
+from drf_spectacular.utils import (
+    OpenApiParameter,
+    OpenApiResponse,
+    OpenApiTypes,
+    extend_schema,
+)
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from api.v1.filters.product import parse_sparse_fields
+from api.v1.serializers.product import ProductDetailSerializer
+from main.models import Product
+from services.product.detail_cache import ProductDetailCache
+from services.product.views_counter import ViewsCounter
+
+logger = logging.getLogger(__name__)
+
+
+def parse_ids(raw_ids: str, max_ids: int) -> List[int]:
+    """Parses ``ids=3,1,2`` into unique IDs, keeping the request order."""
+    try:
+        ids = [int(id_) for id_ in raw_ids.split(",") if id_.strip()]
+    except ValueError:
+        raise ValidationError({"ids": "Expected comma-separated product IDs."})
+    ids = list(dict.fromkeys(ids))
+    if not ids:
+        raise ValidationError({"ids": "At least one product ID is required."})
+    if len(ids) > max_ids:
+        raise ValidationError({"ids": f"At most {max_ids} product IDs are allowed."})
+    return ids
+
+
+class ProductBatchView(APIView):
+    """Product details of several products in one request.
+
+    Payloads come from ``ProductDetailCache``; the missing ones are loaded
+    with one query and cached for the next request. Views are not counted.
+    """
+
+    @extend_schema(
+        summary="Get details of several products",
+        description=(
+            "Returns the details of the given active products in the order of "
+            "`ids`. Unknown or inactive IDs are listed in `missing`."
+        ),
+        parameters=[
+            OpenApiParameter(
+                name="ids",
+                type=OpenApiTypes.STR,
+                required=True,
+                description="Comma-separated product IDs, e.g. ids=12,5,40",
+            ),
+            OpenApiParameter(
+                name="fields",
+                type=OpenApiTypes.STR,
+                required=False,
+                description="Comma-separated fields to return, e.g. fields=id,name,price",
+            ),
+        ],
+        responses={
+            200: OpenApiResponse(description="Products in request order"),
+            400: OpenApiResponse(description="Invalid or too many IDs"),
+        },
+    )
+    def get(self, request):
+        ids = parse_ids(
+            request.query_params.get("ids", ""), settings.PRODUCT_BATCH_MAX_IDS
+        )
+        payloads = self._payloads(ids, request)
+
+        found = [product_id for product_id in ids if product_id in payloads]
+        fields = parse_sparse_fields(
+            request.query_params.get("fields"), list(ProductDetailSerializer().fields)
+        )
+
+        pending = self._pending_views(found) if "views_count" in fields else {}
+        results = []
+        for product_id in found:
+            data = {field: payloads[product_id][field] for field in fields}
+            if product_id in pending:
+                data["views_count"] += pending[product_id]
+            results.append(data)
+
+        return Response(
+            {
+                "results": results,
+                "missing": [
+                    product_id for product_id in ids if product_id not in payloads
+                ],
+            }
+        )
+
+    def _payloads(self, ids: List[int], request) -> Dict[int, dict]:
+        detail_cache = ProductDetailCache()
+        payloads = {
+            product_id: entry["data"]
+            for product_id, entry in detail_cache.get_many(ids).items()
+        }
+
+        missing = [product_id for product_id in ids if product_id not in payloads]
+        if missing:
+            products = list(Product.objects.filter(is_active=True, id__in=missing))
+            serialized = ProductDetailSerializer(
+                products, many=True, context={"request": request}
+            ).data
+            entries = detail_cache.set_many(
+                (product.id, product.modified, data)
+                for product, data in zip(products, serialized)
+            )
+            payloads.update(
+                (product_id, entry["data"]) for product_id, entry in entries.items()
+            )
+        return payloads
+
+    @staticmethod
+    def _pending_views(product_ids: Iterable[int]) -> Dict[int, int]:
+        try:
+            return ViewsCounter().pending(product_ids)
+        except Exception as e:
+            logger.warning(f"Failed to read pending views: {e}")
+            return {}
@@ -1,14 +1,18 @@
 import logging
+from typing import Optional
 
-from django.db.models import F
 from django.shortcuts import get_object_or_404
 from drf_spectacular.utils import OpenApiParameter, OpenApiResponse, extend_schema
 from rest_framework import status
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from api.v1.filters.product import parse_sparse_fields
 from api.v1.serializers.product import ProductDetailSerializer
 from main.models import Product
+from services.product.detail_cache import ProductDetailCache
+from services.product.views_counter import ViewsCounter
 
 logger = logging.getLogger(__name__)
 
@@ -16,17 +20,25 @@ logger = logging.getLogger(__name__)
 class ProductDetailView(APIView):
     @extend_schema(
         summary="Get product details by ID",
-        description="Retrieve detailed information about a specific product and increment its views count.",
+        description="Retrieve detailed information about a specific product and count the view.",
         parameters=[
             OpenApiParameter(
                 name="product_id",
                 type=int,
                 location=OpenApiParameter.PATH,
                 description="ID of the product",
-            )
+            ),
+            OpenApiParameter(
+                name="fields",
+                type=str,
+                location=OpenApiParameter.QUERY,
+                required=False,
+                description="Comma-separated fields to return, e.g. fields=id,name,price",
+            ),
         ],
         responses={
             200: ProductDetailSerializer,
+            304: OpenApiResponse(description="Not modified since the given ETag"),
             404: OpenApiResponse(
                 description="Product not found",
                 examples={"application/json": {"error": "Product not found"}},
@@ -39,17 +51,35 @@ class ProductDetailView(APIView):
     )
     def get(self, request, product_id):
         try:
-            product = get_object_or_404(
-                Product.objects.filter(is_active=True), id=product_id
-            )
+            detail_cache = ProductDetailCache()
+            entry = detail_cache.get(product_id)
+            if entry is None:
+                product = get_object_or_404(
+                    Product.objects.filter(is_active=True), id=product_id
+                )
+                serializer = ProductDetailSerializer(
+                    product, context={"request": request}
+                )
+                entry = detail_cache.set(product.id, product.modified, serializer.data)
 
-            product.views_count = F("views_count") + 1
-            product.save(update_fields=["views_count"])
-            product.refresh_from_db()
+            pending_views = self._record_view(product_id, entry["data"].get("category"))
+            raw_fields = request.query_params.get("fields")
+            fields = parse_sparse_fields(raw_fields, list(entry["data"]))
+            etag = entry["etag"]
+            if raw_fields:
+                # Every projection is a representation of its own.
+                etag = f'{etag[:-1]};{",".join(fields)}"'
+            headers = {"ETag": etag}
+            if etag in request.headers.get("If-None-Match", ""):
+                return Response(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
 
-            serializer = ProductDetailSerializer(product, context={"request": request})
-            return Response(serializer.data, status=status.HTTP_200_OK)
+            data = {field: entry["data"][field] for field in fields}
+            if "views_count" in data:
+                data["views_count"] += pending_views
+            return Response(data, status=status.HTTP_200_OK, headers=headers)
 
+        except ValidationError:
+            raise
         except Product.DoesNotExist:
             return Response(
                 {"error": "Product not found"}, status=status.HTTP_404_NOT_FOUND
@@ -57,3 +87,10 @@ class ProductDetailView(APIView):
         except Exception as e:
             logger.exception(f"Error fetching product {product_id}: {e}")
             return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    def _record_view(self, product_id: int, category_id: Optional[int]) -> int:
+        try:
+            return ViewsCounter().increment(product_id, category_id)
+        except Exception as e:
+            logger.warning(f"Failed to count view of product {product_id}: {e}")
+            return 0
@@ -0,0 +1,202 @@
+import csv
+import io
+import json
+import logging
+import zlib
+from typing import Iterator, Sequence
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import QuerySet
+from django.http import StreamingHttpResponse
+from drf_spectacular.utils import OpenApiParameter, OpenApiTypes, extend_schema
+from rest_framework.exceptions import ValidationError
+from rest_framework.negotiation import BaseContentNegotiation
+
+from api.v1.filters.product import parse_sparse_fields
+from api.v1.serializers.product import ProductRowSerializer
+
+from .list import ProductListView
+
+logger = logging.getLogger(__name__)
+
+EXPORT_FIELDS = (
+    "id",
+    "external_id",
+    "vendor",
+    "article",
+    "name",
+    "price",
+    "old_price",
+    "promo_price",
+    "currency",
+    "stock_quantity",
+    "available",
+    "category_id",
+    "url",
+    "views_count",
+    "is_new",
+    "modified",
+)
+
+
+class ProductExport:
+    """Streams products as NDJSON or CSV, optionally gzipped.
+
+    Rows are read through a server-side cursor, ``chunk_size`` at a time, and
+    each chunk is encoded and yielded before the next one is fetched, so
+    memory stays flat however large the catalog is. The queryset is read
+    unordered, which lets PostgreSQL answer it with one sequential scan.
+    """
+
+    OUTPUTS = {
+        "ndjson": ("application/x-ndjson", "ndjson"),
+        "csv": ("text/csv; charset=utf-8", "csv"),
+    }
+
+    def __init__(
+        self,
+        output: str = "ndjson",
+        fields: Sequence[str] = EXPORT_FIELDS,
+        compress: bool = False,
+        chunk_size: int = 2000,
+    ):
+        self.output = output
+        self.fields = tuple(fields)
+        self.compress = compress
+        self.chunk_size = chunk_size
+        self.serializer = ProductRowSerializer(self.fields)
+
+    @property
+    def content_type(self) -> str:
+        return "application/gzip" if self.compress else self.OUTPUTS[self.output][0]
+
+    @property
+    def filename(self) -> str:
+        extension = self.OUTPUTS[self.output][1]
+        return f"products.{extension}.gz" if self.compress else f"products.{extension}"
+
+    def stream(self, queryset: QuerySet) -> Iterator[bytes]:
+        chunks = self._encode(queryset)
+        if self.compress:
+            chunks = self._gzip(chunks)
+        yield from chunks
+
+    def _encode(self, queryset: QuerySet) -> Iterator[bytes]:
+        rows = (
+            queryset.order_by()
+            .values(*self.fields)
+            .iterator(chunk_size=self.chunk_size)
+        )
+        if self.output == "csv":
+            encode = self._csv_lines
+            yield self._csv_lines([dict(zip(self.fields, self.fields))])
+        else:
+            encode = self._ndjson_lines
+
+        count = 0
+        chunk = []
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) == self.chunk_size:
+                yield encode(self.serializer.to_representation(chunk))
+                count += len(chunk)
+                chunk = []
+        if chunk:
+            yield encode(self.serializer.to_representation(chunk))
+            count += len(chunk)
+        logger.info(f"Exported {count} products as {self.output}")
+
+    def _ndjson_lines(self, items) -> bytes:
+        return "".join(
+            json.dumps(item, cls=DjangoJSONEncoder, ensure_ascii=False) + "\n"
+            for item in items
+        ).encode()
+
+    def _csv_lines(self, items) -> bytes:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for item in items:
+            writer.writerow([item[field] for field in self.fields])
+        return buffer.getvalue().encode()
+
+    @staticmethod
+    def _gzip(chunks: Iterator[bytes]) -> Iterator[bytes]:
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        for chunk in chunks:
+            compressed = compressor.compress(chunk)
+            if compressed:
+                yield compressed
+        yield compressor.flush()
+
+
+class ExportContentNegotiation(BaseContentNegotiation):
+    """Skips ``Accept`` matching: exports pick their format from ``output``.
+
+    Errors are still rendered with the first renderer, as JSON.
+    """
+
+    def select_parser(self, request, parsers):
+        return parsers[0]
+
+    def select_renderer(self, request, renderers, format_suffix=None):
+        return renderers[0], renderers[0].media_type
+
+
+class ProductExportView(ProductListView):
+    """The whole filtered product list in one streamed response.
+
+    Accepts the filters of ``ProductListView``; ordering and pagination do
+    not apply.
+    """
+
+    pagination_class = None
+    content_negotiation_class = ExportContentNegotiation
+
+    @extend_schema(
+        summary="Export products",
+        description=(
+            "Streams every product matching the list filters as NDJSON or CSV "
+            "in one response, in no particular order."
+        ),
+        parameters=[
+            OpenApiParameter(
+                name="output",
+                type=OpenApiTypes.STR,
+                enum=list(ProductExport.OUTPUTS),
+                description="Response format, ndjson by default",
+            ),
+            OpenApiParameter(
+                name="gzip",
+                type=OpenApiTypes.BOOL,
+                description="Compress the response with gzip",
+            ),
+            OpenApiParameter(
+                name="fields",
+                type=OpenApiTypes.STR,
+                description="Comma-separated fields to export, e.g. fields=id,price",
+            ),
+        ],
+        responses={(200, "application/x-ndjson"): OpenApiTypes.BINARY},
+    )
+    def get(self, request, *args, **kwargs):
+        output = request.query_params.get("output", "ndjson")
+        if output not in ProductExport.OUTPUTS:
+            raise ValidationError(
+                {"output": f"Expected one of: {', '.join(ProductExport.OUTPUTS)}."}
+            )
+
+        export = ProductExport(
+            output=output,
+            fields=parse_sparse_fields(
+                request.query_params.get("fields"), EXPORT_FIELDS
+            ),
+            compress=request.query_params.get("gzip") in ("1", "true"),
+            chunk_size=settings.PRODUCT_EXPORT_CHUNK_SIZE,
+        )
+        queryset = self.filter_queryset(self.get_queryset())
+        response = StreamingHttpResponse(
+            export.stream(queryset), content_type=export.content_type
+        )
+        response["Content-Disposition"] = f'attachment; filename="{export.filename}"'
+        return response
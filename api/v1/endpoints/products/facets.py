@@ -0,0 +1,61 @@
+import logging
+
+from drf_spectacular.utils import (
+    OpenApiParameter,
+    OpenApiResponse,
+    OpenApiTypes,
+    extend_schema,
+)
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from api.v1.exceptions import CategoryNotFound, InvalidCategoryData
+from api.v1.filters.product import parse_attribute_filters
+from api.v1.serializers.product import FacetSerializer
+from main.models import Category
+from services.product.facets import FacetEngine
+
+logger = logging.getLogger(__name__)
+
+
+class ProductFacetsView(APIView):
+    @extend_schema(
+        summary="Attribute facet counts of a category",
+        description=(
+            "Returns the filterable attributes of a category with the number of "
+            "active products per value, narrowed by the other `attrs` filters."
+        ),
+        parameters=[
+            OpenApiParameter(name="category", type=OpenApiTypes.INT, required=True),
+            OpenApiParameter(
+                name="attrs",
+                type=OpenApiTypes.STR,
+                location=OpenApiParameter.QUERY,
+                description="Attribute filters. Format: attrs=color:Red,Blue&attrs=size:M",
+                many=True,
+            ),
+        ],
+        responses={
+            200: FacetSerializer(many=True),
+            400: OpenApiResponse(description="Missing or invalid category"),
+            404: OpenApiResponse(description="Category not found"),
+        },
+    )
+    def get(self, request):
+        try:
+            category_id = int(request.query_params.get("category", ""))
+        except ValueError:
+            raise InvalidCategoryData("'category' must be an integer category ID.")
+
+        try:
+            category = Category.objects.get(id=category_id, is_active=True)
+        except Category.DoesNotExist:
+            raise CategoryNotFound()
+
+        facets = FacetEngine(category).facets(
+            parse_attribute_filters(request.query_params.getlist("attrs"))
+        )
+        return Response(
+            FacetSerializer(facets, many=True).data, status=status.HTTP_200_OK
+        )
@@ -0,0 +1,107 @@
+import logging
+
+from drf_spectacular.utils import (
+    OpenApiParameter,
+    OpenApiResponse,
+    OpenApiTypes,
+    extend_schema,
+)
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+from rest_framework.views import APIView
+
+from api.v1.exceptions import InvalidCategoryData
+from api.v1.filters.product import parse_attribute_filters
+from api.v1.serializers.product import ProductShortSerializer
+from main.models import Category, Product
+from services.product.bitmap_index import ProductBitmapIndex, page_products
+from services.product.facets import (
+    filter_by_attribute_values,
+    resolve_attribute_filters,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class ProductIndexedListView(APIView):
+    max_limit = 100
+
+    @extend_schema(
+        summary="Filter products through the bitmap index",
+        description=(
+            "Returns active products of a category subtree matching all `attrs` "
+            "filters, in ID order. Pages continue with `after`, the last ID seen."
+        ),
+        parameters=[
+            OpenApiParameter(name="category", type=OpenApiTypes.INT, required=False),
+            OpenApiParameter(
+                name="attrs",
+                type=OpenApiTypes.STR,
+                location=OpenApiParameter.QUERY,
+                description="Attribute filters. Format: attrs=color:Red,Blue&attrs=size:M",
+                many=True,
+            ),
+            OpenApiParameter(name="after", type=OpenApiTypes.INT, required=False),
+            OpenApiParameter(name="limit", type=OpenApiTypes.INT, required=False),
+        ],
+        responses={
+            200: ProductShortSerializer(many=True),
+            400: OpenApiResponse(description="Invalid parameters"),
+        },
+    )
+    def get(self, request):
+        try:
+            category_id = request.query_params.get("category")
+            category_id = int(category_id) if category_id else None
+            after = max(0, int(request.query_params.get("after", 0)))
+            limit = int(request.query_params.get("limit", 20))
+        except ValueError:
+            raise InvalidCategoryData(
+                "'category', 'after' and 'limit' must be integers."
+            )
+        limit = max(1, min(limit, self.max_limit))
+
+        selection = resolve_attribute_filters(
+            parse_attribute_filters(request.query_params.getlist("attrs"))
+        )
+        queryset = Product.objects.filter(is_active=True)
+
+        index = ProductBitmapIndex()
+        if index.is_built():
+            matched = index.filter(selection, category_id=category_id)
+            count = len(matched)
+            products, next_after = page_products(matched, queryset, after, limit)
+        else:
+            logger.warning("Product bitmap index is not built, filtering in SQL")
+            count, products, next_after = self._filter_in_sql(
+                queryset, selection, category_id, after, limit
+            )
+
+        next_link = None
+        if next_after is not None:
+            next_link = replace_query_param(
+                request.build_absolute_uri(), "after", next_after
+            )
+        serializer = ProductShortSerializer(
+            products, many=True, context={"request": request}
+        )
+        return Response(
+            {"count": count, "next": next_link, "results": serializer.data},
+            status=status.HTTP_200_OK,
+        )
+
+    def _filter_in_sql(self, queryset, selection, category_id, after, limit):
+        if category_id is not None:
+            category = Category.objects.filter(id=category_id).first()
+            if category is None:
+                return 0, [], None
+            queryset = queryset.filter(
+                category__in=category.get_descendants(include_self=True)
+            )
+        queryset = filter_by_attribute_values(queryset, selection)
+
+        count = queryset.count()
+        products = list(queryset.filter(id__gt=after).order_by("id")[: limit + 1])
+        next_after = products[limit - 1].id if len(products) > limit else None
+        return count, products[:limit], next_after
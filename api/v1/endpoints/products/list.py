@@ -1,23 +1,41 @@
 from django.db.models import QuerySet
-from django.utils.decorators import method_decorator
-from django.views.decorators.cache import cache_page
 from django_filters.rest_framework import DjangoFilterBackend
 from drf_spectacular.utils import OpenApiParameter, OpenApiTypes, extend_schema
-from rest_framework.filters import OrderingFilter
 from rest_framework.generics import ListAPIView
 
+from api.v1.cache import cached_response
+from api.v1.endpoints.products.mixins import ProductRowsListMixin
+from api.v1.filters.product import ProductOrderingFilter, parse_attribute_filters
+from api.v1.pagination import ProductPagination
 from api.v1.serializers.product import ProductShortSerializer
-from main.models import Attribute, AttributeValue, Product, ProductAttribute
+from main.models import Product
+from services.cache.generations import PRODUCTS_SCOPE, category_scope
+from services.product.facets import (
+    filter_by_attribute_values,
+    resolve_attribute_filters,
+)
+from services.product.search import ProductSearch
 
 
-@method_decorator(name="get", decorator=cache_page(60 * 5, key_prefix="product_list"))
-class ProductListView(ListAPIView):
+def product_list_scopes(request, **kwargs):
+    category_id = request.query_params.get("category")
+    if category_id and category_id.isdigit():
+        return [category_scope(int(category_id))]
+    return [PRODUCTS_SCOPE]
+
+
+class ProductListView(ProductRowsListMixin, ListAPIView):
     serializer_class = ProductShortSerializer
     queryset = Product.objects.filter(is_active=True)
-    filter_backends = [DjangoFilterBackend, OrderingFilter]
+    filter_backends = [DjangoFilterBackend, ProductOrderingFilter]
     filterset_fields = ["category"]
     ordering_fields = ["price", "views_count", "is_new"]
     ordering = ["-views_count"]
+    pagination_class = ProductPagination
+
+    @cached_response(key_prefix="product_list", scopes=product_list_scopes)
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
 
     @extend_schema(
         summary="Get list of products",
@@ -25,6 +43,11 @@ class ProductListView(ListAPIView):
             OpenApiParameter(name="search", type=OpenApiTypes.STR),
             OpenApiParameter(name="price_min", type=OpenApiTypes.FLOAT),
             OpenApiParameter(name="price_max", type=OpenApiTypes.FLOAT),
+            OpenApiParameter(
+                name="fields",
+                type=OpenApiTypes.STR,
+                description="Comma-separated fields to return, e.g. fields=id,name,price",
+            ),
             OpenApiParameter(
                 name="attrs",
                 type=OpenApiTypes.STR,
@@ -39,7 +62,7 @@ class ProductListView(ListAPIView):
 
         search = self.request.query_params.get("search")
         if search:
-            qs = qs.filter(name__icontains=search)
+            qs = ProductSearch().apply(qs, search)
 
         price_min = self.request.query_params.get("price_min")
         if price_min:
@@ -58,44 +81,7 @@ class ProductListView(ListAPIView):
         return qs
 
     def filter_by_attributes(self, qs) -> QuerySet:
-        raw_attrs = self.request.query_params.getlist("attrs")
-        if not raw_attrs:
-            return qs
-
-        parsed_filters = []
-        for pair in raw_attrs:
-            try:
-                label, values_str = pair.split(":")
-                values = [v.strip() for v in values_str.split(",") if v.strip()]
-                if values:
-                    parsed_filters.append((label.lower(), values))
-            except ValueError:
-                continue
-
-        if not parsed_filters:
-            return qs
-
-        labels = [label for label, _ in parsed_filters]
-        attributes = Attribute.objects.filter(label__in=labels)
-        attribute_map = {attr.label.lower(): attr for attr in attributes}
-
-        product_ids = None
-        for label, values in parsed_filters:
-            attribute = attribute_map.get(label)
-            if not attribute:
-                continue
-
-            value_ids = AttributeValue.objects.filter(
-                attribute=attribute, title__in=values
-            ).values_list("id", flat=True)
-
-            matched_ids = ProductAttribute.objects.filter(
-                attribute=attribute, value_id__in=value_ids
-            ).values_list("product_id", flat=True)
-
-            matched_set = set(matched_ids)
-            product_ids = (
-                matched_set if product_ids is None else product_ids & matched_set
-            )
-
-        return qs.filter(id__in=product_ids) if product_ids is not None else qs
+        parsed_filters = parse_attribute_filters(
+            self.request.query_params.getlist("attrs")
+        )
+        return filter_by_attribute_values(qs, resolve_attribute_filters(parsed_filters))
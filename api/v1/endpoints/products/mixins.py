@@ -0,0 +1,29 @@
+from rest_framework.response import Response
+
+from api.v1.filters.product import parse_sparse_fields
+from api.v1.serializers.product import ProductRowSerializer
+
+
+class ProductRowsListMixin:
+    """Lists products as ``.values()`` rows, restricted by ``?fields=``.
+
+    Only the requested columns plus the ones the keyset cursor reads are
+    selected, and ``ProductRowSerializer`` turns them into the response.
+    """
+
+    fields_query_param = "fields"
+    cursor_columns = ("id", "views_count", "price", "is_new", "created")
+
+    def list(self, request, *args, **kwargs):
+        fields = parse_sparse_fields(
+            request.query_params.get(self.fields_query_param),
+            ProductRowSerializer.fields,
+        )
+        queryset = self.filter_queryset(self.get_queryset())
+        rows = queryset.values(*dict.fromkeys((*fields, *self.cursor_columns)))
+        serializer = ProductRowSerializer(fields)
+
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(serializer.to_representation(page))
+        return Response(serializer.to_representation(rows))
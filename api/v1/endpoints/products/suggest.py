@@ -0,0 +1,44 @@
+import logging
+
+from drf_spectacular.utils import OpenApiParameter, OpenApiTypes, extend_schema
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from api.v1.serializers.product import SuggestionSerializer
+from services.product.suggestions import SuggestionIndex
+
+logger = logging.getLogger(__name__)
+
+
+class SuggestView(APIView):
+    max_limit = 20
+
+    @extend_schema(
+        summary="Search-as-you-type suggestions",
+        description=(
+            "Returns products, vendors and categories whose words start with the "
+            "words of `q`, most viewed first."
+        ),
+        parameters=[
+            OpenApiParameter(name="q", type=OpenApiTypes.STR, required=True),
+            OpenApiParameter(name="limit", type=OpenApiTypes.INT, required=False),
+        ],
+        responses={200: SuggestionSerializer(many=True)},
+    )
+    def get(self, request):
+        try:
+            limit = int(request.query_params.get("limit", 10))
+        except ValueError:
+            logger.warning(
+                f"Invalid 'limit' parameter: '{request.query_params.get('limit')}' — expected integer."
+            )
+            limit = 10
+        limit = max(1, min(limit, self.max_limit))
+
+        suggestions = SuggestionIndex().suggest(
+            request.query_params.get("q", ""), limit
+        )
+        return Response(
+            SuggestionSerializer(suggestions, many=True).data, status=status.HTTP_200_OK
+        )
@@ -1,16 +1,24 @@
 import logging
 from datetime import timedelta
+from typing import List, Optional
 
-from django.db.models import Case, Count, IntegerField, Max, Q, When
+from django.conf import settings
 from django.utils import timezone
 from drf_spectacular.utils import OpenApiParameter, OpenApiTypes, extend_schema
 from rest_framework import status
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from api.v1.cache import cached_response
 from api.v1.serializers.feed import FeedSummarySerializer
 from api.v1.serializers.product import ProductShortSerializer
-from main.models import Category, FeedParsingReport, FeedSource, Product
+from main.models import FeedSource, Product
+from services.cache.generations import CATEGORIES_SCOPE, PRODUCTS_SCOPE
+from services.cache.single_flight import SingleFlight
+from services.product.leaderboard import ViewsLeaderboard
+from services.product.stats import ProductStats
+from services.product.views_counter import ViewsCounter
 
 logger = logging.getLogger(__name__)
 
@@ -18,7 +26,11 @@ logger = logging.getLogger(__name__)
 class TopViewedProductsView(APIView):
     @extend_schema(
         summary="Top viewed products",
-        description="Returns top N most viewed products. Optional filters: category_id, days.",
+        description=(
+            "Returns top N most viewed products. Optional filters: category_id, "
+            "days, window. Served from the Redis leaderboards unless `days` is "
+            "given."
+        ),
         parameters=[
             OpenApiParameter(
                 name="limit",
@@ -33,9 +45,17 @@ class TopViewedProductsView(APIView):
                 required=False,
                 description="Filter by publish date (days ago)",
             ),
+            OpenApiParameter(
+                name="window",
+                type=OpenApiTypes.INT,
+                required=False,
+                enum=list(settings.VIEWS_LEADERBOARD_WINDOWS),
+                description="Rank by views of the last N days instead of all time",
+            ),
         ],
         responses={200: ProductShortSerializer(many=True)},
     )
+    @cached_response(key_prefix="top_viewed_products", fresh_for=60)
     def get(self, request):
         try:
             limit = max(1, int(request.query_params.get("limit", 10)))
@@ -47,7 +67,40 @@ class TopViewedProductsView(APIView):
 
         category_id = request.query_params.get("category_id")
         days = request.query_params.get("days")
+        window = self._window(request.query_params.get("window"))
+        if window and days:
+            raise ValidationError({"window": "Cannot be combined with 'days'."})
+
+        top_products = None
+        if not days and (not category_id or category_id.isdigit()):
+            top_products = self._ranked_top_products(
+                limit, int(category_id) if category_id else None, window
+            )
+        if top_products is None:
+            top_products = self._query_top_products(limit, category_id, days)
+
+        serializer = ProductShortSerializer(
+            top_products, many=True, context={"request": request}
+        )
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
+    def _ranked_top_products(
+        self, limit: int, category_id: Optional[int], window: Optional[int]
+    ) -> Optional[List[Product]]:
+        """Reads the Redis leaderboards, or returns ``None`` when they cannot answer."""
+        try:
+            leaderboard = ViewsLeaderboard()
+            if not window and not leaderboard.is_built():
+                return None
+            products = leaderboard.top(limit, category_id=category_id, window=window)
+        except Exception as e:
+            logger.warning(
+                f"Views leaderboard unavailable, ranking in the database: {e}"
+            )
+            return None
+        return self._merge_pending_views(products)
 
+    def _query_top_products(self, limit: int, category_id, days) -> List[Product]:
         products = Product.objects.filter(is_active=True)
 
         if category_id:
@@ -63,11 +116,35 @@ class TopViewedProductsView(APIView):
                     f"Invalid 'days' parameter: '{days}' — expected integer."
                 )
 
-        top_products = products.order_by("-views_count")[:limit]
-        serializer = ProductShortSerializer(
-            top_products, many=True, context={"request": request}
+        top_products = self._merge_pending_views(
+            list(products.order_by("-views_count")[:limit])
         )
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        return sorted(
+            top_products, key=lambda product: product.views_count, reverse=True
+        )
+
+    @staticmethod
+    def _window(raw_window: Optional[str]) -> Optional[int]:
+        if not raw_window:
+            return None
+        windows = settings.VIEWS_LEADERBOARD_WINDOWS
+        if not raw_window.isdigit() or int(raw_window) not in windows:
+            raise ValidationError(
+                {"window": f"Expected one of: {', '.join(map(str, windows))}."}
+            )
+        return int(raw_window)
+
+    def _merge_pending_views(self, products: List[Product]) -> List[Product]:
+        """Adds views buffered in Redis that have not been flushed yet."""
+        try:
+            pending = ViewsCounter().pending(product.id for product in products)
+        except Exception as e:
+            logger.warning(f"Failed to read pending product views: {e}")
+            return products
+
+        for product in products:
+            product.views_count += pending.get(product.id, 0)
+        return products
 
 
 class FeedParsingSummaryView(APIView):
@@ -76,34 +153,20 @@ class FeedParsingSummaryView(APIView):
         description="Returns summary of feed parsing results per feed: total runs, success/error counts, and timestamps.",
         responses={200: FeedSummarySerializer(many=True)},
     )
+    @cached_response(key_prefix="feed_summary", fresh_for=60)
     def get(self, request):
-        feeds = FeedSource.objects.all()
-        reports = FeedParsingReport.objects.values("feed_id").annotate(
-            total=Count("id"),
-            success=Count("id", filter=Q(status=FeedParsingReport.Status.SUCCESS)),
-            error=Count("id", filter=Q(status=FeedParsingReport.Status.ERROR)),
-            last_success_at=Max(
-                "finished_at", filter=Q(status=FeedParsingReport.Status.SUCCESS)
-            ),
-            last_error_at=Max(
-                "finished_at", filter=Q(status=FeedParsingReport.Status.ERROR)
-            ),
-        )
-
-        report_map = {item["feed_id"]: item for item in reports}
-
         summary = []
-        for feed in feeds:
-            data = report_map.get(feed.id, {})
+        for feed in FeedSource.objects.select_related("run_summary").order_by("id"):
+            rollup = getattr(feed, "run_summary", None)
             summary.append(
                 {
                     "feed_id": feed.id,
                     "feed_name": feed.name,
-                    "total": data.get("total", 0),
-                    "success": data.get("success", 0),
-                    "error": data.get("error", 0),
-                    "last_success_at": data.get("last_success_at"),
-                    "last_error_at": data.get("last_error_at"),
+                    "total": rollup.total if rollup else 0,
+                    "success": rollup.success if rollup else 0,
+                    "error": rollup.error if rollup else 0,
+                    "last_success_at": rollup.last_success_at if rollup else None,
+                    "last_error_at": rollup.last_error_at if rollup else None,
                 }
             )
 
@@ -117,39 +180,28 @@ class ProductStatusStatsView(APIView):
         description="Returns number of products in each status: active, draft, archived.",
         responses={200: dict},
     )
+    @cached_response(
+        key_prefix="product_status_stats", scopes=lambda request: [PRODUCTS_SCOPE]
+    )
     def get(self, request):
-        stats = Product.objects.aggregate(
-            total=Count("id"),
-            active=Count(
-                Case(
-                    When(status=Product.Status.ACTIVE, then=1),
-                    output_field=IntegerField(),
-                )
-            ),
-            draft=Count(
-                Case(
-                    When(status=Product.Status.DRAFT, then=1),
-                    output_field=IntegerField(),
-                )
-            ),
-            archived=Count(
-                Case(
-                    When(status=Product.Status.ARCHIVED, then=1),
-                    output_field=IntegerField(),
-                )
-            ),
-        )
+        stats = ProductStats.status_counts()
         return Response(stats, status=status.HTTP_200_OK)
 
 
 class PopularCategoriesView(APIView):
+    @cached_response(
+        key_prefix="popular_categories",
+        scopes=lambda request: [PRODUCTS_SCOPE, CATEGORIES_SCOPE],
+    )
     def get(self, request):
-        qs = Category.objects.annotate(product_count=Count("products")).order_by(
-            "-product_count"
-        )[:10]
-        return Response(
-            [
-                {"id": c.id, "title": c.title, "product_count": c.product_count}
-                for c in qs
-            ]
-        )
+        return Response(ProductStats.popular_categories(limit=10))
+
+
+class SingleFlightStatsView(APIView):
+    @extend_schema(
+        summary="Single-flight statistics",
+        description="Returns how many cached endpoint requests computed the response, got a stale copy, waited for another request or computed it after a failed wait.",
+        responses={200: dict},
+    )
+    def get(self, request):
+        return Response(SingleFlight.metrics(), status=status.HTTP_200_OK)
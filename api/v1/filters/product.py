@@ -1,7 +1,50 @@
+from typing import List, Optional, Sequence, Tuple
+
 from django_filters import rest_framework as filters
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import OrderingFilter
+
 from main.models import Product
 
 
+def parse_attribute_filters(raw_attrs: List[str]) -> List[Tuple[str, List[str]]]:
+    """Parses ``attrs=color:Red,Blue`` params into ``(label, values)`` pairs."""
+    parsed_filters = []
+    for pair in raw_attrs:
+        try:
+            label, values_str = pair.split(":")
+        except ValueError:
+            continue
+        values = [v.strip() for v in values_str.split(",") if v.strip()]
+        if values:
+            parsed_filters.append((label.lower(), values))
+    return parsed_filters
+
+
+def parse_sparse_fields(
+    raw_fields: Optional[str], allowed: Sequence[str]
+) -> Tuple[str, ...]:
+    """Parses ``fields=id,name,price`` into the requested subset of ``allowed``.
+
+    Without the parameter every allowed field is returned.
+    """
+    if not raw_fields:
+        return tuple(allowed)
+
+    requested = {field.strip() for field in raw_fields.split(",") if field.strip()}
+    unknown = requested.difference(allowed)
+    if unknown:
+        raise ValidationError(
+            {
+                "fields": (
+                    f"Unknown fields: {', '.join(sorted(unknown))}. "
+                    f"Available: {', '.join(allowed)}."
+                )
+            }
+        )
+    return tuple(field for field in allowed if field in requested)
+
+
 class ProductFilter(filters.FilterSet):
     min_price = filters.NumberFilter(field_name="price", lookup_expr="gte")
     max_price = filters.NumberFilter(field_name="price", lookup_expr="lte")
@@ -26,3 +69,12 @@ class ProductFilter(filters.FilterSet):
                 product_attributes__raw_value=attr_value,
             )
         return queryset
+
+
+class ProductOrderingFilter(OrderingFilter):
+    """Orders search results by relevance unless an ordering is requested."""
+
+    def get_default_ordering(self, view):
+        if view.request.query_params.get("search", "").strip():
+            return ["-rank", *(super().get_default_ordering(view) or [])]
+        return super().get_default_ordering(view)
@@ -0,0 +1,264 @@
+import base64
+import json
+from datetime import datetime
+from decimal import Decimal
+from typing import Dict, List, Optional, Tuple
+
+from django.db import connections
+from django.db.models import Q, QuerySet
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import BasePagination, LimitOffsetPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+
+def estimate_count(queryset: QuerySet) -> int:
+    """Returns the planner's row estimate for ``queryset`` instead of COUNT(*)."""
+    sql, params = queryset.query.sql_with_params()
+    with connections[queryset.db].cursor() as cursor:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+class KeysetPagination(BasePagination):
+    """Cursor pagination that seeks by the full ordering key.
+
+    Every entry of ``orderings`` must end with a unique field, so the position
+    of a row is exact and no OFFSET is needed, however deep the page is. The
+    cursor holds the ordering key values of the last row of the page.
+    """
+
+    page_size = api_settings.PAGE_SIZE
+    max_page_size = 100
+    page_size_query_param = "limit"
+    cursor_query_param = "cursor"
+    ordering_query_param = "ordering"
+    orderings: Dict[str, Tuple[str, ...]] = {}
+    default_ordering: Optional[str] = None
+    # Page links point here instead of the current URL when set, e.g. when a
+    # detail view embeds the first page of a listing endpoint.
+    base_url: Optional[str] = None
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.ordering_key = self.get_ordering_key(request)
+        fields = self.orderings[self.ordering_key]
+
+        queryset = queryset.order_by(*fields)
+        position = self.decode_cursor(request, queryset, fields)
+        if position is not None:
+            queryset = queryset.filter(self.seek(fields, position))
+
+        rows = list(queryset[: self.page_size + 1])
+        self.has_next = len(rows) > self.page_size
+        rows = rows[: self.page_size]
+        self.next_position = (
+            [self._value(rows[-1], field) for field in fields]
+            if self.has_next
+            else None
+        )
+        return rows
+
+    def get_paginated_response(self, data):
+        return Response({"next": self.get_next_link(), "results": data})
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                "name": self.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Cursor returned in `next` by the previous page.",
+                "schema": {"type": "string"},
+            },
+            {
+                "name": self.page_size_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Number of results to return per page.",
+                "schema": {"type": "integer"},
+            },
+        ]
+
+    def get_page_size(self, request) -> int:
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return max(1, min(page_size, self.max_page_size))
+
+    def get_ordering_key(self, request) -> str:
+        ordering = request.query_params.get(self.ordering_query_param)
+        ordering = ordering or self.default_ordering
+        if ordering not in self.orderings:
+            raise ValidationError(
+                {
+                    self.ordering_query_param: (
+                        f"Cursor pagination supports: {', '.join(self.orderings)}."
+                    )
+                }
+            )
+        return ordering
+
+    def get_next_link(self) -> Optional[str]:
+        if self.next_position is None:
+            return None
+        cursor = base64.urlsafe_b64encode(
+            json.dumps(
+                {"o": self.ordering_key, "v": self.next_position},
+                separators=(",", ":"),
+            ).encode()
+        ).decode()
+        url = self.request.build_absolute_uri()
+        if self.base_url:
+            url = self.base_url
+            if self.page_size_query_param in self.request.query_params:
+                url = replace_query_param(
+                    url, self.page_size_query_param, self.page_size
+                )
+        return replace_query_param(url, self.cursor_query_param, cursor)
+
+    def decode_cursor(self, request, queryset, fields) -> Optional[List]:
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+
+        try:
+            cursor = json.loads(base64.urlsafe_b64decode(encoded.encode()))
+            if cursor["o"] != self.ordering_key or len(cursor["v"]) != len(fields):
+                raise ValueError("Cursor does not match the ordering")
+            return [
+                queryset.model._meta.get_field(field.lstrip("-")).to_python(value)
+                for field, value in zip(fields, cursor["v"])
+            ]
+        except Exception:
+            raise NotFound("Invalid cursor")
+
+    @staticmethod
+    def seek(fields: Tuple[str, ...], position: List) -> Q:
+        """Builds ``(a, b, c) > (x, y, z)`` for mixed sort directions."""
+        names = [field.lstrip("-") for field in fields]
+        after = Q()
+        for i, field in enumerate(fields):
+            lookup = "lt" if field.startswith("-") else "gt"
+            condition = Q(**{f"{names[i]}__{lookup}": position[i]})
+            for name, value in zip(names[:i], position[:i]):
+                condition &= Q(**{name: value})
+            after |= condition
+
+        # A plain bound on the leading column lets the index scan start at
+        # the cursor instead of filtering every preceding row.
+        leading = "lte" if fields[0].startswith("-") else "gte"
+        return Q(**{f"{names[0]}__{leading}": position[0]}) & after
+
+    @staticmethod
+    def _value(row, field: str):
+        name = field.lstrip("-")
+        value = row[name] if isinstance(row, dict) else getattr(row, name)
+        if isinstance(value, Decimal):
+            return str(value)
+        if isinstance(value, datetime):
+            return value.isoformat()
+        return value
+
+
+class ProductKeysetPagination(KeysetPagination):
+    orderings = {
+        "-views_count": ("-views_count", "id"),
+        "price": ("price", "id"),
+        "new": ("-is_new", "-created", "id"),
+    }
+    default_ordering = "-views_count"
+
+
+class ProductPagination(LimitOffsetPagination):
+    """Limit/offset pagination for products with two cheaper modes.
+
+    ``?count=none`` skips the COUNT(*) and ``?count=estimate`` returns the
+    planner's estimate instead. Both fetch one extra row to find out whether
+    there is a next page, so the links never depend on the estimate. ``?paginate=cursor``, or any ``cursor``
+    parameter, switches to keyset pagination without a count.
+    """
+
+    mode_query_param = "paginate"
+    count_query_param = "count"
+    keyset_class = ProductKeysetPagination
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = None
+        if (
+            request.query_params.get(self.mode_query_param) == "cursor"
+            or self.keyset_class.cursor_query_param in request.query_params
+        ):
+            self.keyset = self.keyset_class()
+            return self.keyset.paginate_queryset(queryset, request, view)
+
+        self.count_mode = request.query_params.get(self.count_query_param, "exact")
+        if self.count_mode not in ("none", "estimate"):
+            return super().paginate_queryset(queryset, request, view)
+
+        self.request = request
+        self.limit = self.get_limit(request)
+        self.offset = self.get_offset(request)
+        self.count = estimate_count(queryset) if self.count_mode == "estimate" else None
+        rows = list(queryset[self.offset : self.offset + self.limit + 1])
+        self.has_more = len(rows) > self.limit
+        return rows[: self.limit]
+
+    def get_paginated_response(self, data):
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+    def get_next_link(self):
+        if self.count_mode not in ("none", "estimate"):
+            return super().get_next_link()
+        if not self.has_more:
+            return None
+        url = self.request.build_absolute_uri()
+        url = replace_query_param(url, self.limit_query_param, self.limit)
+        return replace_query_param(
+            url, self.offset_query_param, self.offset + self.limit
+        )
+
+    def get_previous_link(self):
+        if self.count_mode not in ("none", "estimate") or self.offset > 0:
+            return super().get_previous_link()
+        return None
+
+    def get_schema_operation_parameters(self, view):
+        return (
+            super().get_schema_operation_parameters(view)
+            + [
+                {
+                    "name": self.count_query_param,
+                    "required": False,
+                    "in": "query",
+                    "description": "`exact` (default), `estimate` or `none`.",
+                    "schema": {"type": "string", "enum": ["exact", "estimate", "none"]},
+                },
+                {
+                    "name": self.mode_query_param,
+                    "required": False,
+                    "in": "query",
+                    "description": "`cursor` switches to keyset pagination.",
+                    "schema": {"type": "string", "enum": ["cursor"]},
+                },
+            ]
+            + self.keyset_class().get_schema_operation_parameters(view)[:1]
+        )
@@ -30,6 +30,7 @@ class CategoryListSerializer(serializers.HyperlinkedModelSerializer):
 
 class CategoryDetailSerializer(serializers.ModelSerializer):
     products = serializers.SerializerMethodField()
+    products_next = serializers.SerializerMethodField()
     categories = CategoryListSerializer(
         many=True,
         source="get_children",
@@ -47,9 +48,13 @@ class CategoryDetailSerializer(serializers.ModelSerializer):
         products = getattr(obj, "active_products", [])
         return ProductShortSerializer(products, many=True, context=self.context).data
 
+    def get_products_next(self, obj):
+        return getattr(obj, "products_next", None)
+
     class Meta:
         model = Category
         fields = [field.name for field in model._meta.fields] + [
             "products",
+            "products_next",
             "categories",
         ]
@@ -1,8 +1,24 @@
+from decimal import Decimal
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+from django.conf import settings
+from django.db import models
+from modeltranslation.translator import translator
+from modeltranslation.utils import build_localized_fieldname
 from rest_framework import serializers
 
 from main.models import Product
 
 
+def localized_columns(model) -> Tuple[str, ...]:
+    """Names of the per-language columns modeltranslation adds to ``model``."""
+    return tuple(
+        build_localized_fieldname(field, language)
+        for field in translator.get_options_for_model(model).fields
+        for language in settings.MODELTRANSLATION_LANGUAGES
+    )
+
+
 class ProductShortSerializer(serializers.ModelSerializer):
     class Meta:
         model = Product
@@ -18,6 +34,35 @@ class ProductShortSerializer(serializers.ModelSerializer):
         )
 
 
+class ProductRowSerializer:
+    """Dict-based equivalent of ``ProductShortSerializer`` for list pages.
+
+    It works on ``.values()`` rows, so hot list endpoints build neither model
+    instances nor DRF field objects. Decimals are formatted the way DRF
+    formats them, so both serializers give the same output.
+    """
+
+    fields = ProductShortSerializer.Meta.fields
+
+    def __init__(self, fields: Optional[Sequence[str]] = None):
+        self.fields = tuple(fields or self.fields)
+        self.decimal_exponents = {}
+        for name in self.fields:
+            field = Product._meta.get_field(name)
+            if isinstance(field, models.DecimalField):
+                self.decimal_exponents[name] = Decimal(1).scaleb(-field.decimal_places)
+
+    def to_representation(self, rows: Iterable[dict]) -> List[dict]:
+        data = []
+        for row in rows:
+            item = {name: row[name] for name in self.fields}
+            for name, exponent in self.decimal_exponents.items():
+                if item[name] is not None:
+                    item[name] = format(item[name].quantize(exponent), "f")
+            data.append(item)
+        return data
+
+
 class ProductListSerializer(serializers.HyperlinkedModelSerializer):
     url = serializers.HyperlinkedIdentityField(
         view_name="api:v1:product-detail",
@@ -44,4 +89,25 @@ class ProductListSerializer(serializers.HyperlinkedModelSerializer):
 class ProductDetailSerializer(serializers.ModelSerializer):
     class Meta:
         model = Product
-        fields = "__all__"
+        # Translated fields are served in the active language only.
+        exclude = ("search_vector", *localized_columns(Product))
+
+
+class FacetValueSerializer(serializers.Serializer):
+    value_id = serializers.IntegerField()
+    title = serializers.CharField()
+    count = serializers.IntegerField()
+    selected = serializers.BooleanField()
+
+
+class FacetSerializer(serializers.Serializer):
+    attribute_id = serializers.IntegerField()
+    label = serializers.CharField()
+    title = serializers.CharField()
+    values = FacetValueSerializer(many=True)
+
+
+class SuggestionSerializer(serializers.Serializer):
+    type = serializers.ChoiceField(choices=["product", "vendor", "category"])
+    id = serializers.IntegerField(allow_null=True)
+    text = serializers.CharField()
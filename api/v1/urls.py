@@ -1,30 +1,56 @@
 from django.urls import path
 
-from .endpoints.categories import CategoryDetailView, CategoryListView
+from .endpoints.categories import (
+    CategoryDetailView,
+    CategoryListView,
+    CategoryProductListView,
+    CategoryTreeView,
+)
 from .endpoints.products import (
+    ProductBatchView,
     ProductDetailView,
+    ProductExportView,
+    ProductFacetsView,
+    ProductIndexedListView,
     ProductListView,
+    SuggestView,
     TopViewedProductsView,
 )
 from .endpoints.stats.statistics import (
     FeedParsingSummaryView,
     PopularCategoriesView,
     ProductStatusStatsView,
+    SingleFlightStatsView,
 )
 
 app_name = "v1"
 
 urlpatterns = [
     path("categories/", CategoryListView.as_view(), name="category-list"),
+    path("categories/tree/", CategoryTreeView.as_view(), name="category-tree"),
     path(
         "categories/<int:category_id>/",
         CategoryDetailView.as_view(),
         name="category-detail",
     ),
+    path(
+        "categories/<int:category_id>/products/",
+        CategoryProductListView.as_view(),
+        name="category-products",
+    ),
     path("products/", ProductListView.as_view(), name="product-list"),
+    path("products/batch/", ProductBatchView.as_view(), name="product-batch"),
+    path("products/export/", ProductExportView.as_view(), name="product-export"),
+    path("products/facets/", ProductFacetsView.as_view(), name="product-facets"),
+    path(
+        "products/indexed/",
+        ProductIndexedListView.as_view(),
+        name="product-indexed-list",
+    ),
     path(
         "products/<int:product_id>/", ProductDetailView.as_view(), name="product-detail"
     ),
+    path("suggest/", SuggestView.as_view(), name="suggest"),
     path(
         "stats/top-viewed-products/",
         TopViewedProductsView.as_view(),
@@ -41,4 +67,9 @@ urlpatterns = [
         PopularCategoriesView.as_view(),
         name="popular-categories",
     ),
+    path(
+        "stats/single-flight/",
+        SingleFlightStatsView.as_view(),
+        name="single-flight-stats",
+    ),
 ]
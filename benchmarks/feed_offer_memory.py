@@ -0,0 +1,99 @@
+"""Memory footprint of parsed feed offers.
+
+Builds a synthetic feed of ``--offers`` offers in three representations and
+reports the memory retained by each list of offers::
+
+    python -m benchmarks.feed_offer_memory --offers 300000
+"""
+
+import argparse
+import gc
+import tracemalloc
+from dataclasses import dataclass, field
+from decimal import Decimal
+from typing import Any, Callable, Dict, List, Optional
+
+from services.feed.parser.types import FeedOffer
+
+COLORS = ["Чорний", "Білий", "Сірий", "Синій", "Червоний"]
+SIZES = ["S", "M", "L", "XL"]
+
+
+@dataclass
+class DictFeedOffer:
+    """``FeedOffer`` layout before slots: per-instance ``__dict__``."""
+
+    external_id: str
+    available: bool
+    url: str
+    price: Decimal
+    currency: str
+    category_id: str
+    name: str
+
+    pictures: List[str] = field(default_factory=list)
+    vendor: Optional[str] = None
+    description: Optional[str] = None
+    article: Optional[str] = None
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    stock_quantity: int = 0
+
+
+def synthetic_offer(cls, i: int):
+    # Attribute names and values come from the parser as fresh strings.
+    return cls(
+        external_id=str(i),
+        available=i % 7 != 0,
+        url=f"https://example.com/p/{i}",
+        price=Decimal(f"{100 + i % 5000}.99"),
+        currency="".join("UAH"),
+        category_id=str(i % 300),
+        name=f"Товар {i}",
+        pictures=[f"https://example.com/img/{i}_{n}.jpg" for n in range(2)],
+        vendor=f"Vendor {i % 500}",
+        article=f"ART-{i}",
+        attributes={
+            "".join("Колір"): "".join(COLORS[i % len(COLORS)]),
+            "".join("Розмір"): ["".join(SIZES[i % 4]), "".join(SIZES[(i + 1) % 4])],
+            "".join("Країна виробник"): "".join("Україна"),
+        },
+        stock_quantity=i % 50,
+    )
+
+
+def measure(build: Callable[[int], Any], count: int) -> int:
+    gc.collect()
+    tracemalloc.start()
+    offers = [build(i) for i in range(count)]
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del offers
+    return current
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("--offers", type=int, default=300_000)
+    args = arg_parser.parse_args()
+
+    variants = {
+        "dataclass (__dict__)": lambda i: synthetic_offer(DictFeedOffer, i),
+        "FeedOffer (slots)": lambda i: synthetic_offer(FeedOffer, i),
+        "FrozenFeedOffer (slots, tuples)": lambda i: (
+            synthetic_offer(FeedOffer, i).freeze()
+        ),
+    }
+
+    baseline = None
+    print(f"{args.offers} offers")
+    for label, build in variants.items():
+        size = measure(build, args.offers)
+        baseline = baseline or size
+        print(
+            f"{label:<34} {size / 1024 / 1024:8.1f} MiB "
+            f"{size / args.offers:7.0f} B/offer {size / baseline:6.1%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""Throughput of rendering product list pages to JSON.
+
+Renders ``--pages`` synthetic pages of ``--products`` products, shaped like
+``ProductShortSerializer`` output with a few timestamps, with DRF's
+``JSONRenderer`` and with ``FastJSONRenderer``, and reports the compressed
+size of one page::
+
+    python -m benchmarks.json_rendering --products 1000 --pages 200
+"""
+
+import argparse
+import gzip
+import os
+import time
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Any, Dict, List
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "parser.settings")
+django.setup()
+
+from rest_framework.renderers import JSONRenderer  # noqa: E402
+
+from api.v1.renderers import FastJSONRenderer, orjson  # noqa: E402
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+def synthetic_page(count: int) -> Dict[str, Any]:
+    created = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    results: List[Dict[str, Any]] = [
+        {
+            "id": i,
+            "article": f"ART-{i}",
+            "name": f"Смартфон Vendor {i % 500} модель {i}",
+            "price": str(Decimal(f"{100 + i % 5000}.99")),
+            "old_price": None if i % 3 else str(Decimal(f"{200 + i % 5000}.00")),
+            "stock_quantity": i % 50,
+            "url": f"https://example.com/p/{i}",
+            "views_count": i * 7 % 10_000,
+            "created": created + timedelta(minutes=i, microseconds=i),
+        }
+        for i in range(count)
+    ]
+    return {
+        "next": "https://example.com/api/v1/products/?cursor=abc",
+        "results": results,
+    }
+
+
+def measure(renderer, page: Dict[str, Any], pages: int) -> float:
+    renderer.render(page)
+    started = time.perf_counter()
+    for _ in range(pages):
+        renderer.render(page)
+    return time.perf_counter() - started
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("--products", type=int, default=1000)
+    arg_parser.add_argument("--pages", type=int, default=200)
+    args = arg_parser.parse_args()
+
+    page = synthetic_page(args.products)
+    renderers = {"JSONRenderer (json)": JSONRenderer()}
+    if orjson is not None:
+        renderers["FastJSONRenderer (orjson)"] = FastJSONRenderer()
+    else:
+        print("orjson is not installed, FastJSONRenderer falls back to json")
+
+    outputs = {label: renderer.render(page) for label, renderer in renderers.items()}
+    if len(set(outputs.values())) > 1:
+        print("warning: renderers produced different output")
+
+    print(f"{args.pages} pages of {args.products} products")
+    baseline = None
+    for label, renderer in renderers.items():
+        elapsed = measure(renderer, page, args.pages)
+        baseline = baseline or elapsed
+        print(
+            f"{label:<28} {args.pages / elapsed:8.1f} pages/s "
+            f"{elapsed / args.pages * 1000:7.2f} ms/page {elapsed / baseline:6.1%}"
+        )
+
+    body = next(iter(outputs.values()))
+    print(f"{'uncompressed':<28} {len(body) / 1024:8.1f} KiB")
+    print(f"{'gzip':<28} {len(gzip.compress(body)) / 1024:8.1f} KiB")
+    if brotli is not None:
+        print(
+            f"{'brotli (quality 5)':<28} {len(brotli.compress(body, quality=5)) / 1024:8.1f} KiB"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,7 @@
 import pytest
+from django.core.cache import cache
 from django.db import connection
+from django_redis import get_redis_connection
 
 
 @pytest.fixture(scope="session", autouse=True)
@@ -7,3 +9,17 @@ def enable_pg_trgm(django_db_setup, django_db_blocker):
     with django_db_blocker.unblock():
         with connection.cursor() as cursor:
             cursor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm;")
+
+
+@pytest.fixture(autouse=True)
+def clear_api_cache():
+    cache.delete_pattern("api:*")
+    cache.delete_pattern("category_tree_*")
+
+
+@pytest.fixture(autouse=True)
+def clear_views_leaderboard():
+    redis = get_redis_connection("default")
+    keys = list(redis.scan_iter(match="views_top:*"))
+    if keys:
+        redis.delete(*keys)
@@ -1,10 +1,9 @@
 from django.contrib import admin
-from django.db.models import Count, Q
-from django.utils.translation import gettext_lazy as _
 from modeltranslation.admin import TranslationAdmin
 from mptt.admin import DraggableMPTTAdmin
 
 from main.models import Category
+from .inlines import CategoryAttributeConfigInline
 
 
 @admin.register(Category)
@@ -12,13 +11,14 @@ class CategoryAdmin(DraggableMPTTAdmin, TranslationAdmin):
     list_display = (
         "tree_actions",
         "indented_title",
-        "active_products_count",
+        "active_product_count",
         "is_active",
         "created",
     )
-    list_filter = ["is_active", "is_featured", "created"]
+    list_filter = ["is_active", "has_active_products", "is_featured", "created"]
     search_fields = ["title", "description"]
     mptt_level_indent = 20
+    inlines = [CategoryAttributeConfigInline]
 
     fieldsets = (
         ("General", {"fields": ("parent", "title", "description", "is_active")}),
@@ -56,14 +56,3 @@ class CategoryAdmin(DraggableMPTTAdmin, TranslationAdmin):
             },
         ),
     )
-
-    def get_queryset(self, request):
-        qs = super().get_queryset(request)
-        return qs.annotate(
-            active_products_count=Count("products", filter=Q(products__is_active=True))
-        )
-
-    def active_products_count(self, obj):
-        return obj.active_products_count
-
-    active_products_count.short_description = _("Active Products Count")
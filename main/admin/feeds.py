@@ -60,6 +60,7 @@ class FeedParsingReportAdmin(admin.ModelAdmin):
         "products_unpublished",
         "download_error",
         "parsing_error",
+        "snapshot",
     ]
 
     def stats_summary(self, obj):
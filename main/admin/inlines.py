@@ -1,7 +1,12 @@
 from django.contrib import admin
 from django.utils.html import format_html
 
-from main.models import FeedParsingReport, ProductAttribute, ProductImage
+from main.models import (
+    CategoryAttributeConfig,
+    FeedParsingReport,
+    ProductAttribute,
+    ProductImage,
+)
 from main.models.store.feed import FeedParsingReportItem
 
 
@@ -12,6 +17,14 @@ class ProductAttributeInline(admin.TabularInline):
     fields = ("attribute", "value", "raw_value")
 
 
+class CategoryAttributeConfigInline(admin.TabularInline):
+    model = CategoryAttributeConfig
+    extra = 0
+    raw_id_fields = ("attribute",)
+    fields = ("attribute", "sort_order", "is_filterable", "is_active")
+    ordering = ("sort_order",)
+
+
 class FeedParsingReportInline(admin.TabularInline):
     model = FeedParsingReport
     extra = 0
@@ -68,8 +81,14 @@ class ProductImageInline(admin.TabularInline):
 class FeedParsingReportItemInline(admin.TabularInline):
     model = FeedParsingReportItem
     extra = 0
-    readonly_fields = ["product_external_id", "success", "error_message"]
-    fields = ["product_external_id", "success", "error_message"]
+    readonly_fields = [
+        "error_message",
+        "occurrences",
+        "sample_external_ids",
+        "success",
+    ]
+    fields = ["error_message", "occurrences", "sample_external_ids", "success"]
+    ordering = ("-occurrences",)
     can_delete = False
 
     def has_add_permission(self, request, obj=None):
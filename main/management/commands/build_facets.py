@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from services.product.facets import FacetEngine
+
+
+class Command(BaseCommand):
+    help = "Rebuilds the stored attribute facet counts of every category."
+
+    def handle(self, *args, **options):
+        facets = FacetEngine.build()
+        self.stdout.write(self.style.SUCCESS(f"Stored {facets} facet counts"))
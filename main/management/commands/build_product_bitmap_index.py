@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from services.product.bitmap_index import ProductBitmapIndex
+
+
+class Command(BaseCommand):
+    help = "Rebuilds the product bitmap index in Redis from the database."
+
+    def handle(self, *args, **options):
+        bitmaps = ProductBitmapIndex().build()
+        self.stdout.write(self.style.SUCCESS(f"Built {bitmaps} bitmaps"))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from services.product.suggestions import SuggestionIndex
+
+
+class Command(BaseCommand):
+    help = "Rebuilds the search-as-you-type suggestion index in Redis."
+
+    def handle(self, *args, **options):
+        entries = SuggestionIndex().build()
+        self.stdout.write(self.style.SUCCESS(f"Indexed {entries} suggestions"))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from services.product.leaderboard import ViewsLeaderboard
+
+
+class Command(BaseCommand):
+    help = "Rebuilds the all-time top viewed products leaderboards in Redis."
+
+    def handle(self, *args, **options):
+        products = ViewsLeaderboard().build()
+        self.stdout.write(self.style.SUCCESS(f"Ranked {products} products"))
@@ -0,0 +1,62 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from main.models import FeedParsingReport, FeedSource
+from services.feed.core.manager import FeedManager
+
+
+class Command(BaseCommand):
+    help = "Shows what processing a feed would change, without writing anything."
+
+    def add_arguments(self, parser):
+        parser.add_argument("feed_id", type=int, help="Feed source ID")
+        parser.add_argument(
+            "--snapshot",
+            type=int,
+            metavar="REPORT_ID",
+            help="Diff the snapshot of this report instead of downloading the feed",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            feed_source = FeedSource.objects.get(id=options["feed_id"])
+        except FeedSource.DoesNotExist:
+            raise CommandError(f"Feed source {options['feed_id']} does not exist")
+
+        snapshot_path = None
+        if options["snapshot"]:
+            report = FeedParsingReport.objects.filter(
+                id=options["snapshot"], feed=feed_source
+            ).first()
+            if not report or not report.snapshot:
+                raise CommandError(f"Report {options['snapshot']} has no snapshot")
+            snapshot_path = report.snapshot.path
+
+        diff = FeedManager(feed_source).diff_feed(snapshot_path)
+
+        row = "{:<40} {:>8} {:>8} {:>10} {:>9} {:>7} {:>7}"
+        self.stdout.write(
+            row.format(
+                "Category", "Add", "Update", "Unchanged", "Archive", "Attrs", "Images"
+            )
+        )
+        for label, counts in sorted(diff.categories.items()):
+            self.stdout.write(
+                row.format(
+                    label[:40],
+                    counts.added,
+                    counts.updated,
+                    counts.unchanged,
+                    counts.archived,
+                    counts.attribute_changes,
+                    counts.image_changes,
+                )
+            )
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Total: +{len(diff.to_add)} ~{len(diff.to_update)} "
+                f"↓{len(diff.to_archive)}, attribute changes: "
+                f"{len(diff.attribute_changes)}, image changes: "
+                f"{len(diff.image_changes)}"
+            )
+        )
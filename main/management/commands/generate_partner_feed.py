@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+
+from services.feed.generator import RozetkaFeedGenerator
+
+
+class Command(BaseCommand):
+    help = (
+        "Generates the Rozetka feed of the catalog, rewriting only the "
+        "category shards whose products changed."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--full", action="store_true", help="Rewrite every category shard."
+        )
+
+    def handle(self, *args, **options):
+        result = RozetkaFeedGenerator().generate(full=options["full"])
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Wrote {result['offers']} offers to {result['path']}: "
+                f"{result['regenerated']} of {result['categories']} category "
+                f"shards regenerated, {result['removed']} removed"
+            )
+        )
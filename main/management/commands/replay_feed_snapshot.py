@@ -0,0 +1,54 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from main.models import FeedParsingReport, FeedSource
+from services.feed.core.manager import FeedManager
+
+
+class Command(BaseCommand):
+    help = "Replays a saved feed snapshot through the matching and upsert stages."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "report_id",
+            nargs="?",
+            type=int,
+            help="ID of the feed parsing report whose snapshot should be replayed",
+        )
+        parser.add_argument("--path", help="Path to a snapshot file")
+        parser.add_argument(
+            "--feed", type=int, help="Feed source ID (required with --path)"
+        )
+
+    def handle(self, *args, **options):
+        report_id, path, feed_id = (
+            options["report_id"],
+            options["path"],
+            options["feed"],
+        )
+
+        if report_id:
+            try:
+                report = FeedParsingReport.objects.select_related("feed").get(
+                    id=report_id
+                )
+            except FeedParsingReport.DoesNotExist:
+                raise CommandError(f"Report {report_id} does not exist")
+            if not report.snapshot:
+                raise CommandError(f"Report {report_id} has no snapshot")
+            feed_source, path = report.feed, report.snapshot.path
+        elif path and feed_id:
+            try:
+                feed_source = FeedSource.objects.get(id=feed_id)
+            except FeedSource.DoesNotExist:
+                raise CommandError(f"Feed source {feed_id} does not exist")
+        else:
+            raise CommandError("Pass a report ID or both --path and --feed")
+
+        report = FeedManager(feed_source).replay_snapshot(path)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Replayed {report.total_products} offers into report {report.id}: "
+                f"+{report.products_added} ~{report.products_updated} "
+                f"×{report.products_failed}"
+            )
+        )
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.3 on 2026-10-19 09:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0002_remove_product_product_description_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='feedparsingreport',
+            name='snapshot',
+            field=models.FileField(blank=True, null=True, upload_to='feeds/snapshots/', verbose_name='Snapshot'),
+        ),
+    ]
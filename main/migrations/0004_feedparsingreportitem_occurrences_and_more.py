@@ -0,0 +1,28 @@
+# Generated by Django 5.2.3 on 2026-10-19 10:04
+
+import django.contrib.postgres.fields
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0003_feedparsingreport_snapshot'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='feedparsingreportitem',
+            options={'ordering': ['-occurrences'], 'verbose_name': 'Feed Parsing Report Item', 'verbose_name_plural': 'Feed Parsing Report Items'},
+        ),
+        migrations.AddField(
+            model_name='feedparsingreportitem',
+            name='occurrences',
+            field=models.PositiveIntegerField(default=1, verbose_name='Occurrences'),
+        ),
+        migrations.AddField(
+            model_name='feedparsingreportitem',
+            name='sample_external_ids',
+            field=django.contrib.postgres.fields.ArrayField(base_field=models.CharField(max_length=255), blank=True, default=list, size=None, verbose_name='Sample External IDs'),
+        ),
+    ]
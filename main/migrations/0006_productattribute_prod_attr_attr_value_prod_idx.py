@@ -0,0 +1,17 @@
+# Generated by Django 5.2.3 on 2026-10-19 12:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0005_product_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='productattribute',
+            index=models.Index(fields=['attribute', 'value', 'product'], name='prod_attr_attr_value_prod_idx'),
+        ),
+    ]
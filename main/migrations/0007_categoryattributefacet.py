@@ -0,0 +1,31 @@
+# Generated by Django 5.2.3 on 2026-10-19 13:05
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0006_productattribute_prod_attr_attr_value_prod_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CategoryAttributeFacet',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('product_count', models.PositiveIntegerField(default=0, verbose_name='Product Count')),
+                ('refreshed_at', models.DateTimeField(auto_now=True, verbose_name='Refreshed At')),
+                ('attribute', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='main.attribute', verbose_name='Attribute')),
+                ('category', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='attribute_facets', to='main.category', verbose_name='Category')),
+                ('value', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='main.attributevalue', verbose_name='Value')),
+            ],
+            options={
+                'verbose_name': 'Category Attribute Facet',
+                'verbose_name_plural': 'Category Attribute Facets',
+                'db_table': 'store_categoryattributefacet',
+                'constraints': [models.UniqueConstraint(fields=('category', 'attribute', 'value'), name='category_attribute_facet_unique')],
+            },
+        ),
+    ]
@@ -0,0 +1,72 @@
+# Generated by Django 5.2.3 on 2026-10-19 14:20
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+SEARCH_VECTOR_SQL = """
+CREATE OR REPLACE FUNCTION store_product_search_vector() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('simple', coalesce(NEW.name_uk, NEW.name, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(NEW.name_en, '')), 'A') ||
+        setweight(to_tsvector('russian', coalesce(NEW.name_ru, '')), 'A') ||
+        setweight(
+            to_tsvector('simple', coalesce(NEW.vendor, '') || ' ' || coalesce(NEW.article, '')),
+            'B'
+        ) ||
+        setweight(to_tsvector('simple', coalesce(NEW.description_uk, NEW.description, '')), 'C') ||
+        setweight(to_tsvector('english', coalesce(NEW.description_en, '')), 'C') ||
+        setweight(to_tsvector('russian', coalesce(NEW.description_ru, '')), 'C');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER store_product_search_vector
+    BEFORE INSERT OR UPDATE OF
+        name, name_uk, name_en, name_ru, vendor, article,
+        description, description_uk, description_en, description_ru
+    ON store_product
+    FOR EACH ROW EXECUTE FUNCTION store_product_search_vector();
+
+UPDATE store_product SET name = name;
+"""
+
+DROP_SEARCH_VECTOR_SQL = """
+DROP TRIGGER IF EXISTS store_product_search_vector ON store_product;
+DROP FUNCTION IF EXISTS store_product_search_vector();
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0007_categoryattributefacet'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddField(
+            model_name='product',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True, verbose_name='Search Vector'),
+        ),
+        migrations.RunSQL(SEARCH_VECTOR_SQL, DROP_SEARCH_VECTOR_SQL),
+        migrations.AddIndex(
+            model_name='product',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='product_search_vector_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['name_uk'], name='product_name_uk_trgm_idx', opclasses=['gin_trgm_ops']),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['name_en'], name='product_name_en_trgm_idx', opclasses=['gin_trgm_ops']),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['name_ru'], name='product_name_ru_trgm_idx', opclasses=['gin_trgm_ops']),
+        ),
+    ]
@@ -0,0 +1,62 @@
+# Generated by Django 5.2.3 on 2026-10-19 16:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0008_product_search_vector'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProductStatusCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.PositiveSmallIntegerField(unique=True, verbose_name='Status')),
+                ('product_count', models.IntegerField(default=0, verbose_name='Product Count')),
+                ('modified', models.DateTimeField(auto_now=True, verbose_name='Modified')),
+            ],
+            options={
+                'verbose_name': 'Product Status Count',
+                'verbose_name_plural': 'Product Status Counts',
+                'db_table': 'store_productstatuscount',
+            },
+        ),
+        migrations.CreateModel(
+            name='CategoryProductCount',
+            fields=[
+                ('category', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='product_counts', serialize=False, to='main.category', verbose_name='Category')),
+                ('product_count', models.IntegerField(default=0, verbose_name='Product Count')),
+                ('active_count', models.IntegerField(default=0, verbose_name='Active')),
+                ('draft_count', models.IntegerField(default=0, verbose_name='Draft')),
+                ('archived_count', models.IntegerField(default=0, verbose_name='Archived')),
+                ('modified', models.DateTimeField(auto_now=True, verbose_name='Modified')),
+            ],
+            options={
+                'verbose_name': 'Category Product Count',
+                'verbose_name_plural': 'Category Product Counts',
+                'db_table': 'store_categoryproductcount',
+                'indexes': [models.Index(fields=['-product_count', 'category'], name='category_product_count_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='FeedRunSummary',
+            fields=[
+                ('feed', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='run_summary', serialize=False, to='main.feedsource', verbose_name='Feed')),
+                ('total', models.IntegerField(default=0, verbose_name='Total Runs')),
+                ('success', models.IntegerField(default=0, verbose_name='Successful Runs')),
+                ('error', models.IntegerField(default=0, verbose_name='Failed Runs')),
+                ('last_success_at', models.DateTimeField(blank=True, null=True, verbose_name='Last Success At')),
+                ('last_error_at', models.DateTimeField(blank=True, null=True, verbose_name='Last Error At')),
+                ('modified', models.DateTimeField(auto_now=True, verbose_name='Modified')),
+            ],
+            options={
+                'verbose_name': 'Feed Run Summary',
+                'verbose_name_plural': 'Feed Run Summaries',
+                'db_table': 'store_feedrunsummary',
+            },
+        ),
+    ]
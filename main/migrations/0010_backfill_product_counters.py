@@ -0,0 +1,87 @@
+# Generated by Django 5.2.3 on 2026-10-19 17:20
+
+from collections import Counter
+
+from django.db import migrations
+from django.db.models import Count, Max, Q
+
+ACTIVE, DRAFT, ARCHIVED = 2, 1, 3
+SUCCESS, ERROR = 2, 3
+
+
+def backfill(apps, schema_editor):
+    Category = apps.get_model("main", "Category")
+    Product = apps.get_model("main", "Product")
+    ProductStatusCount = apps.get_model("main", "ProductStatusCount")
+    CategoryProductCount = apps.get_model("main", "CategoryProductCount")
+    FeedParsingReport = apps.get_model("main", "FeedParsingReport")
+    FeedRunSummary = apps.get_model("main", "FeedRunSummary")
+
+    ProductStatusCount.objects.bulk_create(
+        ProductStatusCount(status=row["status"], product_count=row["count"])
+        for row in Product.objects.values("status").annotate(count=Count("id"))
+    )
+    CategoryProductCount.objects.bulk_create(
+        (
+            CategoryProductCount(**row)
+            for row in Product.objects.filter(category__isnull=False)
+            .values("category_id")
+            .annotate(
+                product_count=Count("id"),
+                active_count=Count("id", filter=Q(status=ACTIVE)),
+                draft_count=Count("id", filter=Q(status=DRAFT)),
+                archived_count=Count("id", filter=Q(status=ARCHIVED)),
+            )
+        ),
+        batch_size=1000,
+    )
+    FeedRunSummary.objects.bulk_create(
+        FeedRunSummary(**row)
+        for row in FeedParsingReport.objects.order_by()
+        .values("feed_id")
+        .annotate(
+            total=Count("id"),
+            success=Count("id", filter=Q(status=SUCCESS)),
+            error=Count("id", filter=Q(status=ERROR)),
+            last_success_at=Max("finished_at", filter=Q(status=SUCCESS)),
+            last_error_at=Max("finished_at", filter=Q(status=ERROR)),
+        )
+    )
+
+    totals = Counter(
+        dict(
+            Product.objects.filter(
+                is_active=True, status=ACTIVE, category__isnull=False
+            )
+            .values("category_id")
+            .annotate(count=Count("id"))
+            .values_list("category_id", "count")
+        )
+    )
+    categories = list(Category.objects.order_by("-level").values_list("id", "parent_id"))
+    for category_id, parent_id in categories:
+        if parent_id:
+            totals[parent_id] += totals[category_id]
+    Category.objects.bulk_update(
+        [
+            Category(
+                id=category_id,
+                active_product_count=totals[category_id],
+                has_active_products=totals[category_id] > 0,
+            )
+            for category_id, _ in categories
+        ],
+        ["active_product_count", "has_active_products"],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0009_product_stats'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
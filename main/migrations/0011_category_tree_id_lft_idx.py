@@ -0,0 +1,17 @@
+# Generated by Django 5.2.3 on 2026-10-19 18:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0010_backfill_product_counters'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='category',
+            index=models.Index(fields=['tree_id', 'lft'], name='main_category_tree_id_lft_idx'),
+        ),
+    ]
@@ -3,11 +3,15 @@ from .core import Commission
 from .store import (
     Category,
     CategoryAttributeConfig,
+    CategoryAttributeFacet,
     FeedParsingReport,
     FeedSource,
     Product,
     ProductAttribute,
     ProductImage,
+    ProductStatusCount,
+    CategoryProductCount,
+    FeedRunSummary,
 )
 
 __all__ = [
@@ -17,9 +21,13 @@ __all__ = [
     "Commission",
     "Category",
     "CategoryAttributeConfig",
+    "CategoryAttributeFacet",
     "FeedSource",
     "FeedParsingReport",
     "Product",
     "ProductAttribute",
     "ProductImage",
+    "ProductStatusCount",
+    "CategoryProductCount",
+    "FeedRunSummary",
 ]
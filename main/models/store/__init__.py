@@ -1,14 +1,20 @@
 from .category import Category
 from .category_attribute_config import CategoryAttributeConfig
+from .facet import CategoryAttributeFacet
 from .feed import FeedParsingReport, FeedSource
 from .product import Product, ProductAttribute, ProductImage
+from .stats import CategoryProductCount, FeedRunSummary, ProductStatusCount
 
 __all__ = [
     "Category",
     "CategoryAttributeConfig",
+    "CategoryAttributeFacet",
     "FeedSource",
     "FeedParsingReport",
     "Product",
     "ProductAttribute",
     "ProductImage",
+    "ProductStatusCount",
+    "CategoryProductCount",
+    "FeedRunSummary",
 ]
@@ -0,0 +1,45 @@
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+
+class CategoryAttributeFacet(models.Model):
+    """Precomputed number of active products per attribute value in a category.
+
+    Rows exist only for attributes marked ``is_filterable`` in the category's
+    ``CategoryAttributeConfig`` and are rebuilt by ``FacetEngine.refresh``.
+    """
+
+    category = models.ForeignKey(
+        "main.Category",
+        on_delete=models.CASCADE,
+        related_name="attribute_facets",
+        verbose_name=_("Category"),
+    )
+    attribute = models.ForeignKey(
+        "main.Attribute",
+        on_delete=models.CASCADE,
+        related_name="+",
+        verbose_name=_("Attribute"),
+    )
+    value = models.ForeignKey(
+        "main.AttributeValue",
+        on_delete=models.CASCADE,
+        related_name="+",
+        verbose_name=_("Value"),
+    )
+    product_count = models.PositiveIntegerField(_("Product Count"), default=0)
+    refreshed_at = models.DateTimeField(_("Refreshed At"), auto_now=True)
+
+    class Meta:
+        db_table = "store_categoryattributefacet"
+        verbose_name = _("Category Attribute Facet")
+        verbose_name_plural = _("Category Attribute Facets")
+        constraints = [
+            models.UniqueConstraint(
+                fields=["category", "attribute", "value"],
+                name="category_attribute_facet_unique",
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.category_id}: {self.attribute_id}={self.value_id}"
@@ -1,6 +1,9 @@
+from django.contrib.postgres.fields import ArrayField
 from django.db import models
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
+from model_utils import FieldTracker
+
 from ..base import BaseModel
 
 
@@ -56,6 +59,12 @@ class FeedParsingReport(BaseModel):
 
     download_error = models.TextField(_("Download Error"), blank=True, null=True)
     parsing_error = models.TextField(_("Parsing Error"), blank=True, null=True)
+    snapshot = models.FileField(
+        _("Snapshot"), upload_to="feeds/snapshots/", blank=True, null=True
+    )
+
+    # Read by the feed run summary signals.
+    tracker = FieldTracker(fields=["status"])
 
     class Meta:
         db_table = "store_feedparsingreport"
@@ -78,8 +87,16 @@ class FeedParsingReportItem(models.Model):
     product_external_id = models.CharField(max_length=255)
     success = models.BooleanField(default=True)
     error_message = models.TextField(blank=True, null=True)
+    occurrences = models.PositiveIntegerField(_("Occurrences"), default=1)
+    sample_external_ids = ArrayField(
+        models.CharField(max_length=255),
+        verbose_name=_("Sample External IDs"),
+        default=list,
+        blank=True,
+    )
 
     class Meta:
         db_table = "store_feedparsingreportitem"
         verbose_name = _("Feed Parsing Report Item")
         verbose_name_plural = _("Feed Parsing Report Items")
+        ordering = ["-occurrences"]
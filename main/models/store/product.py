@@ -1,6 +1,9 @@
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 from django.db.models.functions import MD5
 from django.utils.translation import gettext_lazy as _
+from model_utils import FieldTracker
 
 from ..base import BaseModel
 
@@ -55,6 +58,12 @@ class Product(BaseModel):
     published_at = models.DateTimeField(_("Published At"), null=True, blank=True)
     is_new = models.BooleanField(_("Is New"), default=False)
 
+    # Maintained by the store_product_search_vector trigger (migration 0008).
+    search_vector = SearchVectorField(_("Search Vector"), null=True, editable=False)
+
+    # Read by the product counter signals.
+    tracker = FieldTracker(fields=["status", "category_id", "is_active"])
+
     class Meta:
         db_table = "store_product"
         verbose_name = _("Product")
@@ -66,11 +75,43 @@ class Product(BaseModel):
             ),
             models.Index(fields=["price"], name="product_price_idx"),
             models.Index(fields=["created"], name="product_created_idx"),
+            # Keyset pagination orderings of the product list.
+            models.Index(
+                fields=["-views_count", "id"],
+                name="product_views_id_idx",
+                condition=models.Q(is_active=True),
+            ),
+            models.Index(
+                fields=["price", "id"],
+                name="product_price_id_idx",
+                condition=models.Q(is_active=True),
+            ),
+            models.Index(
+                fields=["-is_new", "-created", "id"],
+                name="product_new_created_id_idx",
+                condition=models.Q(is_active=True),
+            ),
             models.Index(
                 fields=["name"],
                 name="product_name_idx",
             ),
             models.Index(MD5("description"), name="product_description_idx"),
+            GinIndex(fields=["search_vector"], name="product_search_vector_idx"),
+            GinIndex(
+                fields=["name_uk"],
+                name="product_name_uk_trgm_idx",
+                opclasses=["gin_trgm_ops"],
+            ),
+            GinIndex(
+                fields=["name_en"],
+                name="product_name_en_trgm_idx",
+                opclasses=["gin_trgm_ops"],
+            ),
+            GinIndex(
+                fields=["name_ru"],
+                name="product_name_ru_trgm_idx",
+                opclasses=["gin_trgm_ops"],
+            ),
         ]
 
     def __str__(self):
@@ -107,6 +148,10 @@ class ProductAttribute(BaseModel):
             models.Index(fields=["product_id"], name="prod_attr_product_idx"),
             models.Index(fields=["attribute_id"], name="prod_attr_attribute_idx"),
             models.Index(fields=["raw_value"], name="prod_attr_raw_value_idx"),
+            models.Index(
+                fields=["attribute", "value", "product"],
+                name="prod_attr_attr_value_prod_idx",
+            ),
         ]
 
     def __str__(self):
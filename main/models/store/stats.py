@@ -0,0 +1,87 @@
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+
+class ProductStatusCount(models.Model):
+    """Number of products in a status, over the whole catalog.
+
+    Maintained incrementally by ``ProductStats`` and rebuilt by
+    ``ProductStats.reconcile``.
+    """
+
+    status = models.PositiveSmallIntegerField(_("Status"), unique=True)
+    product_count = models.IntegerField(_("Product Count"), default=0)
+    modified = models.DateTimeField(_("Modified"), auto_now=True)
+
+    class Meta:
+        db_table = "store_productstatuscount"
+        verbose_name = _("Product Status Count")
+        verbose_name_plural = _("Product Status Counts")
+
+    def __str__(self):
+        return f"{self.status}: {self.product_count}"
+
+
+class CategoryProductCount(models.Model):
+    """Number of products of a category, in total and per status.
+
+    Maintained incrementally by ``ProductStats`` and rebuilt by
+    ``ProductStats.reconcile``.
+    """
+
+    category = models.OneToOneField(
+        "main.Category",
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="product_counts",
+        verbose_name=_("Category"),
+    )
+    product_count = models.IntegerField(_("Product Count"), default=0)
+    active_count = models.IntegerField(_("Active"), default=0)
+    draft_count = models.IntegerField(_("Draft"), default=0)
+    archived_count = models.IntegerField(_("Archived"), default=0)
+    modified = models.DateTimeField(_("Modified"), auto_now=True)
+
+    class Meta:
+        db_table = "store_categoryproductcount"
+        verbose_name = _("Category Product Count")
+        verbose_name_plural = _("Category Product Counts")
+        indexes = [
+            models.Index(
+                fields=["-product_count", "category"],
+                name="category_product_count_idx",
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.category_id}: {self.product_count}"
+
+
+class FeedRunSummary(models.Model):
+    """Rollup of the parsing reports of a feed.
+
+    Maintained incrementally by ``FeedRunStats`` and rebuilt by
+    ``FeedRunStats.reconcile``.
+    """
+
+    feed = models.OneToOneField(
+        "main.FeedSource",
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="run_summary",
+        verbose_name=_("Feed"),
+    )
+    total = models.IntegerField(_("Total Runs"), default=0)
+    success = models.IntegerField(_("Successful Runs"), default=0)
+    error = models.IntegerField(_("Failed Runs"), default=0)
+    last_success_at = models.DateTimeField(_("Last Success At"), null=True, blank=True)
+    last_error_at = models.DateTimeField(_("Last Error At"), null=True, blank=True)
+    modified = models.DateTimeField(_("Modified"), auto_now=True)
+
+    class Meta:
+        db_table = "store_feedrunsummary"
+        verbose_name = _("Feed Run Summary")
+        verbose_name_plural = _("Feed Run Summaries")
+
+    def __str__(self):
+        return f"{self.feed_id}: {self.success}/{self.total}"
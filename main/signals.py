@@ -0,0 +1,109 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from mptt.signals import node_moved
+
+from main.models import (
+    Category,
+    CategoryAttributeConfig,
+    FeedParsingReport,
+    Product,
+)
+from services.cache.generations import (
+    CATEGORIES_SCOPE,
+    PRODUCTS_SCOPE,
+    bump_generations,
+    category_scope,
+    feed_scope,
+)
+from services.feed.core.report import FeedRunStats
+from services.product.detail_cache import ProductDetailCache
+from services.product.stats import ProductStats
+
+
+@receiver(post_save, sender=Product)
+@receiver(post_delete, sender=Product)
+def invalidate_product_detail(sender, instance, **kwargs):
+    product_id = instance.id
+    transaction.on_commit(lambda: ProductDetailCache().invalidate([product_id]))
+
+
+@receiver(post_save, sender=Product)
+@receiver(post_delete, sender=Product)
+def bump_product_generations(sender, instance, **kwargs):
+    scopes = [PRODUCTS_SCOPE]
+    if instance.category_id:
+        scopes.append(category_scope(instance.category_id))
+    previous_category_id = instance.tracker.previous("category_id")
+    if previous_category_id and previous_category_id != instance.category_id:
+        scopes.append(category_scope(previous_category_id))
+    if instance.feed_source_id:
+        scopes.append(feed_scope(instance.feed_source_id))
+    bump_generations(*scopes)
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def bump_category_generations(sender, instance, **kwargs):
+    scopes = [CATEGORIES_SCOPE, category_scope(instance.id)]
+    if instance.parent_id:
+        scopes.append(category_scope(instance.parent_id))
+    bump_generations(*scopes)
+
+
+@receiver(post_save, sender=Product)
+def count_saved_product(sender, instance, created, **kwargs):
+    tracker = instance.tracker
+    if created:
+        old = None
+    elif any(
+        tracker.has_changed(field) for field in ("status", "category_id", "is_active")
+    ):
+        old = (
+            tracker.previous("category_id"),
+            tracker.previous("status"),
+            tracker.previous("is_active"),
+        )
+    else:
+        return
+    ProductStats().record(
+        old, (instance.category_id, instance.status, instance.is_active)
+    )
+
+
+@receiver(post_delete, sender=Product)
+def count_deleted_product(sender, instance, **kwargs):
+    ProductStats().record(
+        (instance.category_id, instance.status, instance.is_active), None
+    )
+
+
+@receiver(node_moved, sender=Category)
+@receiver(post_delete, sender=Category)
+def recount_category_tree(sender, instance, **kwargs):
+    transaction.on_commit(ProductStats().reconcile_active_counts)
+
+
+@receiver(post_save, sender=CategoryAttributeConfig)
+@receiver(post_delete, sender=CategoryAttributeConfig)
+def refresh_configured_facets(sender, instance, **kwargs):
+    from tasks.tasks import refresh_category_facets
+
+    category_id = instance.category_id
+    if category_id:
+        transaction.on_commit(lambda: refresh_category_facets.delay([category_id]))
+
+
+@receiver(post_save, sender=FeedParsingReport)
+def count_saved_report(sender, instance, created, **kwargs):
+    old_status = None if created else instance.tracker.previous("status")
+    if not created and old_status == instance.status:
+        return
+    FeedRunStats().record(
+        instance.feed_id, old_status, instance.status, instance.finished_at
+    )
+
+
+@receiver(post_delete, sender=FeedParsingReport)
+def count_deleted_report(sender, instance, **kwargs):
+    FeedRunStats().record(instance.feed_id, instance.status, None)
@@ -30,6 +30,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     "mptt",
     "rest_framework",
     "django_filters",
@@ -43,6 +44,7 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
+    "api.middleware.CompressionMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.locale.LocaleMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -145,10 +147,99 @@ CELERY_BEAT_SCHEDULE = {
         "task": "tasks.tasks.process_all_feeds",
         "schedule": 300,
     },
+    "flush-product-views-every-minute": {
+        "task": "tasks.tasks.flush_product_views",
+        "schedule": 60,
+    },
+    "rebuild-category-facets-daily": {
+        "task": "tasks.tasks.rebuild_category_facets",
+        "schedule": 24 * 60 * 60,
+    },
+    "rebuild-product-bitmap-index-daily": {
+        "task": "tasks.tasks.rebuild_product_bitmap_index",
+        "schedule": 24 * 60 * 60,
+    },
+    "rebuild-suggestions-daily": {
+        "task": "tasks.tasks.rebuild_suggestions",
+        "schedule": 24 * 60 * 60,
+    },
+    "reconcile-stats-hourly": {
+        "task": "tasks.tasks.reconcile_stats",
+        "schedule": 60 * 60,
+    },
+    "rebuild-views-leaderboard-daily": {
+        "task": "tasks.tasks.rebuild_views_leaderboard",
+        "schedule": 24 * 60 * 60,
+    },
+    "prune-feed-snapshots-daily": {
+        "task": "tasks.tasks.prune_feed_snapshots",
+        "schedule": 24 * 60 * 60,
+    },
+    "generate-partner-feed-hourly": {
+        "task": "tasks.tasks.generate_partner_feed",
+        "schedule": 60 * 60,
+    },
 }
 
+# Feed parsing settings
+# Processes parsing offers of feeds of at least FEED_PARALLEL_PARSE_MIN_BYTES
+# UTF-8 bytes. Celery prefork workers cannot start them, so feeds are parsed
+# serially there whatever the setting.
+FEED_PARSER_WORKERS = int(os.getenv("FEED_PARSER_WORKERS", 1))
+FEED_PARALLEL_PARSE_MIN_BYTES = int(
+    os.getenv("FEED_PARALLEL_PARSE_MIN_BYTES", 50 * 1024 * 1024)
+)
+FEED_SNAPSHOTS_ENABLED = os.getenv("FEED_SNAPSHOTS_ENABLED", "True") == "True"
+# Snapshots of older reports are deleted daily by prune_feed_snapshots.
+FEED_SNAPSHOT_RETENTION_DAYS = int(os.getenv("FEED_SNAPSHOT_RETENTION_DAYS", 14))
+FEED_BATCH_SIZE = int(os.getenv("FEED_BATCH_SIZE", 500))
+FEED_REPORT_MAX_ERROR_GROUPS = int(os.getenv("FEED_REPORT_MAX_ERROR_GROUPS", 100))
+FEED_REPORT_ERROR_SAMPLES = int(os.getenv("FEED_REPORT_ERROR_SAMPLES", 10))
+
+# API response cache: entries live for API_CACHE_TTL seconds and are rebuilt by
+# one request after API_CACHE_FRESH_FOR seconds. Data changes invalidate them
+# immediately through generation counters.
+API_CACHE_TTL = int(os.getenv("API_CACHE_TTL", 60 * 60))
+API_CACHE_FRESH_FOR = int(os.getenv("API_CACHE_FRESH_FOR", 10 * 60))
+
+# Single-flight recomputation: lease of the leader's lock and how long other
+# requests wait for its result, in seconds.
+SINGLE_FLIGHT_LEASE = int(os.getenv("SINGLE_FLIGHT_LEASE", 10))
+SINGLE_FLIGHT_WAIT = int(os.getenv("SINGLE_FLIGHT_WAIT", 10))
+
+# Generated Rozetka feed of our catalog for marketplaces.
+PARTNER_FEED_ROOT = os.getenv("PARTNER_FEED_ROOT", os.path.join(MEDIA_ROOT, "feeds"))
+PARTNER_FEED_SHOP_NAME = os.getenv("PARTNER_FEED_SHOP_NAME", "Shop")
+PARTNER_FEED_SHOP_URL = os.getenv("PARTNER_FEED_SHOP_URL", "http://localhost:8000/")
+
+# Top viewed products: supported windows in days, and how long the union of
+# their day leaderboards is reused, in seconds.
+VIEWS_LEADERBOARD_WINDOWS = (7, 30)
+VIEWS_LEADERBOARD_WINDOW_TTL = int(os.getenv("VIEWS_LEADERBOARD_WINDOW_TTL", 60))
+
+# Most product IDs accepted by one products/batch/ request.
+PRODUCT_BATCH_MAX_IDS = int(os.getenv("PRODUCT_BATCH_MAX_IDS", 100))
+
+# Rows fetched per round trip of the server-side cursor of product exports.
+PRODUCT_EXPORT_CHUNK_SIZE = int(os.getenv("PRODUCT_EXPORT_CHUNK_SIZE", 2000))
+
+# Responses at least this large are compressed with brotli or gzip.
+RESPONSE_COMPRESSION_MIN_LENGTH = int(
+    os.getenv("RESPONSE_COMPRESSION_MIN_LENGTH", 1024)
+)
+RESPONSE_BROTLI_QUALITY = int(os.getenv("RESPONSE_BROTLI_QUALITY", 5))
+
 REST_FRAMEWORK = {
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
+    "DEFAULT_RENDERER_CLASSES": [
+        "api.v1.renderers.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "api.v1.parsers.FastJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ],
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.LimitOffsetPagination",
     "PAGE_SIZE": 20,
     "DEFAULT_FILTER_BACKENDS": ["django_filters.rest_framework.DjangoFilterBackend"],
@@ -0,0 +1,123 @@
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterable, Set
+
+from django.db import transaction
+from django.db.models import Q
+from django_redis import get_redis_connection
+
+from main.models import Category
+
+logger = logging.getLogger(__name__)
+
+PRODUCTS_SCOPE = "products"
+CATEGORIES_SCOPE = "categories"
+
+_deferred = threading.local()
+
+
+def category_scope(category_id: int) -> str:
+    return f"category:{category_id}"
+
+
+def feed_scope(feed_id: int) -> str:
+    return f"feed:{feed_id}"
+
+
+class CacheGenerations:
+    """Version counters of the data scopes cached responses depend on.
+
+    A cached response stores the generations of its scopes in its key, so
+    bumping a scope makes every response built from it unreachable at once,
+    without knowing their keys. Scopes are ``products`` and ``categories``
+    for the whole catalog, ``category:<id>`` for the products of the subtree
+    of a category and ``feed:<id>`` for the products of a feed.
+    """
+
+    def __init__(self):
+        self.redis = get_redis_connection("default")
+
+    def get_many(self, scopes: Iterable[str]) -> Dict[str, int]:
+        scopes = sorted(set(scopes))
+        if not scopes:
+            return {}
+        values = self.redis.mget([self._key(scope) for scope in scopes])
+        return {scope: int(value or 0) for scope, value in zip(scopes, values)}
+
+    def bump(self, scopes: Iterable[str]) -> None:
+        scopes = set(scopes)
+        if not scopes:
+            return
+        with self.redis.pipeline(transaction=False) as pipe:
+            for scope in scopes:
+                pipe.incr(self._key(scope))
+            pipe.execute()
+        logger.info(f"Bumped cache generations: {', '.join(sorted(scopes))}")
+
+    @staticmethod
+    def _key(scope: str) -> str:
+        return f"cache_generation:{scope}"
+
+
+def _with_ancestor_scopes(scopes: Iterable[str]) -> Set[str]:
+    """Adds the scopes of the ancestors of every ``category:<id>`` scope."""
+    scopes = set(scopes)
+    category_ids = {
+        int(scope.split(":", 1)[1]) for scope in scopes if scope.startswith("category:")
+    }
+    if not category_ids:
+        return scopes
+
+    condition = Q()
+    for tree_id, lft, rght in Category.objects.filter(id__in=category_ids).values_list(
+        "tree_id", "lft", "rght"
+    ):
+        condition |= Q(tree_id=tree_id, lft__lt=lft, rght__gt=rght)
+    if condition:
+        scopes.update(
+            category_scope(ancestor_id)
+            for ancestor_id in Category.objects.filter(condition).values_list(
+                "id", flat=True
+            )
+        )
+    return scopes
+
+
+def _bump(scopes: Iterable[str]) -> None:
+    try:
+        CacheGenerations().bump(_with_ancestor_scopes(scopes))
+    except Exception as e:
+        logger.warning(f"Failed to bump cache generations: {e}")
+
+
+def bump_generations(*scopes: str) -> None:
+    """Bumps ``scopes`` when the current transaction commits.
+
+    A category scope also bumps the scopes of the category's ancestors, so
+    responses built from a whole subtree depend on its root only.
+
+    Inside ``deferred_generation_bumps`` the scopes are collected instead and
+    bumped once when the block ends.
+    """
+    pending = getattr(_deferred, "scopes", None)
+    if pending is not None:
+        pending.update(scopes)
+        return
+    transaction.on_commit(lambda: _bump(scopes))
+
+
+@contextmanager
+def deferred_generation_bumps():
+    """Collects the bumps of a bulk write, such as a feed run, into one."""
+    if getattr(_deferred, "scopes", None) is not None:
+        yield
+        return
+
+    _deferred.scopes = set()
+    try:
+        yield
+    finally:
+        scopes, _deferred.scopes = _deferred.scopes, None
+        if scopes:
+            transaction.on_commit(lambda: _bump(scopes))
@@ -0,0 +1,102 @@
+import logging
+import time
+from typing import Callable, Dict, Optional, Tuple, TypeVar
+
+from django.conf import settings
+from django_redis import get_redis_connection
+from redis.exceptions import LockError
+
+logger = logging.getLogger(__name__)
+
+METRICS_KEY = "single_flight:metrics"
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """Computes the value of a key in one process at a time.
+
+    The process that takes the Redis lock of a key becomes the leader and
+    computes the value. The lock has a short lease, so a crashed leader holds
+    the key back for ``lease`` seconds at most. Other processes, on any host,
+    return the stale value when they have one, or poll ``load`` until the
+    leader has stored its result. When the leader gives up without a result
+    they compute the value themselves.
+
+    Every call is counted in a Redis hash by name and outcome: ``leader``,
+    ``stale``, ``coalesced`` or ``fallback``.
+    """
+
+    OUTCOMES = ("leader", "stale", "coalesced", "fallback")
+
+    def __init__(
+        self,
+        name: str,
+        lease: Optional[int] = None,
+        wait: Optional[float] = None,
+        poll_interval: float = 0.05,
+    ):
+        self.redis = get_redis_connection("default")
+        self.name = name
+        self.lease = lease or settings.SINGLE_FLIGHT_LEASE
+        self.wait = wait or settings.SINGLE_FLIGHT_WAIT
+        self.poll_interval = poll_interval
+
+    def run(
+        self,
+        key: str,
+        compute: Callable[[], T],
+        load: Callable[[], Optional[T]],
+        stale: Optional[T] = None,
+    ) -> Tuple[T, str]:
+        """Returns the value of ``key`` and the outcome of the call.
+
+        ``compute`` must store its result where ``load`` finds it.
+        """
+        lock = self.redis.lock(f"single_flight:lock:{key}", timeout=self.lease)
+        if lock.acquire(blocking=False):
+            try:
+                return self._count(compute(), "leader")
+            finally:
+                try:
+                    lock.release()
+                except LockError:
+                    logger.warning(
+                        f"Single-flight lease of {key} expired before the "
+                        f"computation finished"
+                    )
+
+        if stale is not None:
+            return self._count(stale, "stale")
+
+        deadline = time.monotonic() + self.wait
+        while time.monotonic() < deadline:
+            time.sleep(self.poll_interval)
+            value = load()
+            if value is not None:
+                return self._count(value, "coalesced")
+            if not lock.locked():
+                break
+
+        logger.info(f"Single-flight leader of {key} gave up, computing locally")
+        return self._count(compute(), "fallback")
+
+    def _count(self, value: T, outcome: str) -> Tuple[T, str]:
+        try:
+            self.redis.hincrby(METRICS_KEY, f"{self.name}:{outcome}", 1)
+        except Exception as e:
+            logger.warning(f"Failed to record single-flight metrics: {e}")
+        return value, outcome
+
+    @classmethod
+    def metrics(cls) -> Dict[str, Dict[str, int]]:
+        """Returns the call counts per name and outcome."""
+        metrics = {}
+        for field, count in (
+            get_redis_connection("default").hgetall(METRICS_KEY).items()
+        ):
+            name, outcome = field.decode().rsplit(":", 1)
+            metrics.setdefault(name, dict.fromkeys(cls.OUTCOMES, 0))[outcome] = int(
+                count
+            )
+        return metrics
@@ -0,0 +1,250 @@
+import logging
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set, Tuple
+
+from django.db.models import Count
+
+from main.models import (
+    Attribute,
+    Category,
+    FeedSource,
+    Product,
+    ProductAttribute,
+    ProductImage,
+)
+from services.feed.parser.types import FeedCategory, FeedOffer, iter_attributes
+from services.product.attribute_matcher import AttributeMatcher
+from services.product.category_matcher import CategoryMatcher
+
+logger = logging.getLogger(__name__)
+
+COMPARED_FIELDS = (
+    "name",
+    "vendor",
+    "article",
+    "description",
+    "price",
+    "currency",
+    "stock_quantity",
+    "available",
+    "url",
+    "status",
+    "category_id",
+)
+
+
+@dataclass
+class CategoryDiff:
+    added: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    archived: int = 0
+    attribute_changes: int = 0
+    image_changes: int = 0
+
+
+@dataclass
+class FeedDiff:
+    to_add: List[str] = field(default_factory=list)
+    to_update: Dict[str, List[str]] = field(default_factory=dict)
+    to_archive: List[str] = field(default_factory=list)
+    attribute_changes: Dict[str, List[Tuple[str, str]]] = field(default_factory=dict)
+    image_changes: List[str] = field(default_factory=list)
+    categories: Dict[str, CategoryDiff] = field(
+        default_factory=lambda: defaultdict(CategoryDiff)
+    )
+
+
+class FeedDiffer:
+    """Computes what a feed run would change without writing anything.
+
+    Existing products, attributes and image counts of the feed are read with
+    one query each and compared with the parsed offers in memory.
+
+    Categories and attributes are resolved with the ``CategoryMatcher`` and
+    ``AttributeMatcher`` that ``FeedManager`` uses, without creating
+    anything: offers whose fallback category does not exist yet are
+    reported under ``"<name> (new)"``, and attributes or values that would
+    be created count as attribute changes. Images are compared by count,
+    because stored images do not keep their source URLs.
+    """
+
+    def __init__(
+        self,
+        feed_source: FeedSource,
+        categories: List[FeedCategory],
+        offers: List[FeedOffer],
+    ):
+        self.feed_source = feed_source
+        self.category_names = {c.external_id: c.name for c in categories}
+        self.offers = offers
+        self.category_matcher = CategoryMatcher()
+        self.attribute_matcher = AttributeMatcher()
+        self._fallback_categories: Dict[str, Optional[Tuple[int, str]]] = {}
+        self._attributes: Dict[int, Optional[Attribute]] = {}
+
+    def compute(self) -> FeedDiff:
+        diff = FeedDiff()
+        existing = self._existing_products()
+        existing_attributes = self._existing_attributes()
+        image_counts = self._image_counts()
+
+        for offer in self.offers:
+            category_id, label = self._resolve_category(
+                self.category_names.get(offer.category_id), offer.name
+            )
+            category_diff = diff.categories[label]
+
+            new_values = self._new_values(offer, category_id)
+            current = existing.get(offer.external_id)
+            if current is None:
+                diff.to_add.append(offer.external_id)
+                category_diff.added += 1
+            else:
+                changed = [
+                    name
+                    for name in COMPARED_FIELDS
+                    if new_values[name] != current[name]
+                ]
+                if changed:
+                    diff.to_update[offer.external_id] = changed
+                    category_diff.updated += 1
+                else:
+                    category_diff.unchanged += 1
+
+            current_attributes = existing_attributes.get(offer.external_id, set())
+            new_attributes = {
+                (name, value)
+                for name, value, match in self._offer_attributes(offer)
+                if match not in current_attributes
+            }
+            if new_attributes:
+                diff.attribute_changes[offer.external_id] = sorted(new_attributes)
+                category_diff.attribute_changes += 1
+
+            if offer.pictures and len(offer.pictures) != image_counts.get(
+                offer.external_id, 0
+            ):
+                diff.image_changes.append(offer.external_id)
+                category_diff.image_changes += 1
+
+        offer_ids = {offer.external_id for offer in self.offers}
+        category_titles = dict(
+            Category.objects.filter(
+                id__in={p["category_id"] for p in existing.values()}
+            ).values_list("id", "title")
+        )
+        for external_id, current in existing.items():
+            if (
+                external_id not in offer_ids
+                and current["is_active"]
+                and current["status"] != Product.Status.ARCHIVED
+            ):
+                diff.to_archive.append(external_id)
+                label = category_titles.get(current["category_id"]) or "-"
+                diff.categories[label].archived += 1
+
+        diff.categories = dict(diff.categories)
+        return diff
+
+    def _existing_products(self) -> Dict[str, dict]:
+        rows = Product.objects.filter(feed_source=self.feed_source).values(
+            "external_id", "is_active", *COMPARED_FIELDS
+        )
+        return {row["external_id"]: row for row in rows.iterator(chunk_size=5000)}
+
+    def _existing_attributes(self) -> Dict[str, Set[Tuple[int, int]]]:
+        attributes = defaultdict(set)
+        rows = ProductAttribute.objects.filter(
+            product__feed_source=self.feed_source
+        ).values_list("product__external_id", "attribute_id", "value_id")
+        for external_id, attribute_id, value_id in rows.iterator(chunk_size=5000):
+            attributes[external_id].add((attribute_id, value_id))
+        return attributes
+
+    def _image_counts(self) -> Dict[str, int]:
+        return dict(
+            ProductImage.objects.filter(product__feed_source=self.feed_source)
+            .values("product__external_id")
+            .annotate(count=Count("id"))
+            .values_list("product__external_id", "count")
+        )
+
+    def _resolve_category(
+        self, category_name: Optional[str], offer_name: str
+    ) -> Tuple[Optional[int], str]:
+        """Returns the category ID ``FeedManager`` would assign and its label."""
+        category = self.category_matcher.find_category(category_name, offer_name)
+        if category:
+            return category.id, category.title
+        if not category_name:
+            return None, "-"
+
+        title = category_name.strip()
+        if title not in self._fallback_categories:
+            self._fallback_categories[title] = (
+                Category.objects.filter(title=title).values_list("id", "title").first()
+            )
+        return self._fallback_categories[title] or (None, f"{title} (new)")
+
+    def _new_values(self, offer: FeedOffer, category_id: Optional[int]) -> dict:
+        values = {
+            "name": offer.name or "",
+            "vendor": offer.vendor or "",
+            "article": offer.article or "",
+            "description": offer.description or "",
+            "price": offer.price,
+            "currency": offer.currency or "UAH",
+            "stock_quantity": offer.stock_quantity,
+            "available": offer.available,
+            "url": offer.url or "",
+            "category_id": category_id,
+        }
+
+        if offer.name and offer.price > 0 and offer.pictures and category_id:
+            status = Product.Status.ACTIVE
+        else:
+            status = Product.Status.DRAFT
+        if not offer.available and status == Product.Status.ACTIVE:
+            status = Product.Status.ARCHIVED
+        values["status"] = status
+        return values
+
+    def _offer_attributes(
+        self, offer: FeedOffer
+    ) -> Set[Tuple[str, str, Optional[Tuple[int, int]]]]:
+        """Returns ``(name, value, (attribute_id, value_id))`` of the offer's attributes.
+
+        The IDs are ``None`` when ``FeedManager`` would create the attribute
+        or the value.
+        """
+        attributes = set()
+        for name, values in iter_attributes(offer.attributes):
+            if not isinstance(values, (list, tuple)):
+                values = [values]
+            match = self.attribute_matcher.find_attribute(name, create=False)
+            attribute = match and self._attribute(match["attribute_id"])
+            if match and not attribute:
+                # FeedManager skips matches whose attribute has been deleted.
+                continue
+            for value in values:
+                value = "" if value is None else str(value).strip()
+                if not value:
+                    continue
+                match = None
+                if attribute:
+                    value_match = self.attribute_matcher.find_or_create_value(
+                        attribute, value, create=False
+                    )
+                    if value_match:
+                        match = (attribute.id, value_match["value_id"])
+                attributes.add((name, value, match))
+        return attributes
+
+    def _attribute(self, attribute_id: int) -> Optional[Attribute]:
+        if attribute_id not in self._attributes:
+            self._attributes[attribute_id] = Attribute.objects.filter(
+                id=attribute_id
+            ).first()
+        return self._attributes[attribute_id]
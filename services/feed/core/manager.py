@@ -1,9 +1,11 @@
 import logging
+import os
 import tempfile
 from datetime import timedelta
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 from urllib.request import urlopen
 
+from django.conf import settings
 from django.core.files import File
 from django.db import transaction
 from django.utils import timezone
@@ -18,13 +20,30 @@ from main.models import (
     ProductAttribute,
     ProductImage,
 )
-from main.models.store.feed import FeedParsingReportItem
+from services.cache.generations import (
+    PRODUCTS_SCOPE,
+    bump_generations,
+    category_scope,
+    deferred_generation_bumps,
+    feed_scope,
+)
+from services.feed.core.diff import FeedDiff, FeedDiffer
+from services.feed.core.report import ReportErrorLog
 from services.feed.exceptions import FeedDownloadError, FeedParsingError
 from services.feed.feed_downloader import FeedDownloader
+from services.feed.parser.parallel import ParallelRozetkaFeedParser
 from services.feed.parser.rozetka import RozetkaFeedParser
-from services.feed.parser.types import FeedCategory, FeedOffer, ShopInfo
+from services.feed.parser.types import (
+    FeedCategory,
+    FeedOffer,
+    ShopInfo,
+    iter_attributes,
+)
+from services.feed.snapshot import FeedSnapshotReader, write_snapshot
 from services.product.attribute_matcher import AttributeMatcher
 from services.product.category_matcher import CategoryMatcher
+from services.product.detail_cache import ProductDetailCache
+from services.product.stats import ProductStats, deferred_product_stats
 
 logger = logging.getLogger(__name__)
 
@@ -42,13 +61,12 @@ class FeedManager:
         self.attribute_matcher = AttributeMatcher()
         self.categories = []
         self.current_report = None
+        self.error_log = None
+        self.touched_category_ids = set()
+        self.touched_product_ids = set()
 
     def process_feed(self) -> FeedParsingReport:
-        report = FeedParsingReport.objects.create(
-            feed=self.feed_source,
-            status=FeedParsingReport.Status.STARTED,
-            started_at=timezone.now(),
-        )
+        report = self._start_report()
         logger.info(
             f"Starting feed processing: {self.feed_source.name} (ID: {self.feed_source.id})"
         )
@@ -57,23 +75,8 @@ class FeedManager:
             logger.info(f"Downloaded feed: {self.feed_source.xml_url}")
             shop_info, self.categories, offers = self._parse_feed(content)
             logger.info(f"Parsed {len(offers)} offers from feed")
-            with transaction.atomic():
-                self.current_report = report
-                self._process_offers(offers)
-                new_ids = {offer.external_id for offer in offers}
-
-                archived_count = (
-                    Product.objects.filter(
-                        feed_source=self.feed_source,
-                        is_active=True,
-                    )
-                    .exclude(external_id__in=new_ids)
-                    .update(status=Product.Status.ARCHIVED)
-                )
-
-                logger.info(
-                    f"Archived {archived_count} products that were missing in the feed."
-                )
+            self._save_snapshot(report, shop_info, offers)
+            self._apply_offers(report, offers)
 
             self._update_next_sync()
             self._complete_report(report)
@@ -90,6 +93,121 @@ class FeedManager:
             self._fail_report(report, str(e))
             raise
 
+    def replay_snapshot(self, path: str) -> FeedParsingReport:
+        """Runs the matching and upsert stages over a previously saved snapshot."""
+        report = self._start_report()
+        logger.info(f"Replaying snapshot {path} for feed {self.feed_source.id}")
+        try:
+            with FeedSnapshotReader(path) as snapshot:
+                shop_info, self.categories, offers = snapshot.read()
+            logger.info(f"Loaded {len(offers)} offers from snapshot")
+            self._apply_offers(report, offers)
+
+            self._complete_report(report)
+            logger.info(f"Completed snapshot replay: {self.feed_source.name}")
+            return report
+        except Exception as e:
+            logger.error(
+                f"Error replaying snapshot for feed {self.feed_source.id}: {str(e)}"
+            )
+            self._fail_report(report, str(e))
+            raise
+
+    def diff_feed(self, snapshot_path: Optional[str] = None) -> FeedDiff:
+        """Computes the change set of a feed run without writing anything.
+
+        The feed is downloaded and parsed, or read from ``snapshot_path``
+        when given. No report is created and nothing is locked.
+        """
+        if snapshot_path:
+            with FeedSnapshotReader(snapshot_path) as snapshot:
+                _, self.categories, offers = snapshot.read()
+        else:
+            content = self._download_feed()
+            _, self.categories, offers = self._parse_feed(content)
+
+        logger.info(f"Computing dry-run diff for {len(offers)} offers")
+        return FeedDiffer(self.feed_source, self.categories, offers).compute()
+
+    def _start_report(self) -> FeedParsingReport:
+        return FeedParsingReport.objects.create(
+            feed=self.feed_source,
+            status=FeedParsingReport.Status.STARTED,
+            started_at=timezone.now(),
+        )
+
+    def _apply_offers(self, report: FeedParsingReport, offers: List[FeedOffer]):
+        with (
+            transaction.atomic(),
+            deferred_generation_bumps(),
+            deferred_product_stats(),
+        ):
+            self.current_report = report
+            self.error_log = ReportErrorLog(
+                report,
+                max_groups=settings.FEED_REPORT_MAX_ERROR_GROUPS,
+                max_samples=settings.FEED_REPORT_ERROR_SAMPLES,
+            )
+            self._process_offers(offers)
+            self.error_log.close()
+            new_ids = {offer.external_id for offer in offers}
+
+            archived = list(
+                Product.objects.filter(
+                    feed_source=self.feed_source,
+                    is_active=True,
+                )
+                .exclude(external_id__in=new_ids)
+                .values_list("id", "category_id", "status")
+            )
+            archived_ids = [product_id for product_id, _, _ in archived]
+            archived_count = Product.objects.filter(id__in=archived_ids).update(
+                status=Product.Status.ARCHIVED, modified=timezone.now()
+            )
+            transaction.on_commit(lambda: ProductDetailCache().invalidate(archived_ids))
+            transaction.on_commit(self._refresh_facets)
+            self.touched_product_ids.update(archived_ids)
+            self.touched_category_ids.update(
+                category_id for _, category_id, _ in archived if category_id
+            )
+            product_stats = ProductStats()
+            for _, category_id, status in archived:
+                product_stats.record(
+                    (category_id, status, True),
+                    (category_id, Product.Status.ARCHIVED, True),
+                )
+            transaction.on_commit(self._update_bitmap_index)
+            transaction.on_commit(self._update_suggestions)
+            bump_generations(
+                PRODUCTS_SCOPE,
+                feed_scope(self.feed_source.id),
+                *(category_scope(c) for c in self.touched_category_ids),
+            )
+
+            logger.info(
+                f"Archived {archived_count} products that were missing in the feed."
+            )
+
+    def _refresh_facets(self):
+        from tasks.tasks import refresh_category_facets
+
+        if self.touched_category_ids:
+            refresh_category_facets.delay(sorted(self.touched_category_ids))
+
+    def _update_bitmap_index(self):
+        from tasks.tasks import update_product_bitmap_index
+
+        if self.touched_product_ids:
+            update_product_bitmap_index.delay(sorted(self.touched_product_ids))
+
+    def _update_suggestions(self):
+        from tasks.tasks import update_suggestions
+
+        if self.touched_product_ids:
+            update_suggestions.delay(
+                sorted(self.touched_product_ids), sorted(self.touched_category_ids)
+            )
+
     def _download_feed(self) -> str:
         downloader = FeedDownloader(self.feed_source.xml_url)
         return downloader.download()
@@ -97,9 +215,48 @@ class FeedManager:
     def _parse_feed(
         self, content: str
     ) -> Tuple[ShopInfo, List[FeedCategory], List[FeedOffer]]:
-        parser = RozetkaFeedParser(content)
+        workers = settings.FEED_PARSER_WORKERS
+        if workers > 1:
+            encoded = content.encode("utf-8")
+            if len(encoded) >= settings.FEED_PARALLEL_PARSE_MIN_BYTES:
+                return self._parse_feed_parallel(encoded, workers)
+
+        parser = RozetkaFeedParser(content, compact=True)
         return parser.parse()
 
+    def _parse_feed_parallel(
+        self, content: bytes, workers: int
+    ) -> Tuple[ShopInfo, List[FeedCategory], List[FeedOffer]]:
+        with tempfile.NamedTemporaryFile(suffix=".xml", delete=False) as feed_file:
+            feed_file.write(content)
+
+        try:
+            logger.info(f"Parsing feed {self.feed_source.id} with {workers} workers")
+            parser = ParallelRozetkaFeedParser(
+                feed_file.name, workers=workers, encoding="utf-8", compact=True
+            )
+            return parser.parse()
+        finally:
+            os.remove(feed_file.name)
+
+    def _save_snapshot(
+        self, report: FeedParsingReport, shop_info: ShopInfo, offers: List[FeedOffer]
+    ):
+        if not settings.FEED_SNAPSHOTS_ENABLED:
+            return
+
+        try:
+            with tempfile.TemporaryFile() as snapshot_file:
+                write_snapshot(snapshot_file, shop_info, self.categories, offers)
+                snapshot_file.seek(0)
+                report.snapshot.save(
+                    f"feed_{self.feed_source.id}_{report.id}.snapshot",
+                    File(snapshot_file),
+                )
+            logger.info(f"Saved feed snapshot {report.snapshot.name}")
+        except Exception as e:
+            logger.warning(f"Failed to save snapshot for report {report.id}: {e}")
+
     def _update_next_sync(self):
         self.feed_source.last_update = timezone.now()
         self.feed_source.next_update = timezone.now() + timedelta(
@@ -124,10 +281,16 @@ class FeedManager:
         report.save()
 
     def _process_offers(self, offers: List[FeedOffer]):
-        for offer in offers:
-            self._process_offer(offer)
+        batch_size = settings.FEED_BATCH_SIZE
+        for start in range(0, len(offers), batch_size):
+            for offer in offers[start : start + batch_size]:
+                self._process_offer(offer)
+            self._flush_batch()
         self.stats["total_products"] = len(offers)
 
+    def _flush_batch(self):
+        self.error_log.flush()
+
     def _process_offer(self, offer: FeedOffer) -> None:
         self.stats["total_products"] += 1
 
@@ -190,6 +353,9 @@ class FeedManager:
                     self.stats["products_unpublished"] += 1
                     return
 
+                if product.category_id:
+                    self.touched_category_ids.add(product.category_id)
+                self.touched_category_ids.add(category.id)
                 product.category = category
 
                 if (
@@ -211,6 +377,7 @@ class FeedManager:
                 self._process_attributes(product, offer.attributes)
 
                 product.save()
+                self.touched_product_ids.add(product.id)
 
                 if offer.pictures:
                     logger.info(f"Processing offer {offer.external_id} images")
@@ -221,19 +388,14 @@ class FeedManager:
         except Exception as e:
             logger.error(f"Failed to process offer {offer.external_id}: {str(e)}")
 
-            FeedParsingReportItem.objects.create(
-                report=self.current_report,
-                product_external_id=offer.external_id,
-                success=False,
-                error_message=str(e),
-            )
+            self.error_log.add(offer.external_id, str(e))
             self.stats["products_failed"] += 1
 
-    def _process_attributes(self, product: Product, attributes: dict) -> None:
+    def _process_attributes(self, product: Product, attributes) -> None:
         if not attributes:
             return
 
-        for attr_name, attr_values in attributes.items():
+        for attr_name, attr_values in iter_attributes(attributes):
             try:
                 attr_match = self.attribute_matcher.find_attribute(attr_name)
                 if not attr_match:
@@ -251,7 +413,9 @@ class FeedManager:
                     continue
 
                 values_list = (
-                    attr_values if isinstance(attr_values, list) else [attr_values]
+                    attr_values
+                    if isinstance(attr_values, (list, tuple))
+                    else [attr_values]
                 )
 
                 for single_value in values_list:
@@ -0,0 +1,164 @@
+import logging
+from collections import Counter
+from datetime import datetime
+from typing import Dict, Optional, Set
+
+from django.db import transaction
+from django.db.models import Count, F, Max, Q, Value
+from django.db.models.functions import Greatest
+
+from main.models import FeedParsingReport, FeedRunSummary
+from main.models.store.feed import FeedParsingReportItem
+from services.product.stats import lock_tables
+
+logger = logging.getLogger(__name__)
+
+
+class ReportErrorLog:
+    """Buffers failed offers of a report and writes them in bulk.
+
+    Identical error messages are grouped into one ``FeedParsingReportItem``
+    with an occurrence count and a few sample external IDs. At most
+    ``max_groups`` distinct messages are kept, and the rest are only counted.
+    """
+
+    def __init__(
+        self, report: FeedParsingReport, max_groups: int = 100, max_samples: int = 10
+    ):
+        self.report = report
+        self.max_groups = max_groups
+        self.max_samples = max_samples
+        self.dropped = 0
+        self._items: Dict[str, FeedParsingReportItem] = {}
+        self._dirty: Set[str] = set()
+
+    def add(self, external_id: str, message: str) -> None:
+        item = self._items.get(message)
+        if item is None:
+            if len(self._items) >= self.max_groups:
+                self.dropped += 1
+                return
+            item = FeedParsingReportItem(
+                report=self.report,
+                product_external_id=external_id,
+                success=False,
+                error_message=message,
+                occurrences=0,
+                sample_external_ids=[],
+            )
+            self._items[message] = item
+
+        item.occurrences += 1
+        if len(item.sample_external_ids) < self.max_samples:
+            item.sample_external_ids.append(external_id)
+        self._dirty.add(message)
+
+    def flush(self) -> None:
+        if not self._dirty:
+            return
+
+        items = [self._items[message] for message in self._dirty]
+        new_items = [item for item in items if item.pk is None]
+        changed_items = [item for item in items if item.pk is not None]
+
+        FeedParsingReportItem.objects.bulk_create(new_items)
+        FeedParsingReportItem.objects.bulk_update(
+            changed_items, ["occurrences", "sample_external_ids"]
+        )
+        self._dirty.clear()
+
+    def close(self) -> None:
+        self.flush()
+        if not self.dropped:
+            return
+
+        logger.warning(
+            f"Report {self.report.id}: {self.dropped} failed offers not logged, "
+            f"limit of {self.max_groups} error messages reached"
+        )
+        FeedParsingReportItem.objects.create(
+            report=self.report,
+            product_external_id="",
+            success=False,
+            error_message=(
+                f"{self.dropped} more failed offers with other errors "
+                f"(limit of {self.max_groups} error messages reached)"
+            ),
+            occurrences=self.dropped,
+        )
+
+
+class FeedRunStats:
+    """Per-feed rollup of parsing reports, kept in ``FeedRunSummary``.
+
+    Every report write is applied as a delta to its feed's row, so the feed
+    summary endpoint reads one row per feed instead of aggregating the whole
+    report history. ``reconcile`` rebuilds the rollups from the reports.
+    """
+
+    OUTCOMES = {
+        FeedParsingReport.Status.SUCCESS: ("success", "last_success_at"),
+        FeedParsingReport.Status.ERROR: ("error", "last_error_at"),
+    }
+
+    def record(
+        self,
+        feed_id: int,
+        old_status: Optional[int],
+        new_status: Optional[int],
+        finished_at: Optional[datetime] = None,
+    ) -> None:
+        """Applies a report moving from ``old_status`` to ``new_status``.
+
+        ``None`` stands for a report that did not exist before or was deleted.
+        """
+        deltas = Counter()
+        if old_status is None:
+            deltas["total"] += 1
+        if new_status is None:
+            deltas["total"] -= 1
+        if old_status in self.OUTCOMES:
+            deltas[self.OUTCOMES[old_status][0]] -= 1
+        if new_status in self.OUTCOMES:
+            deltas[self.OUTCOMES[new_status][0]] += 1
+
+        updates = {
+            column: F(column) + delta for column, delta in deltas.items() if delta
+        }
+        if new_status in self.OUTCOMES and finished_at:
+            last_column = self.OUTCOMES[new_status][1]
+            updates[last_column] = Greatest(F(last_column), Value(finished_at))
+        if not updates:
+            return
+
+        rows = FeedRunSummary.objects.filter(feed_id=feed_id)
+        if not rows.update(**updates):
+            FeedRunSummary.objects.get_or_create(feed_id=feed_id)
+            rows.update(**updates)
+
+    def reconcile(self) -> int:
+        """Rebuilds every feed rollup from the reports table.
+
+        The rollup table is locked before counting, so runs recorded
+        meanwhile wait and are applied on top of the rebuilt rollups.
+        """
+        with transaction.atomic():
+            lock_tables(FeedRunSummary)
+            rows = FeedParsingReport.objects.values("feed_id").annotate(
+                total=Count("id"),
+                success=Count("id", filter=Q(status=FeedParsingReport.Status.SUCCESS)),
+                error=Count("id", filter=Q(status=FeedParsingReport.Status.ERROR)),
+                last_success_at=Max(
+                    "finished_at", filter=Q(status=FeedParsingReport.Status.SUCCESS)
+                ),
+                last_error_at=Max(
+                    "finished_at", filter=Q(status=FeedParsingReport.Status.ERROR)
+                ),
+            )
+            FeedRunSummary.objects.all().delete()
+            created = FeedRunSummary.objects.bulk_create(
+                [FeedRunSummary(**row) for row in rows.order_by()]
+            )
+
+        logger.info(f"Reconciled run summaries of {len(created)} feeds")
+        return len(created)
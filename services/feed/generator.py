@@ -0,0 +1,272 @@
+import json
+import logging
+import os
+import shutil
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterator, List, Optional, TypedDict
+from urllib.parse import urljoin
+from xml.sax.saxutils import XMLGenerator
+
+from django.conf import settings
+from django.db.models import Count, Max, Prefetch, Sum
+from django.utils import timezone, translation
+
+from main.models import Category, Product, ProductAttribute, ProductImage
+
+logger = logging.getLogger(__name__)
+
+
+class GenerationResult(TypedDict):
+    path: str
+    categories: int
+    regenerated: int
+    removed: int
+    offers: int
+
+
+class RozetkaFeedGenerator:
+    """Builds our catalog as a Rozetka YML feed, the format ``RozetkaFeedParser`` reads.
+
+    Offers are written to one shard per category with ``XMLGenerator``, a
+    product at a time, so memory does not grow with the catalog. A manifest
+    keeps the signature of every shard: the number of exported products of
+    the category, their latest ``modified`` and the sum of their IDs, plus
+    the same for their images and attributes, with the latest ``modified``
+    of the attribute names and values they show. Images are processed and
+    attributes written after the product is saved, so the product row alone
+    does not see them change. A shard is rewritten only when its signature
+    changed, so a run costs three grouped queries plus the categories that
+    changed since the previous one.
+
+    The final file is stitched from the shards into a temporary file and
+    moved over the old one, so readers never see a partial feed.
+    """
+
+    FEED_NAME = "rozetka.xml"
+    MANIFEST_NAME = "manifest.json"
+
+    def __init__(
+        self,
+        root: Optional[str] = None,
+        language: Optional[str] = None,
+        chunk_size: int = 500,
+    ):
+        self.root = Path(root or settings.PARTNER_FEED_ROOT)
+        self.shards_root = self.root / "shards"
+        self.language = language or settings.MODELTRANSLATION_DEFAULT_LANGUAGE
+        self.chunk_size = chunk_size
+
+    @property
+    def path(self) -> Path:
+        return self.root / self.FEED_NAME
+
+    def generate(self, full: bool = False) -> GenerationResult:
+        """Regenerates changed shards, or all of them with ``full``, and stitches the feed."""
+        self.shards_root.mkdir(parents=True, exist_ok=True)
+        previous = {} if full else self._read_manifest()
+        signatures = self._signatures()
+
+        regenerated = 0
+        with translation.override(self.language):
+            for category_id, signature in signatures.items():
+                if (
+                    previous.get(category_id) == signature
+                    and self._shard_path(category_id).exists()
+                ):
+                    continue
+                self._write_shard(category_id)
+                regenerated += 1
+
+            removed = set(previous) - set(signatures)
+            for category_id in removed:
+                self._shard_path(category_id).unlink(missing_ok=True)
+
+            self._write_manifest(signatures)
+            self._stitch(list(signatures))
+
+        offers = sum(int(signature.split(":")[0]) for signature in signatures.values())
+        logger.info(
+            f"Generated partner feed with {offers} offers in {len(signatures)} "
+            f"categories, {regenerated} shards rewritten, {len(removed)} removed"
+        )
+        return GenerationResult(
+            path=str(self.path),
+            categories=len(signatures),
+            regenerated=regenerated,
+            removed=len(removed),
+            offers=offers,
+        )
+
+    def _products(self):
+        return Product.objects.filter(
+            is_active=True,
+            status=Product.Status.ACTIVE,
+            category__isnull=False,
+            category__is_active=True,
+        )
+
+    def _signatures(self) -> Dict[str, str]:
+        rows = (
+            self._products()
+            .values("category_id")
+            .annotate(count=Count("id"), modified=Max("modified"), ids=Sum("id"))
+            .order_by("category_id")
+        )
+        exported = self._products().values("id")
+        images = self._related_signatures(
+            ProductImage.objects.filter(product__in=exported)
+        )
+        attributes = self._related_signatures(
+            ProductAttribute.objects.filter(product__in=exported),
+            Max("attribute__modified"),
+            Max("value__modified"),
+        )
+        return {
+            str(row["category_id"]): (
+                f"{row['count']}:{row['modified'].isoformat()}:{row['ids']}"
+                f"|{images.get(row['category_id'], '')}"
+                f"|{attributes.get(row['category_id'], '')}"
+            )
+            for row in rows
+        }
+
+    @staticmethod
+    def _related_signatures(queryset, *extra) -> Dict[int, str]:
+        """Signs the rows of ``queryset`` per category of their product."""
+        rows = (
+            queryset.values_list("product__category_id")
+            .annotate(Count("id"), Sum("id"), Max("modified"), *extra)
+            .order_by()
+        )
+        return {
+            category_id: ":".join(
+                value.isoformat() if hasattr(value, "isoformat") else str(value)
+                for value in values
+            )
+            for category_id, *values in rows
+        }
+
+    def _write_shard(self, category_id: str) -> None:
+        products = (
+            self._products()
+            .filter(category_id=category_id)
+            .prefetch_related(
+                "images",
+                Prefetch(
+                    "product_attributes",
+                    queryset=ProductAttribute.objects.select_related(
+                        "attribute", "value"
+                    ),
+                ),
+            )
+            .order_by("id")
+        )
+        path = self._shard_path(category_id)
+        with atomic_file(path) as file:
+            xml = XMLGenerator(file, encoding="utf-8")
+            for product in products.iterator(chunk_size=self.chunk_size):
+                self._write_offer(xml, product)
+
+    def _write_offer(self, xml: XMLGenerator, product: Product) -> None:
+        xml.startElement(
+            "offer",
+            {
+                "id": str(product.id),
+                "available": "true" if product.available else "false",
+            },
+        )
+        self._element(xml, "url", product.url)
+        self._element(xml, "price", product.price)
+        self._element(xml, "currencyId", product.currency)
+        self._element(xml, "categoryId", product.category_id)
+        for image in product.images.all():
+            self._element(
+                xml, "picture", urljoin(settings.PARTNER_FEED_SHOP_URL, image.image.url)
+            )
+        self._element(xml, "name", product.name)
+        self._element(xml, "vendor", product.vendor)
+        self._element(xml, "article", product.article)
+        self._element(xml, "stock_quantity", product.stock_quantity)
+        self._element(xml, "description", product.description)
+        for product_attribute in product.product_attributes.all():
+            self._element(
+                xml,
+                "param",
+                product_attribute.value.title,
+                {"name": product_attribute.attribute.title},
+            )
+        xml.endElement("offer")
+        xml.ignorableWhitespace("\n")
+
+    def _stitch(self, category_ids: List[str]) -> None:
+        categories = Category.objects.filter(is_active=True).order_by("tree_id", "lft")
+        with atomic_file(self.path) as file:
+            xml = XMLGenerator(file, encoding="utf-8")
+            xml.startDocument()
+            xml.startElement(
+                "yml_catalog", {"date": timezone.localtime().strftime("%Y-%m-%d %H:%M")}
+            )
+            xml.startElement("shop", {})
+            self._element(xml, "name", settings.PARTNER_FEED_SHOP_NAME)
+            self._element(xml, "company", settings.PARTNER_FEED_SHOP_NAME)
+            self._element(xml, "url", settings.PARTNER_FEED_SHOP_URL)
+
+            xml.startElement("categories", {})
+            for category in categories.only("id", "parent_id", "title"):
+                attrs = {"id": str(category.id)}
+                if category.parent_id:
+                    attrs["parentId"] = str(category.parent_id)
+                self._element(xml, "category", category.title or "", attrs)
+            xml.endElement("categories")
+
+            xml.startElement("offers", {})
+            xml.ignorableWhitespace("\n")
+            for category_id in category_ids:
+                with open(self._shard_path(category_id), "rb") as shard:
+                    shutil.copyfileobj(shard, file)
+            xml.endElement("offers")
+            xml.endElement("shop")
+            xml.endElement("yml_catalog")
+            xml.endDocument()
+
+    @staticmethod
+    def _element(
+        xml: XMLGenerator, name: str, value, attrs: Optional[Dict[str, str]] = None
+    ) -> None:
+        if value is None or value == "":
+            return
+        xml.startElement(name, attrs or {})
+        xml.characters(str(value))
+        xml.endElement(name)
+
+    def _shard_path(self, category_id: str) -> Path:
+        return self.shards_root / f"category_{category_id}.xml"
+
+    def _read_manifest(self) -> Dict[str, str]:
+        try:
+            with open(self.root / self.MANIFEST_NAME) as file:
+                return json.load(file)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def _write_manifest(self, signatures: Dict[str, str]) -> None:
+        with atomic_file(self.root / self.MANIFEST_NAME) as file:
+            file.write(json.dumps(signatures, indent=2).encode())
+
+
+@contextmanager
+def atomic_file(path: Path) -> Iterator[BinaryIO]:
+    """Writes a temporary file next to ``path`` and moves it over ``path`` on success."""
+    fd, temp_path = tempfile.mkstemp(
+        dir=path.parent, prefix=f".{path.name}.", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(fd, "wb") as file:
+            yield file
+        os.chmod(temp_path, 0o644)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
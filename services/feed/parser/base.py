@@ -10,8 +10,9 @@ logger = logging.getLogger(__name__)
 
 
 class BaseFeedParser(ABC):
-    def __init__(self, xml_content: str):
+    def __init__(self, xml_content: str, compact: bool = False):
         self.xml_content = xml_content
+        self.compact = compact
         self._tree: Optional[ElementTree.Element] = None
         self._shop: Optional[ElementTree.Element] = None
 
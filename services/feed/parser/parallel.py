@@ -0,0 +1,179 @@
+import logging
+import mmap
+import multiprocessing
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from typing import Iterator, List, Optional, Tuple, Union
+from xml.etree import ElementTree
+
+from .rozetka import RozetkaFeedParser
+from .types import FeedCategory, FeedOffer, FrozenFeedOffer, ShopInfo
+from ..exceptions import FeedParsingError
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 8 * 1024 * 1024
+
+OFFERS_OPEN_RE = re.compile(rb"<offers(?:\s[^>]*)?>")
+OFFERS_CLOSE = b"</offers>"
+OFFER_OPEN_RE = re.compile(rb"<offer[\s>]")
+ENCODING_RE = re.compile(rb"<\?xml[^>]*encoding=[\"']([\w.-]+)[\"']")
+
+
+def _parse_offer_range(
+    path: str, start: int, end: int, encoding: str, compact: bool
+) -> List[Union[FeedOffer, FrozenFeedOffer]]:
+    """Parses the ``<offer>`` elements found in ``path[start:end]``.
+
+    Runs inside a pool worker, so it only receives picklable arguments and
+    reads its byte range straight from disk.
+    """
+    with open(path, "rb") as f:
+        f.seek(start)
+        chunk = f.read(end - start).decode(encoding)
+
+    try:
+        node = ElementTree.fromstring(f"<offers>{chunk}</offers>")
+    except ElementTree.ParseError as e:
+        raise FeedParsingError(f"Invalid XML in offers range {start}-{end}: {e}")
+
+    parser = RozetkaFeedParser("", compact=compact)
+    return parser.parse_offer_elements(node.iterfind("offer"))
+
+
+class ParallelRozetkaFeedParser:
+    """Parses a Rozetka feed stored on disk using a pool of worker processes.
+
+    The ``<offers>`` section is split at ``<offer`` boundaries into byte
+    ranges of roughly ``chunk_size`` bytes. Every range is parsed by a worker
+    process and the resulting batches are yielded back in document order.
+    Daemonic processes, such as Celery prefork workers, cannot have children,
+    so there the ranges are parsed serially.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        workers: Optional[int] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        encoding: Optional[str] = None,
+        compact: bool = False,
+    ):
+        self.path = str(path)
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.encoding = encoding
+        self.compact = compact
+
+    def parse(self) -> Tuple[ShopInfo, List[FeedCategory], List[FeedOffer]]:
+        shop_info, categories = self.parse_header()
+        offers = [offer for batch in self.iter_offer_batches() for offer in batch]
+        return shop_info, categories, offers
+
+    def parse_header(self) -> Tuple[ShopInfo, List[FeedCategory]]:
+        with self._open_map() as data:
+            encoding = self._detect_encoding(data)
+            offers_open = OFFERS_OPEN_RE.search(data)
+            head_end = offers_open.start() if offers_open else len(data)
+            head = data[:head_end].decode(encoding)
+
+        try:
+            root = self._close_document(head)
+        except ElementTree.ParseError as e:
+            raise FeedParsingError(f"Invalid XML format: {str(e)}")
+
+        parser = RozetkaFeedParser("")
+        parser._tree = root
+        parser._shop = parser._get_shop_element()
+        return parser.parse_shop_info(), parser.parse_categories()
+
+    def iter_offer_batches(
+        self,
+    ) -> Iterator[List[Union[FeedOffer, FrozenFeedOffer]]]:
+        with self._open_map() as data:
+            encoding = self._detect_encoding(data)
+            ranges = self._split_offer_ranges(data)
+
+        if not ranges:
+            return
+
+        workers = self.workers
+        if multiprocessing.current_process().daemon:
+            workers = 1
+        logger.info(
+            f"Parsing {len(ranges)} offer ranges of {self.path} "
+            f"with {min(workers, len(ranges))} workers"
+        )
+
+        if workers <= 1 or len(ranges) == 1:
+            for start, end in ranges:
+                yield _parse_offer_range(self.path, start, end, encoding, self.compact)
+            return
+
+        starts, ends = zip(*ranges)
+        with ProcessPoolExecutor(max_workers=min(workers, len(ranges))) as pool:
+            yield from pool.map(
+                _parse_offer_range,
+                repeat(self.path),
+                starts,
+                ends,
+                repeat(encoding),
+                repeat(self.compact),
+            )
+
+    def _split_offer_ranges(self, data) -> List[Tuple[int, int]]:
+        offers_open = OFFERS_OPEN_RE.search(data)
+        if not offers_open:
+            return []
+
+        section_end = data.rfind(OFFERS_CLOSE)
+        if section_end < offers_open.end():
+            raise FeedParsingError("Unterminated <offers> section")
+
+        first_offer = OFFER_OPEN_RE.search(data, offers_open.end(), section_end)
+        if not first_offer:
+            return []
+
+        ranges = []
+        start = first_offer.start()
+        while start < section_end:
+            boundary = OFFER_OPEN_RE.search(
+                data, min(start + self.chunk_size, section_end), section_end
+            )
+            end = boundary.start() if boundary else section_end
+            ranges.append((start, end))
+            start = end
+        return ranges
+
+    def _detect_encoding(self, data) -> str:
+        if self.encoding:
+            return self.encoding
+        declared = ENCODING_RE.search(data, 0, 256)
+        return declared.group(1).decode("ascii") if declared else "utf-8"
+
+    def _close_document(self, head: str) -> ElementTree.Element:
+        """Builds the document tree from everything preceding ``<offers>``."""
+        pull_parser = ElementTree.XMLPullParser(events=("start", "end"))
+        pull_parser.feed(head)
+
+        root = None
+        open_tags = []
+        for event, element in pull_parser.read_events():
+            if event == "start":
+                root = root if root is not None else element
+                open_tags.append(element.tag)
+            else:
+                open_tags.pop()
+
+        if root is None:
+            raise FeedParsingError("Feed has no root element")
+
+        pull_parser.feed("".join(f"</{tag}>" for tag in reversed(open_tags)))
+        pull_parser.close()
+        return root
+
+    def _open_map(self) -> mmap.mmap:
+        with open(self.path, "rb") as f:
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
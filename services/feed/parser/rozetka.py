@@ -1,9 +1,10 @@
+import sys
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import Any, Dict, Iterable, List, Union
 from xml.etree import ElementTree
 
 from .base import BaseFeedParser
-from .types import ShopInfo, FeedCategory, FeedOffer
+from .types import FeedCategory, FeedOffer, FrozenFeedOffer, ShopInfo
 from ..exceptions import FeedParsingError
 import logging
 
@@ -63,7 +64,13 @@ class RozetkaFeedParser(BaseFeedParser):
         if offers_node is None:
             return offers
 
-        for offer in offers_node.findall("offer"):
+        return self.parse_offer_elements(offers_node.findall("offer"))
+
+    def parse_offer_elements(
+        self, elements: Iterable[ElementTree.Element]
+    ) -> List[Union[FeedOffer, FrozenFeedOffer]]:
+        offers = []
+        for offer in elements:
             try:
                 offer_data = self._parse_offer(offer)
                 offers.append(offer_data)
@@ -74,7 +81,9 @@ class RozetkaFeedParser(BaseFeedParser):
                 continue
         return offers
 
-    def _parse_offer(self, offer: ElementTree.Element) -> FeedOffer:
+    def _parse_offer(
+        self, offer: ElementTree.Element
+    ) -> Union[FeedOffer, FrozenFeedOffer]:
         external_id = offer.get("id")
         if not external_id:
             raise ValueError("Offer must have ID")
@@ -93,7 +102,7 @@ class RozetkaFeedParser(BaseFeedParser):
             if p.text and p.text.strip()
         ]
 
-        return FeedOffer(
+        feed_offer = FeedOffer(
             external_id=external_id,
             available=self._get_bool(offer, "available"),
             url=self._get_text(offer, "url", ""),
@@ -108,12 +117,14 @@ class RozetkaFeedParser(BaseFeedParser):
             attributes=self._parse_attributes(offer),
             stock_quantity=self._get_int(offer, "stock_quantity"),
         )
+        return feed_offer.freeze() if self.compact else feed_offer
 
     def _parse_attributes(self, offer: ElementTree.Element) -> Dict[str, Any]:
         attributes = {}
         for param in offer.findall("param"):
             name = param.get("name")
             if name and param.text:
+                name = sys.intern(name)
                 if name in attributes:
                     if isinstance(attributes[name], list):
                         attributes[name].append(param.text)
@@ -1,10 +1,14 @@
+import sys
 from dataclasses import dataclass, field
 from datetime import datetime
 from decimal import Decimal
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
 
+AttributeValues = Union[str, Tuple[str, ...]]
+AttributePairs = Tuple[Tuple[str, AttributeValues], ...]
 
-@dataclass
+
+@dataclass(slots=True)
 class ShopInfo:
     name: str
     company: str
@@ -12,14 +16,14 @@ class ShopInfo:
     date: datetime
 
 
-@dataclass
+@dataclass(slots=True)
 class FeedCategory:
     external_id: str
     name: str
     rozetka_id: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class FeedOffer:
     external_id: str
     available: bool
@@ -35,3 +39,73 @@ class FeedOffer:
     article: Optional[str] = None
     attributes: Dict[str, Any] = field(default_factory=dict)
     stock_quantity: int = 0
+
+    def freeze(self) -> "FrozenFeedOffer":
+        return FrozenFeedOffer(
+            external_id=self.external_id,
+            available=self.available,
+            url=self.url,
+            price=self.price,
+            currency=sys.intern(self.currency),
+            category_id=sys.intern(self.category_id),
+            name=self.name,
+            pictures=tuple(self.pictures),
+            vendor=self.vendor,
+            description=self.description,
+            article=self.article,
+            attributes=freeze_attributes(self.attributes),
+            stock_quantity=self.stock_quantity,
+        )
+
+
+@dataclass(slots=True, frozen=True)
+class FrozenFeedOffer:
+    """Immutable, compact counterpart of :class:`FeedOffer`.
+
+    Pictures are stored as a tuple and attributes as ``(name, value)`` pairs
+    with interned strings, so a large feed does not pay for a list and a dict
+    per offer.
+    """
+
+    external_id: str
+    available: bool
+    url: str
+    price: Decimal
+    currency: str
+    category_id: str
+    name: str
+
+    pictures: Tuple[str, ...] = ()
+    vendor: Optional[str] = None
+    description: Optional[str] = None
+    article: Optional[str] = None
+    attributes: AttributePairs = ()
+    stock_quantity: int = 0
+
+
+def freeze_attributes(attributes: Dict[str, Any]) -> AttributePairs:
+    return tuple(
+        (
+            sys.intern(name),
+            (
+                tuple(_intern(v) for v in value)
+                if isinstance(value, list)
+                else _intern(value)
+            ),
+        )
+        for name, value in attributes.items()
+    )
+
+
+def _intern(value: Any) -> Any:
+    # Attribute values repeat across offers ("Чорний", "Україна", ...).
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+def iter_attributes(
+    attributes: Union[Dict[str, Any], AttributePairs],
+) -> Iterator[Tuple[str, Any]]:
+    """Iterates ``(name, value)`` pairs of either attribute representation."""
+    if isinstance(attributes, dict):
+        return iter(attributes.items())
+    return iter(attributes)
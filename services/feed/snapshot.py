@@ -0,0 +1,240 @@
+import json
+import logging
+import mmap
+import struct
+import zlib
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import BinaryIO, Iterable, Iterator, List, Tuple, Union
+
+from django.utils import timezone
+
+from main.models import FeedParsingReport
+
+from .exceptions import FeedParsingError
+from .parser.types import (
+    FeedCategory,
+    FeedOffer,
+    FrozenFeedOffer,
+    ShopInfo,
+    iter_attributes,
+)
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"FEEDSNP1"
+FOOTER = struct.Struct("<QQ")
+DEFAULT_FRAME_SIZE = 5000
+
+
+class FeedSnapshotWriter:
+    """Writes parsed feeds into a compact, frame-compressed snapshot file.
+
+    Layout: ``MAGIC``, zlib-compressed frames of offers, a compressed JSON
+    index (shop info, categories and frame offsets), and a fixed-size footer
+    pointing at the index followed by ``MAGIC`` again. Offers are stored as
+    positional JSON arrays so that field names are not repeated per offer.
+    """
+
+    def __init__(self, stream: BinaryIO, frame_size: int = DEFAULT_FRAME_SIZE):
+        self.stream = stream
+        self.frame_size = frame_size
+        self._frames: List[Tuple[int, int, int]] = []
+        self._pending: list = []
+        self.stream.write(MAGIC)
+
+    def write_offers(self, offers: Iterable[Union[FeedOffer, FrozenFeedOffer]]):
+        for offer in offers:
+            self._pending.append(_encode_offer(offer))
+            if len(self._pending) >= self.frame_size:
+                self._flush_frame()
+
+    def close(self, shop_info: ShopInfo, categories: List[FeedCategory]):
+        self._flush_frame()
+        index = {
+            "shop": [
+                shop_info.name,
+                shop_info.company,
+                shop_info.url,
+                shop_info.date.isoformat(),
+            ],
+            "categories": [[c.external_id, c.name, c.rozetka_id] for c in categories],
+            "frames": self._frames,
+        }
+        index_offset = self.stream.tell()
+        index_bytes = zlib.compress(_dumps(index))
+        self.stream.write(index_bytes)
+        self.stream.write(FOOTER.pack(index_offset, len(index_bytes)))
+        self.stream.write(MAGIC)
+
+    def _flush_frame(self):
+        if not self._pending:
+            return
+        frame = zlib.compress(_dumps(self._pending))
+        self._frames.append((self.stream.tell(), len(frame), len(self._pending)))
+        self.stream.write(frame)
+        self._pending = []
+
+
+class FeedSnapshotReader:
+    """Reads a snapshot written by :class:`FeedSnapshotWriter`.
+
+    The file is memory-mapped and frames are decompressed lazily, so offers
+    can be streamed without loading the whole snapshot.
+    """
+
+    def __init__(self, path: str):
+        self.path = str(path)
+        with open(self.path, "rb") as f:
+            try:
+                self._data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                raise FeedParsingError(f"{self.path} is not a feed snapshot")
+
+        try:
+            self._index = self._read_index()
+        except Exception:
+            self._data.close()
+            raise
+
+    def _read_index(self) -> dict:
+        tail = len(MAGIC) + FOOTER.size
+        if (
+            len(self._data) < len(MAGIC) + tail
+            or self._data[: len(MAGIC)] != MAGIC
+            or self._data[-len(MAGIC) :] != MAGIC
+        ):
+            raise FeedParsingError(f"{self.path} is not a feed snapshot")
+
+        index_offset, index_length = FOOTER.unpack(self._data[-tail : -len(MAGIC)])
+        try:
+            return json.loads(
+                zlib.decompress(self._data[index_offset : index_offset + index_length])
+            )
+        except (zlib.error, ValueError) as e:
+            raise FeedParsingError(f"Corrupt index in {self.path}: {e}")
+
+    @property
+    def shop_info(self) -> ShopInfo:
+        name, company, url, date = self._index["shop"]
+        return ShopInfo(
+            name=name, company=company, url=url, date=datetime.fromisoformat(date)
+        )
+
+    @property
+    def categories(self) -> List[FeedCategory]:
+        return [
+            FeedCategory(external_id=external_id, name=name, rozetka_id=rozetka_id)
+            for external_id, name, rozetka_id in self._index["categories"]
+        ]
+
+    @property
+    def offers_count(self) -> int:
+        return sum(count for _, _, count in self._index["frames"])
+
+    def iter_offers(self) -> Iterator[FrozenFeedOffer]:
+        for offset, length, _ in self._index["frames"]:
+            rows = json.loads(zlib.decompress(self._data[offset : offset + length]))
+            for row in rows:
+                yield _decode_offer(row)
+
+    def read(self) -> Tuple[ShopInfo, List[FeedCategory], List[FrozenFeedOffer]]:
+        return self.shop_info, self.categories, list(self.iter_offers())
+
+    def close(self):
+        self._data.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def write_snapshot(
+    stream: BinaryIO,
+    shop_info: ShopInfo,
+    categories: List[FeedCategory],
+    offers: Iterable[Union[FeedOffer, FrozenFeedOffer]],
+) -> None:
+    writer = FeedSnapshotWriter(stream)
+    writer.write_offers(offers)
+    writer.close(shop_info, categories)
+
+
+def prune_snapshots(retention_days: int) -> int:
+    """Deletes the snapshots of reports started more than ``retention_days`` ago.
+
+    Returns the number of reports whose snapshot was removed.
+    """
+    cutoff = timezone.now() - timedelta(days=retention_days)
+    reports = (
+        FeedParsingReport.objects.filter(started_at__lt=cutoff)
+        .exclude(snapshot__isnull=True)
+        .exclude(snapshot="")
+    )
+    storage = FeedParsingReport._meta.get_field("snapshot").storage
+    pruned = []
+    for report_id, name in reports.values_list("id", "snapshot").iterator():
+        storage.delete(name)
+        pruned.append(report_id)
+    if pruned:
+        FeedParsingReport.objects.filter(id__in=pruned).update(snapshot="")
+
+    logger.info(f"Pruned {len(pruned)} feed snapshots older than {retention_days} days")
+    return len(pruned)
+
+
+def _dumps(data) -> bytes:
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def _encode_offer(offer: Union[FeedOffer, FrozenFeedOffer]) -> list:
+    return [
+        offer.external_id,
+        offer.available,
+        offer.url,
+        str(offer.price),
+        offer.currency,
+        offer.category_id,
+        offer.name,
+        list(offer.pictures),
+        offer.vendor,
+        offer.description,
+        offer.article,
+        [[name, value] for name, value in iter_attributes(offer.attributes)],
+        offer.stock_quantity,
+    ]
+
+
+def _decode_offer(row: list) -> FrozenFeedOffer:
+    (
+        external_id,
+        available,
+        url,
+        price,
+        currency,
+        category_id,
+        name,
+        pictures,
+        vendor,
+        description,
+        article,
+        attributes,
+        stock_quantity,
+    ) = row
+    return FeedOffer(
+        external_id=external_id,
+        available=available,
+        url=url,
+        price=Decimal(price),
+        currency=currency,
+        category_id=category_id,
+        name=name,
+        pictures=pictures,
+        vendor=vendor,
+        description=description,
+        article=article,
+        attributes=dict(attributes),
+        stock_quantity=stock_quantity,
+    ).freeze()
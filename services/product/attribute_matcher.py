@@ -21,7 +21,9 @@ class AttributeMatcher:
     def __init__(self):
         self.cache_ttl = 3600
 
-    def find_attribute(self, name: str) -> Optional[AttributeMatch]:
+    def find_attribute(
+        self, name: str, create: bool = True
+    ) -> Optional[AttributeMatch]:
         if not name:
             return None
 
@@ -40,6 +42,8 @@ class AttributeMatcher:
                 )
             else:
                 attribute = attributes.first()
+        elif not create:
+            return None
         else:
             attribute = Attribute.objects.create(
                 title=name, label=name, value_type="text", sort_order=0
@@ -51,7 +55,7 @@ class AttributeMatcher:
 
     @transaction.atomic
     def find_or_create_value(
-        self, attribute: Attribute, raw_value: Any
+        self, attribute: Attribute, raw_value: Any, create: bool = True
     ) -> Optional[ValueMatch]:
         if raw_value is None:
             return None
@@ -77,6 +81,8 @@ class AttributeMatcher:
                 )
             else:
                 value = values.first()
+        elif not create:
+            return None
         else:
             value = AttributeValue.objects.create(
                 attribute=attribute,
@@ -0,0 +1,503 @@
+import logging
+import struct
+import sys
+import zlib
+from array import array
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from django.db.models import QuerySet
+from django_redis import get_redis_connection
+
+from main.models import Category, Product, ProductAttribute
+from services.cache.generations import CATEGORIES_SCOPE, CacheGenerations
+from services.product.facets import AttributeSelection
+
+logger = logging.getLogger(__name__)
+
+# The ":v2" keys hold the format with array containers; the daily build
+# fills them.
+INDEX_KEY = "product_bitmaps:v2"
+VERSION_KEY = "product_bitmaps:v2:version"
+BUILD_KEY = "product_bitmaps:v2:build"
+CHANGES_KEY = "product_bitmaps:v2:changes"
+LOCK_KEY = "product_bitmaps:lock"
+
+CONTAINER_SHIFT = 16
+CONTAINER_MASK = (1 << CONTAINER_SHIFT) - 1
+CONTAINER_BYTES = (1 << CONTAINER_SHIFT) // 8
+# Up to this many IDs a sorted array of 16-bit values is smaller than 8 KiB
+# of bits.
+ARRAY_MAX = 4096
+
+BITSET, ARRAY = 0, 1
+
+_HEADER = struct.Struct("<I")
+_CONTAINER = struct.Struct("<IBI")
+
+# A bitset is an int with one bit per ID, an array a sorted array("H").
+Container = Union[int, array]
+
+
+def _group_ids(ids: Iterable[int]) -> Dict[int, List[int]]:
+    groups = defaultdict(list)
+    for id_ in ids:
+        groups[id_ >> CONTAINER_SHIFT].append(id_ & CONTAINER_MASK)
+    return groups
+
+
+def _container(bits: Iterable[int]) -> int:
+    buffer = bytearray(CONTAINER_BYTES)
+    for bit in bits:
+        buffer[bit >> 3] |= 1 << (bit & 7)
+    return int.from_bytes(buffer, "little")
+
+
+def _from_bits(bits: Iterable[int]) -> Optional[Container]:
+    """Returns the smaller container of the given bits, ``None`` when empty."""
+    bits = sorted(set(bits))
+    if not bits:
+        return None
+    if len(bits) <= ARRAY_MAX:
+        return array("H", bits)
+    return _container(bits)
+
+
+def _compact(bitset: int) -> Optional[Container]:
+    if not bitset:
+        return None
+    if bitset.bit_count() <= ARRAY_MAX:
+        return array("H", _iter_bitset(bitset))
+    return bitset
+
+
+def _bitset(container: Container) -> int:
+    return container if isinstance(container, int) else _container(container)
+
+
+def _iter_bitset(bitset: int) -> Iterator[int]:
+    while bitset:
+        lowest = bitset & -bitset
+        yield lowest.bit_length() - 1
+        bitset ^= lowest
+
+
+def _and(left: Container, right: Container) -> Optional[Container]:
+    if isinstance(left, int) and isinstance(right, int):
+        return _compact(left & right)
+    if isinstance(left, int):
+        left, right = right, left
+    if isinstance(right, int):
+        bits = array("H", (bit for bit in left if right >> bit & 1))
+    else:
+        bits = array("H", sorted(set(left).intersection(right)))
+    return bits or None
+
+
+def _or(left: Container, right: Container) -> Container:
+    if isinstance(left, int) or isinstance(right, int):
+        return _bitset(left) | _bitset(right)
+    return _from_bits([*left, *right])
+
+
+def _sub(left: Container, right: Container) -> Optional[Container]:
+    if isinstance(left, int):
+        return _compact(left & ~_bitset(right))
+    if isinstance(right, int):
+        bits = array("H", (bit for bit in left if not right >> bit & 1))
+    else:
+        removed = set(right)
+        bits = array("H", (bit for bit in left if bit not in removed))
+    return bits or None
+
+
+def _len(container: Container) -> int:
+    if isinstance(container, int):
+        return container.bit_count()
+    return len(container)
+
+
+def _has(container: Container, bit: int) -> bool:
+    if isinstance(container, int):
+        return bool(container >> bit & 1)
+    index = bisect_left(container, bit)
+    return index < len(container) and container[index] == bit
+
+
+def _iter_from(container: Container, first: int) -> Iterator[int]:
+    if isinstance(container, int):
+        return _iter_bitset(container >> first << first)
+    return iter(container[bisect_left(container, first) :])
+
+
+def _array_bytes(bits: array) -> bytes:
+    if sys.byteorder == "big":
+        bits = array("H", bits)
+        bits.byteswap()
+    return bits.tobytes()
+
+
+def _array_from_bytes(data: bytes) -> array:
+    bits = array("H")
+    bits.frombytes(data)
+    if sys.byteorder == "big":
+        bits.byteswap()
+    return bits
+
+
+class Bitmap:
+    """A set of product IDs split into 65536-ID containers, like a roaring bitmap.
+
+    Only containers holding at least one ID exist. A container of up to
+    ``ARRAY_MAX`` IDs is a sorted ``array("H")``, two bytes per ID; a denser
+    one is a Python int with one bit per ID, whose bitwise operators run in
+    C. AND/OR/AND NOT only touch the containers both sides have and pick
+    the container type of the result by its size, so sparse bitmaps such as
+    rare attribute values stay small in every worker.
+    """
+
+    __slots__ = ("containers",)
+
+    def __init__(self, containers: Optional[Dict[int, Container]] = None):
+        self.containers = containers or {}
+
+    @classmethod
+    def from_ids(cls, ids: Iterable[int]) -> "Bitmap":
+        return cls({key: _from_bits(bits) for key, bits in _group_ids(ids).items()})
+
+    def discard(self, other: "Bitmap") -> bool:
+        """Removes the IDs of ``other`` and returns whether any was present."""
+        changed = False
+        for key in self.containers.keys() & other.containers.keys():
+            container = self.containers[key]
+            remaining = _sub(container, other.containers[key])
+            if remaining is not None and _len(remaining) == _len(container):
+                continue
+            if remaining is None:
+                del self.containers[key]
+            else:
+                self.containers[key] = remaining
+            changed = True
+        return changed
+
+    def __and__(self, other: "Bitmap") -> "Bitmap":
+        containers = {}
+        for key in self.containers.keys() & other.containers.keys():
+            container = _and(self.containers[key], other.containers[key])
+            if container is not None:
+                containers[key] = container
+        return Bitmap(containers)
+
+    def __or__(self, other: "Bitmap") -> "Bitmap":
+        containers = dict(self.containers)
+        for key, container in other.containers.items():
+            if key in containers:
+                container = _or(containers[key], container)
+            containers[key] = container
+        return Bitmap(containers)
+
+    def __sub__(self, other: "Bitmap") -> "Bitmap":
+        containers = {}
+        for key, container in self.containers.items():
+            if key in other.containers:
+                container = _sub(container, other.containers[key])
+            if container is not None:
+                containers[key] = container
+        return Bitmap(containers)
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, Bitmap) and self.containers == other.containers
+
+    def __len__(self) -> int:
+        return sum(_len(container) for container in self.containers.values())
+
+    def __bool__(self) -> bool:
+        return bool(self.containers)
+
+    def __contains__(self, id_: int) -> bool:
+        container = self.containers.get(id_ >> CONTAINER_SHIFT)
+        return container is not None and _has(container, id_ & CONTAINER_MASK)
+
+    def iter_after(self, after: int = 0) -> Iterator[int]:
+        """Yields IDs greater than ``after`` in ascending order."""
+        first_key = after >> CONTAINER_SHIFT
+        for key in sorted(self.containers):
+            if key < first_key:
+                continue
+            first = (after & CONTAINER_MASK) + 1 if key == first_key else 0
+            base = key << CONTAINER_SHIFT
+            for bit in _iter_from(self.containers[key], first):
+                yield base + bit
+
+    def to_bytes(self) -> bytes:
+        parts = [_HEADER.pack(len(self.containers))]
+        for key, container in self.containers.items():
+            if isinstance(container, int):
+                kind = BITSET
+                data = container.to_bytes((container.bit_length() + 7) // 8, "little")
+            else:
+                kind = ARRAY
+                data = _array_bytes(container)
+            parts.append(_CONTAINER.pack(key, kind, len(data)))
+            parts.append(data)
+        return zlib.compress(b"".join(parts))
+
+    @classmethod
+    def from_bytes(cls, payload: bytes) -> "Bitmap":
+        data = zlib.decompress(payload)
+        (count,) = _HEADER.unpack_from(data)
+        offset = _HEADER.size
+        containers = {}
+        for _ in range(count):
+            key, kind, size = _CONTAINER.unpack_from(data, offset)
+            offset += _CONTAINER.size
+            chunk = data[offset : offset + size]
+            if kind == ARRAY:
+                containers[key] = _array_from_bytes(chunk)
+            else:
+                containers[key] = int.from_bytes(chunk, "little")
+            offset += size
+        return cls(containers)
+
+
+_loaded: Dict[str, object] = {"version": None, "build": None, "bitmaps": {}}
+_subtrees: Dict[str, object] = {"generation": None, "ids": {}}
+
+
+class ProductBitmapIndex:
+    """Bitmaps of product IDs per attribute value, category and status.
+
+    The bitmaps are kept in one Redis hash, compressed, next to a version
+    counter. Every API worker keeps its own copy in memory. ``update``
+    records the version each bitmap last changed in, so when the version
+    moves a worker reloads only the bitmaps changed since its copy; only a
+    ``build`` makes it reload everything. A filter costs one ``MGET`` plus a
+    few bitmap operations. Category bitmaps hold the products of that
+    category only, and subtrees are answered by OR-ing the bitmaps of the
+    descendants, whose IDs each worker caches until the ``categories``
+    cache generation changes.
+
+    ``build`` rebuilds everything from the database. ``update`` re-indexes a
+    set of products after ``FeedManager`` wrote them.
+    """
+
+    ACTIVE_KEY = "active"
+
+    def __init__(self):
+        self.redis = get_redis_connection("default")
+
+    @staticmethod
+    def value_key(value_id: int) -> str:
+        return f"value:{value_id}"
+
+    @staticmethod
+    def category_key(category_id: int) -> str:
+        return f"category:{category_id}"
+
+    @staticmethod
+    def status_key(status: int) -> str:
+        return f"status:{status}"
+
+    def is_built(self) -> bool:
+        return self.redis.exists(VERSION_KEY) > 0
+
+    def filter(
+        self,
+        selection: AttributeSelection,
+        category_id: Optional[int] = None,
+        status: Optional[int] = None,
+    ) -> Bitmap:
+        """Returns the active products matching all the given filters."""
+        bitmaps = self._bitmaps()
+        result = bitmaps.get(self.ACTIVE_KEY, Bitmap())
+
+        if category_id is not None:
+            subtree = Bitmap()
+            for descendant_id in self._subtree_ids(category_id):
+                subtree |= bitmaps.get(self.category_key(descendant_id), Bitmap())
+            result &= subtree
+
+        if status is not None:
+            result &= bitmaps.get(self.status_key(status), Bitmap())
+
+        for _, value_ids in selection:
+            matched = Bitmap()
+            for value_id in value_ids:
+                matched |= bitmaps.get(self.value_key(value_id), Bitmap())
+            result &= matched
+        return result
+
+    def build(self, chunk_size: int = 10000) -> int:
+        """Rebuilds every bitmap from the database and returns their number."""
+        ids_by_key = defaultdict(list)
+        rows = Product.objects.values_list("id", "category_id", "status", "is_active")
+        for product_id, category_id, status, is_active in rows.iterator(
+            chunk_size=chunk_size
+        ):
+            for key in self._product_keys(category_id, status, is_active):
+                ids_by_key[key].append(product_id)
+
+        values = ProductAttribute.objects.values_list("product_id", "value_id")
+        for product_id, value_id in values.iterator(chunk_size=chunk_size):
+            ids_by_key[self.value_key(value_id)].append(product_id)
+
+        bitmaps = {key: Bitmap.from_ids(ids) for key, ids in ids_by_key.items()}
+        with self.redis.lock(LOCK_KEY, timeout=600, blocking_timeout=60):
+            pipe = self.redis.pipeline()
+            pipe.delete(INDEX_KEY, CHANGES_KEY)
+            if bitmaps:
+                pipe.hset(
+                    INDEX_KEY,
+                    mapping={key: bitmap.to_bytes() for key, bitmap in bitmaps.items()},
+                )
+            pipe.incr(VERSION_KEY)
+            pipe.incr(BUILD_KEY)
+            pipe.execute()
+
+        logger.info(f"Built {len(bitmaps)} product bitmaps")
+        return len(bitmaps)
+
+    def update(self, product_ids: Iterable[int]) -> int:
+        """Re-indexes the given products and returns the number of changed bitmaps."""
+        product_ids = set(product_ids)
+        if not product_ids or not self.is_built():
+            return 0
+
+        memberships = defaultdict(set)
+        rows = Product.objects.filter(id__in=product_ids).values_list(
+            "id", "category_id", "status", "is_active"
+        )
+        for product_id, category_id, status, is_active in rows:
+            for key in self._product_keys(category_id, status, is_active):
+                memberships[key].add(product_id)
+        values = ProductAttribute.objects.filter(
+            product_id__in=product_ids
+        ).values_list("product_id", "value_id")
+        for product_id, value_id in values:
+            memberships[self.value_key(value_id)].add(product_id)
+
+        with self.redis.lock(LOCK_KEY, timeout=600, blocking_timeout=60):
+            bitmaps = self._load()
+            reindexed = Bitmap.from_ids(product_ids)
+            changed = {
+                key: bitmap - reindexed
+                for key, bitmap in bitmaps.items()
+                if bitmap & reindexed
+            }
+            for key, ids in memberships.items():
+                current = changed.get(key, bitmaps.get(key, Bitmap()))
+                changed[key] = current | Bitmap.from_ids(ids)
+            # Products that kept a membership must not mark the bitmap changed,
+            # or every worker would reload it.
+            changed = {
+                key: bitmap
+                for key, bitmap in changed.items()
+                if bitmap != bitmaps.get(key, Bitmap())
+            }
+
+            version = int(self.redis.get(VERSION_KEY) or 0) + 1
+            pipe = self.redis.pipeline()
+            empty = [key for key, bitmap in changed.items() if not bitmap]
+            if empty:
+                pipe.hdel(INDEX_KEY, *empty)
+            filled = {
+                key: bitmap.to_bytes() for key, bitmap in changed.items() if bitmap
+            }
+            if filled:
+                pipe.hset(INDEX_KEY, mapping=filled)
+            if changed:
+                pipe.zadd(CHANGES_KEY, {key: version for key in changed})
+            pipe.set(VERSION_KEY, version)
+            pipe.execute()
+
+        logger.info(
+            f"Re-indexed {len(product_ids)} products, {len(changed)} bitmaps changed"
+        )
+        return len(changed)
+
+    def _bitmaps(self) -> Dict[str, Bitmap]:
+        version, build = self.redis.mget(VERSION_KEY, BUILD_KEY)
+        if version == _loaded["version"]:
+            return _loaded["bitmaps"]
+
+        if _loaded["version"] is None or build != _loaded["build"]:
+            bitmaps = self._load()
+        else:
+            bitmaps = dict(_loaded["bitmaps"])
+            self._reload_changed(bitmaps, int(_loaded["version"]))
+        _loaded.update(version=version, build=build, bitmaps=bitmaps)
+        return bitmaps
+
+    def _reload_changed(self, bitmaps: Dict[str, Bitmap], since: int) -> None:
+        keys = [
+            key.decode()
+            for key in self.redis.zrangebyscore(CHANGES_KEY, f"({since}", "+inf")
+        ]
+        if not keys:
+            return
+        for key, payload in zip(keys, self.redis.hmget(INDEX_KEY, keys)):
+            if payload is None:
+                bitmaps.pop(key, None)
+            else:
+                bitmaps[key] = Bitmap.from_bytes(payload)
+
+    def _load(self) -> Dict[str, Bitmap]:
+        return {
+            key.decode(): Bitmap.from_bytes(payload)
+            for key, payload in self.redis.hgetall(INDEX_KEY).items()
+        }
+
+    def _product_keys(
+        self, category_id: Optional[int], status: int, is_active: bool
+    ) -> List[str]:
+        keys = [self.status_key(status)]
+        if category_id is not None:
+            keys.append(self.category_key(category_id))
+        if is_active:
+            keys.append(self.ACTIVE_KEY)
+        return keys
+
+    @staticmethod
+    def _subtree_ids(category_id: int) -> List[int]:
+        generation = CacheGenerations().get_many([CATEGORIES_SCOPE])[CATEGORIES_SCOPE]
+        if generation != _subtrees["generation"]:
+            _subtrees.update(generation=generation, ids={})
+
+        subtree_ids = _subtrees["ids"].get(category_id)
+        if subtree_ids is None:
+            category = Category.objects.filter(id=category_id).first()
+            subtree_ids = (
+                list(
+                    category.get_descendants(include_self=True).values_list(
+                        "id", flat=True
+                    )
+                )
+                if category is not None
+                else []
+            )
+            _subtrees["ids"][category_id] = subtree_ids
+        return subtree_ids
+
+
+def page_products(
+    bitmap: Bitmap, queryset: QuerySet, after: int, limit: int
+) -> Tuple[List[Product], Optional[int]]:
+    """Loads up to ``limit`` products of ``bitmap`` with IDs above ``after``.
+
+    Returns the products in ID order and the ``after`` value of the next page,
+    or ``None`` on the last page.
+    """
+    ids = []
+    for product_id in bitmap.iter_after(after):
+        ids.append(product_id)
+        if len(ids) > limit:
+            break
+
+    has_next = len(ids) > limit
+    ids = ids[:limit]
+    products = {product.id: product for product in queryset.filter(id__in=ids)}
+    return (
+        [products[product_id] for product_id in ids if product_id in products],
+        ids[-1] if has_next else None,
+    )
@@ -0,0 +1,109 @@
+import gzip
+import hashlib
+import json
+import logging
+from typing import List, Optional, TypedDict
+
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils.translation import get_language
+
+from main.models import Category
+from services.cache.generations import CATEGORIES_SCOPE, CacheGenerations
+from services.cache.single_flight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+
+class CategoryNode(TypedDict):
+    id: int
+    label: Optional[str]
+    title: Optional[str]
+    icon: Optional[str]
+    icon_alt: Optional[str]
+    active_product_count: int
+    children: List["CategoryNode"]
+
+
+class CachedCategoryTree(TypedDict):
+    etag: str
+    body: bytes
+
+
+class CategoryTreeCache:
+    """The whole active category tree as one gzipped JSON blob per language.
+
+    The tree is built from a single query in ``(tree_id, lft)`` order, where
+    every parent comes before its children, so nesting is one pass. Children
+    of inactive categories are left out with them. The cache key includes
+    the ``categories`` generation, which every category write bumps, so the
+    blob is rebuilt only after a category changed, by one request at a time.
+    """
+
+    NODE_FIELDS = (
+        "id",
+        "parent_id",
+        "label",
+        "title",
+        "icon",
+        "icon_alt",
+        "active_product_count",
+    )
+
+    def __init__(self, cache_ttl: int = 24 * 60 * 60):
+        self.cache_ttl = cache_ttl
+
+    def get(self) -> CachedCategoryTree:
+        generation = CacheGenerations().get_many([CATEGORIES_SCOPE])[CATEGORIES_SCOPE]
+        key = f"category_tree_{get_language()}_{generation}"
+        entry = cache.get(key)
+        if entry is not None:
+            return entry
+
+        def build() -> CachedCategoryTree:
+            entry = self._encode(self.build(), generation)
+            cache.set(key, entry, self.cache_ttl)
+            return entry
+
+        entry, _ = SingleFlight("category_tree").run(key, build, lambda: cache.get(key))
+        return entry
+
+    def build(self) -> List[CategoryNode]:
+        nodes = {}
+        roots = []
+        categories = (
+            Category.objects.filter(is_active=True)
+            .only(*self.NODE_FIELDS)
+            .order_by("tree_id", "lft")
+        )
+        for category in categories.iterator(chunk_size=2000):
+            node = CategoryNode(
+                id=category.id,
+                label=category.label,
+                title=category.title,
+                icon=category.icon.url if category.icon else None,
+                icon_alt=category.icon_alt,
+                active_product_count=category.active_product_count,
+                children=[],
+            )
+            if category.parent_id is None:
+                roots.append(node)
+            elif category.parent_id in nodes:
+                nodes[category.parent_id]["children"].append(node)
+            else:
+                continue
+            nodes[category.id] = node
+
+        logger.info(f"Built category tree of {len(nodes)} categories")
+        return roots
+
+    @staticmethod
+    def _encode(tree: List[CategoryNode], generation: int) -> CachedCategoryTree:
+        payload = json.dumps(
+            tree, cls=DjangoJSONEncoder, ensure_ascii=False, separators=(",", ":")
+        ).encode()
+        digest = hashlib.md5(payload).hexdigest()[:16]
+        return CachedCategoryTree(
+            etag=f'"{get_language()}-{generation}-{digest}"',
+            body=gzip.compress(payload),
+        )
@@ -0,0 +1,75 @@
+from datetime import datetime
+from typing import Dict, Iterable, Optional, Tuple, TypedDict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.translation import get_language
+
+
+class CachedProductDetail(TypedDict):
+    etag: str
+    data: dict
+
+
+class ProductDetailCache:
+    """Serialized product detail payloads, one cache entry per product.
+
+    Payloads are cached per language, because translated fields follow the
+    active language. Entries are invalidated when a product is saved (see
+    ``main.signals``), archived by ``FeedManager`` or when ``ViewsCounter``
+    flushes its buffered views.
+    """
+
+    def __init__(self):
+        self.cache_ttl = 3600
+
+    def get(self, product_id: int) -> Optional[CachedProductDetail]:
+        return cache.get(self._key(product_id))
+
+    def get_many(self, product_ids: Iterable[int]) -> Dict[int, CachedProductDetail]:
+        keys = {self._key(product_id): product_id for product_id in product_ids}
+        return {keys[key]: entry for key, entry in cache.get_many(keys).items()}
+
+    def set(
+        self, product_id: int, modified: datetime, data: dict
+    ) -> CachedProductDetail:
+        entry = CachedProductDetail(
+            etag=self.make_etag(product_id, modified), data=dict(data)
+        )
+        cache.set(self._key(product_id), entry, self.cache_ttl)
+        return entry
+
+    def set_many(
+        self, payloads: Iterable[Tuple[int, datetime, dict]]
+    ) -> Dict[int, CachedProductDetail]:
+        """Caches ``(product_id, modified, data)`` payloads in one round trip."""
+        entries = {
+            product_id: CachedProductDetail(
+                etag=self.make_etag(product_id, modified), data=dict(data)
+            )
+            for product_id, modified, data in payloads
+        }
+        if entries:
+            cache.set_many(
+                {self._key(product_id): entry for product_id, entry in entries.items()},
+                self.cache_ttl,
+            )
+        return entries
+
+    def invalidate(self, product_ids: Iterable[int]) -> None:
+        keys = [
+            self._key(product_id, language)
+            for product_id in product_ids
+            for language, _ in settings.LANGUAGES
+        ]
+        if keys:
+            cache.delete_many(keys)
+
+    @staticmethod
+    def make_etag(product_id: int, modified: datetime) -> str:
+        # Weak: the payload also carries views_count, which changes without
+        # touching ``modified``.
+        return f'W/"{product_id}-{modified.timestamp():.6f}-{get_language()}"'
+
+    def _key(self, product_id: int, language: Optional[str] = None) -> str:
+        return f"product_detail_v2_{product_id}_{language or get_language()}"
@@ -0,0 +1,271 @@
+import logging
+from collections import defaultdict
+from typing import Dict, Iterable, List, Set, Tuple, TypedDict
+
+from django.db import transaction
+from django.db.models import Count, Exists, OuterRef, Q, QuerySet
+
+from main.models import (
+    Attribute,
+    AttributeValue,
+    Category,
+    CategoryAttributeConfig,
+    CategoryAttributeFacet,
+    Product,
+    ProductAttribute,
+)
+
+logger = logging.getLogger(__name__)
+
+# One ``(attribute ID, value IDs)`` group per ``attrs`` parameter. A product
+# matches when it has one of the values of every group, so repeating an
+# attribute ANDs its groups, e.g. a product that is both red and blue.
+AttributeSelection = List[Tuple[int, List[int]]]
+
+
+class FacetValue(TypedDict):
+    value_id: int
+    title: str
+    count: int
+    selected: bool
+
+
+class Facet(TypedDict):
+    attribute_id: int
+    label: str
+    title: str
+    values: List[FacetValue]
+
+
+def resolve_attribute_filters(
+    attribute_filters: List[Tuple[str, List[str]]],
+) -> AttributeSelection:
+    """Maps ``(label, value titles)`` filters to attribute and value IDs.
+
+    Unknown attribute labels are ignored. A known attribute with no matching
+    values stays in the result with an empty list, so it matches nothing.
+    """
+    if not attribute_filters:
+        return []
+
+    labels = [label for label, _ in attribute_filters]
+    attribute_map = {
+        attribute.label.lower(): attribute.id
+        for attribute in Attribute.objects.filter(label__in=labels)
+    }
+
+    groups = [
+        (attribute_map[label], set(values))
+        for label, values in attribute_filters
+        if label in attribute_map
+    ]
+    if not groups:
+        return []
+
+    condition = Q()
+    for attribute_id, titles in groups:
+        condition |= Q(attribute_id=attribute_id, title__in=titles)
+
+    value_ids = defaultdict(lambda: defaultdict(list))
+    for attribute_id, value_id, title in AttributeValue.objects.filter(
+        condition
+    ).values_list("attribute_id", "id", "title"):
+        value_ids[attribute_id][title].append(value_id)
+    return [
+        (
+            attribute_id,
+            [
+                value_id
+                for title in titles
+                for value_id in value_ids[attribute_id][title]
+            ],
+        )
+        for attribute_id, titles in groups
+    ]
+
+
+def filter_by_attribute_values(qs: QuerySet, selection: AttributeSelection) -> QuerySet:
+    """Keeps products that have one of the selected values of every attribute.
+
+    One EXISTS per attribute keeps the matching in SQL, served by the
+    (attribute, value, product) index, however many products match.
+    """
+    for attribute_id, value_ids in selection:
+        qs = qs.filter(
+            Exists(
+                ProductAttribute.objects.filter(
+                    product_id=OuterRef("pk"),
+                    attribute_id=attribute_id,
+                    value_id__in=value_ids,
+                )
+            )
+        )
+    return qs
+
+
+class FacetEngine:
+    """Attribute facet counts of the active products of one category.
+
+    Only attributes marked ``is_filterable`` in the category's
+    ``CategoryAttributeConfig`` are faceted. Without filters the counts are
+    read from the ``CategoryAttributeFacet`` table. With filters every facet
+    is counted against the other filters only, so the values of a selected
+    attribute keep showing how many products each alternative would give.
+    That is one grouped query for the unselected attributes plus one per
+    selected attribute.
+    """
+
+    def __init__(self, category: Category):
+        self.category = category
+
+    def facets(self, attribute_filters: List[Tuple[str, List[str]]]) -> List[Facet]:
+        configs = list(
+            CategoryAttributeConfig.objects.filter(
+                category=self.category, is_filterable=True, is_active=True
+            )
+            .select_related("attribute")
+            .order_by("sort_order")
+        )
+        if not configs:
+            return []
+
+        attribute_ids = [config.attribute_id for config in configs]
+        selection = resolve_attribute_filters(attribute_filters)
+        if selection:
+            counts = self._count_filtered(attribute_ids, selection)
+        else:
+            counts = self._count_stored(attribute_ids)
+
+        titles = dict(
+            AttributeValue.objects.filter(
+                id__in={value_id for values in counts.values() for value_id in values}
+            ).values_list("id", "title")
+        )
+
+        facets = []
+        for config in configs:
+            values = counts.get(config.attribute_id)
+            if not values:
+                continue
+            selected = {
+                value_id
+                for attribute_id, value_ids in selection
+                if attribute_id == config.attribute_id
+                for value_id in value_ids
+            }
+            facets.append(
+                Facet(
+                    attribute_id=config.attribute_id,
+                    label=config.attribute.label,
+                    title=config.attribute.title,
+                    values=[
+                        FacetValue(
+                            value_id=value_id,
+                            title=titles.get(value_id, ""),
+                            count=count,
+                            selected=value_id in selected,
+                        )
+                        for value_id, count in sorted(
+                            values.items(), key=lambda item: (-item[1], item[0])
+                        )
+                    ],
+                )
+            )
+        return facets
+
+    def _count_stored(self, attribute_ids: List[int]) -> Dict[int, Dict[int, int]]:
+        counts = defaultdict(dict)
+        rows = CategoryAttributeFacet.objects.filter(
+            category=self.category, attribute_id__in=attribute_ids, product_count__gt=0
+        ).values_list("attribute_id", "value_id", "product_count")
+        for attribute_id, value_id, product_count in rows:
+            counts[attribute_id][value_id] = product_count
+        return counts
+
+    def _count_filtered(
+        self, attribute_ids: List[int], selection: AttributeSelection
+    ) -> Dict[int, Dict[int, int]]:
+        counts = {}
+        selected = {attribute_id for attribute_id, _ in selection}
+        unselected = [a for a in attribute_ids if a not in selected]
+        if unselected:
+            counts.update(self._count(unselected, selection))
+        for attribute_id in attribute_ids:
+            if attribute_id in selected:
+                others = [(a, v) for a, v in selection if a != attribute_id]
+                counts.update(self._count([attribute_id], others))
+        return counts
+
+    def _count(
+        self, attribute_ids: List[int], selection: AttributeSelection
+    ) -> Dict[int, Dict[int, int]]:
+        products = filter_by_attribute_values(
+            Product.objects.filter(category=self.category, is_active=True), selection
+        )
+        rows = (
+            ProductAttribute.objects.filter(
+                attribute_id__in=attribute_ids, product__in=products.values("id")
+            )
+            .values("attribute_id", "value_id")
+            .annotate(count=Count("product_id", distinct=True))
+            .values_list("attribute_id", "value_id", "count")
+        )
+        counts = defaultdict(dict)
+        for attribute_id, value_id, count in rows:
+            counts[attribute_id][value_id] = count
+        return counts
+
+    @staticmethod
+    def refresh(category_ids: Iterable[int]) -> int:
+        """Rebuilds the stored facet counts of the given categories."""
+        category_ids = set(category_ids)
+        if not category_ids:
+            return 0
+
+        filterable: Set[Tuple[int, int]] = set(
+            CategoryAttributeConfig.objects.filter(
+                category_id__in=category_ids, is_filterable=True, is_active=True
+            ).values_list("category_id", "attribute_id")
+        )
+        rows = (
+            ProductAttribute.objects.filter(
+                product__category_id__in=category_ids,
+                product__is_active=True,
+                attribute_id__in={attribute_id for _, attribute_id in filterable},
+            )
+            .values("product__category_id", "attribute_id", "value_id")
+            .annotate(count=Count("product_id", distinct=True))
+            .values_list("product__category_id", "attribute_id", "value_id", "count")
+        )
+        facets = [
+            CategoryAttributeFacet(
+                category_id=category_id,
+                attribute_id=attribute_id,
+                value_id=value_id,
+                product_count=count,
+            )
+            for category_id, attribute_id, value_id, count in rows
+            if (category_id, attribute_id) in filterable
+        ]
+
+        with transaction.atomic():
+            CategoryAttributeFacet.objects.filter(category_id__in=category_ids).delete()
+            CategoryAttributeFacet.objects.bulk_create(facets, batch_size=1000)
+
+        logger.info(
+            f"Refreshed {len(facets)} facet counts of {len(category_ids)} categories"
+        )
+        return len(facets)
+
+    @staticmethod
+    def build(chunk_size: int = 500) -> int:
+        """Rebuilds the stored facet counts of every category, a chunk at a time."""
+        category_ids = list(
+            Category.objects.order_by("id").values_list("id", flat=True)
+        )
+        facets = 0
+        for start in range(0, len(category_ids), chunk_size):
+            facets += FacetEngine.refresh(category_ids[start : start + chunk_size])
+
+        logger.info(f"Built {facets} facet counts of {len(category_ids)} categories")
+        return facets
@@ -0,0 +1,204 @@
+import logging
+import re
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.utils import timezone
+from django_redis import get_redis_connection
+
+from main.models import Product
+
+logger = logging.getLogger(__name__)
+
+ALL_TIME_KEY = "views_top:all"
+BUILT_KEY = "views_top:built"
+CATEGORY_KEY_PATTERN = re.compile(r"views_top:category:\d+")
+
+
+class ViewsLeaderboard:
+    """Most viewed products, kept in Redis sorted sets.
+
+    Every view adds one point to the product in the all-time set, in the set
+    of its category and in both sets of the current day. A window of the
+    last N days is the union of N day sets, computed at most once a minute
+    and kept as its own set. Reading the top N of any set is
+    ``ZREVRANGE``, O(log n + N).
+
+    ``build`` rebuilds the all-time sets from ``Product.views_count`` plus
+    the views ``ViewsCounter`` has not flushed yet. Views keep arriving
+    while it reads the database, so it snapshots every set together with
+    the unflushed views and merges the rebuilt scores with what the live set
+    gained since the snapshot, instead of overwriting it. Day sets only
+    exist from the first day of counting and expire after the longest
+    window.
+    """
+
+    def __init__(self):
+        self.redis = get_redis_connection("default")
+
+    @staticmethod
+    def category_key(category_id: int) -> str:
+        return f"views_top:category:{category_id}"
+
+    @staticmethod
+    def day_key(day: date, category_id: Optional[int] = None) -> str:
+        if category_id is None:
+            return f"views_top:day:{day:%Y%m%d}"
+        return f"views_top:category:{category_id}:day:{day:%Y%m%d}"
+
+    def is_built(self) -> bool:
+        """Whether ``build`` has seeded the all-time sets, which windows do not need."""
+        return self.redis.exists(BUILT_KEY) > 0
+
+    def record(self, pipe, product_id: int, category_id: Optional[int]) -> None:
+        """Queues one view of the product on ``pipe``."""
+        today = timezone.localdate()
+        day_ttl = (max(settings.VIEWS_LEADERBOARD_WINDOWS) + 1) * 24 * 60 * 60
+        pipe.zincrby(ALL_TIME_KEY, 1, product_id)
+        pipe.zincrby(self.day_key(today), 1, product_id)
+        pipe.expire(self.day_key(today), day_ttl)
+        if category_id is not None:
+            pipe.zincrby(self.category_key(category_id), 1, product_id)
+            pipe.zincrby(self.day_key(today, category_id), 1, product_id)
+            pipe.expire(self.day_key(today, category_id), day_ttl)
+
+    def top(
+        self,
+        limit: int,
+        category_id: Optional[int] = None,
+        window: Optional[int] = None,
+    ) -> List[Product]:
+        """Returns the ``limit`` most viewed active products, most viewed first.
+
+        Products that are no longer active, or have left the category, are
+        dropped from the set while reading.
+        """
+        if window:
+            key = self._window_key(window, category_id)
+        elif category_id is not None:
+            key = self.category_key(category_id)
+        else:
+            key = ALL_TIME_KEY
+
+        products: List[Product] = []
+        start = 0
+        batch = limit * 2
+        while len(products) < limit:
+            ids = [
+                int(id_) for id_ in self.redis.zrevrange(key, start, start + batch - 1)
+            ]
+            if not ids:
+                break
+            found = self._hydrate(ids, category_id)
+            stale = [id_ for id_ in ids if id_ not in found]
+            if stale:
+                self.redis.zrem(key, *stale)
+            products.extend(found[id_] for id_ in ids if id_ in found)
+            if len(ids) < batch:
+                break
+            start += batch - len(stale)
+        return products[:limit]
+
+    def build(self, chunk_size: int = 10000) -> int:
+        """Rebuilds the all-time sets and returns the number of products in them."""
+        from services.product.views_counter import (
+            FLUSH_LOCK_KEY,
+            FLUSHING_KEY,
+            PENDING_KEY,
+        )
+
+        # Flushing moves views from Redis to views_count; holding its lock
+        # keeps every view in exactly one of the two while they are read.
+        with self.redis.lock(FLUSH_LOCK_KEY, timeout=600, blocking_timeout=300):
+            rows = Product.objects.filter(is_active=True).values_list(
+                "id", "category_id", "views_count"
+            )
+            by_key = {ALL_TIME_KEY: {}}
+            for product_id, category_id, views_count in rows.iterator(
+                chunk_size=chunk_size
+            ):
+                by_key[ALL_TIME_KEY][product_id] = views_count
+                if category_id is not None:
+                    by_key.setdefault(self.category_key(category_id), {})[
+                        product_id
+                    ] = views_count
+
+            live = {ALL_TIME_KEY} | {
+                key.decode()
+                for key in self.redis.scan_iter(
+                    match="views_top:category:*", count=1000
+                )
+                if CATEGORY_KEY_PATTERN.fullmatch(key.decode())
+            }
+            with self.redis.pipeline() as pipe:
+                for key in live:
+                    pipe.zunionstore(f"{key}:snapshot", [key])
+                pipe.hgetall(PENDING_KEY)
+                pipe.hgetall(FLUSHING_KEY)
+                *_, pending, flushing = pipe.execute()
+
+        views = {}
+        for buffered in (pending, flushing):
+            for product_id, count in buffered.items():
+                views[int(product_id)] = views.get(int(product_id), 0) + int(count)
+        for scores in by_key.values():
+            for product_id in scores:
+                scores[product_id] += views.get(product_id, 0)
+
+        for key, scores in by_key.items():
+            self._merge(key, scores)
+        stale = live - by_key.keys()
+        if stale:
+            self.redis.delete(*stale, *(f"{key}:snapshot" for key in stale))
+        self.redis.set(BUILT_KEY, timezone.now().isoformat())
+
+        count = len(by_key[ALL_TIME_KEY])
+        logger.info(f"Built views leaderboards of {count} products")
+        return count
+
+    def _window_key(self, window: int, category_id: Optional[int]) -> str:
+        today = timezone.localdate()
+        scope = "all" if category_id is None else f"category:{category_id}"
+        key = f"views_top:window:{window}:{scope}:{today:%Y%m%d}"
+        if self.redis.exists(key):
+            return key
+
+        days = [
+            self.day_key(today - timedelta(days=n), category_id) for n in range(window)
+        ]
+        with self.redis.pipeline() as pipe:
+            pipe.zunionstore(key, days)
+            pipe.expire(key, settings.VIEWS_LEADERBOARD_WINDOW_TTL)
+            pipe.execute()
+        return key
+
+    def _hydrate(
+        self, ids: List[int], category_id: Optional[int]
+    ) -> Dict[int, Product]:
+        products = Product.objects.filter(is_active=True, id__in=ids)
+        if category_id is not None:
+            products = products.filter(category_id=category_id)
+        return {product.id: product for product in products}
+
+    def _merge(self, key: str, scores: dict, batch_size: int = 10000) -> None:
+        """Replaces ``key`` with ``scores`` plus the views it got since its snapshot."""
+        building, snapshot, recent = (
+            f"{key}:building",
+            f"{key}:snapshot",
+            f"{key}:recent",
+        )
+        items: List[Tuple[int, int]] = list(scores.items())
+        with self.redis.pipeline(transaction=False) as pipe:
+            pipe.delete(building)
+            for start in range(0, len(items), batch_size):
+                pipe.zadd(building, dict(items[start : start + batch_size]))
+            pipe.execute()
+
+        with self.redis.pipeline() as pipe:
+            pipe.zunionstore(recent, {key: 1, snapshot: -1})
+            # Members removed by ``top`` since the snapshot end up negative.
+            pipe.zremrangebyscore(recent, "-inf", 0)
+            pipe.zunionstore(key, [building, recent])
+            pipe.delete(building, snapshot, recent)
+            pipe.execute()
@@ -0,0 +1,54 @@
+import logging
+
+from django.contrib.postgres.search import (
+    SearchQuery,
+    SearchRank,
+    TrigramWordSimilarity,
+)
+from django.db.models import F, QuerySet
+from django.utils.translation import get_language
+from modeltranslation.utils import build_localized_fieldname
+
+logger = logging.getLogger(__name__)
+
+# Text search configurations used by the store_product_search_vector trigger.
+SEARCH_CONFIGS = ("simple", "english", "russian")
+
+
+class ProductSearch:
+    """Ranked full-text product search with a trigram fallback.
+
+    Products are matched against ``search_vector``, which a database trigger
+    keeps up to date from the translated names, vendor, article and the
+    translated descriptions. The query is parsed with every configuration of
+    the vector, so stemmed English and Russian words match as well as exact
+    Ukrainian ones. When nothing matches, for example because of a typo, the
+    localized name is matched by trigram word similarity instead, which the
+    ``gin_trgm_ops`` indexes serve.
+    """
+
+    def apply(self, qs: QuerySet, text: str) -> QuerySet:
+        """Filters ``qs`` by ``text`` and annotates each product with ``rank``."""
+        text = text.strip()
+        if not text:
+            return qs
+
+        query = self._query(text)
+        matched = qs.filter(search_vector=query).annotate(
+            rank=SearchRank(F("search_vector"), query)
+        )
+        if matched.exists():
+            return matched
+
+        logger.info(f"No full-text matches for '{text}', using trigram similarity")
+        name_field = build_localized_fieldname("name", get_language())
+        return qs.filter(**{f"{name_field}__trigram_word_similar": text}).annotate(
+            rank=TrigramWordSimilarity(text, name_field)
+        )
+
+    def _query(self, text: str) -> SearchQuery:
+        query = None
+        for config in SEARCH_CONFIGS:
+            config_query = SearchQuery(text, config=config, search_type="websearch")
+            query = config_query if query is None else query | config_query
+        return query
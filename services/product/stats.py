@@ -0,0 +1,308 @@
+import logging
+import threading
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple, TypedDict
+
+from django.db import connection, transaction
+from django.db.models import Case, Count, F, Q, Value, When
+
+from main.models import Category, CategoryProductCount, Product, ProductStatusCount
+from services.cache.generations import (
+    CATEGORIES_SCOPE,
+    bump_generations,
+    category_scope,
+)
+
+logger = logging.getLogger(__name__)
+
+# (category_id, status, is_active) of a product.
+ProductKey = Tuple[Optional[int], int, bool]
+
+STATUS_COLUMNS = {
+    Product.Status.ACTIVE: "active_count",
+    Product.Status.DRAFT: "draft_count",
+    Product.Status.ARCHIVED: "archived_count",
+}
+
+_deferred = threading.local()
+
+
+class PopularCategory(TypedDict):
+    id: int
+    title: str
+    product_count: int
+
+
+class ProductStats:
+    """Product counters per status and per category.
+
+    Every product write turns into a ``(category, status, is_active)`` delta:
+    a new product adds one, a deleted product removes one, and any other
+    change of these fields does both. Deltas are applied in the writing
+    transaction with ``UPDATE ... SET n = n + delta``, so the counters stay
+    consistent with the products they count. Inside ``deferred_product_stats``
+    the deltas of a bulk write are summed first and applied once when the
+    block ends, still in the writing transaction, which turns a feed run
+    into a handful of updates and keeps the counter rows unlocked while the
+    run writes products. Rows are updated in key order, so concurrent runs
+    lock them in the same order. ``reconcile`` rebuilds the counters from
+    ``store_product`` to repair any drift.
+
+    Besides the ``ProductStatusCount`` and ``CategoryProductCount`` tables,
+    the deltas of published products (active status, ``is_active``) maintain
+    ``Category.active_product_count`` and ``has_active_products``. Those
+    count the whole subtree, so a delta is added to the category and all its
+    ancestors, found through the ``lft``/``rght`` range of the category.
+    """
+
+    def record(self, old: Optional[ProductKey], new: Optional[ProductKey]) -> None:
+        changes = Counter()
+        if old is not None:
+            changes[old] -= 1
+        if new is not None:
+            changes[new] += 1
+        changes = {key: delta for key, delta in changes.items() if delta}
+        if not changes:
+            return
+
+        pending = getattr(_deferred, "changes", None)
+        if pending is not None:
+            pending.update(changes)
+            return
+        self.apply(changes)
+
+    def apply(self, changes: Dict[ProductKey, int]) -> None:
+        by_status = Counter()
+        by_category = defaultdict(Counter)
+        published = Counter()
+        for (category_id, status, is_active), delta in changes.items():
+            if not delta:
+                continue
+            by_status[status] += delta
+            if category_id is not None:
+                by_category[category_id]["product_count"] += delta
+                by_category[category_id][STATUS_COLUMNS[status]] += delta
+                if is_active and status == Product.Status.ACTIVE:
+                    published[category_id] += delta
+
+        with transaction.atomic():
+            for status, delta in sorted(by_status.items()):
+                if delta:
+                    self._increment(
+                        ProductStatusCount, {"status": status}, {"product_count": delta}
+                    )
+            for category_id, deltas in sorted(by_category.items()):
+                deltas = {column: delta for column, delta in deltas.items() if delta}
+                if deltas:
+                    self._increment(
+                        CategoryProductCount, {"category_id": category_id}, deltas
+                    )
+            self._roll_up_active_counts(published)
+
+    def _roll_up_active_counts(self, deltas: Dict[int, int]) -> None:
+        deltas = {category_id: delta for category_id, delta in deltas.items() if delta}
+        if not deltas:
+            return
+
+        nodes_by_tree = defaultdict(list)
+        condition = Q()
+        for category_id, tree_id, lft, rght in Category.objects.filter(
+            id__in=deltas
+        ).values_list("id", "tree_id", "lft", "rght"):
+            nodes_by_tree[tree_id].append((lft, rght, deltas[category_id]))
+            condition |= Q(tree_id=tree_id, lft__lte=lft, rght__gte=rght)
+
+        totals = Counter()
+        for ancestor_id, tree_id, lft, rght in Category.objects.filter(
+            condition
+        ).values_list("id", "tree_id", "lft", "rght"):
+            for node_lft, node_rght, delta in nodes_by_tree[tree_id]:
+                if lft <= node_lft and rght >= node_rght:
+                    totals[ancestor_id] += delta
+
+        changed = sorted(ancestor_id for ancestor_id, delta in totals.items() if delta)
+        if not changed:
+            return
+        # Lock the ancestors in ID order first: the grouped updates below
+        # would otherwise lock them in whatever order the plan visits them.
+        list(
+            Category.objects.select_for_update()
+            .filter(id__in=changed)
+            .order_by("id")
+            .values_list("id", flat=True)
+        )
+        ids_by_delta = defaultdict(list)
+        for ancestor_id in changed:
+            ids_by_delta[totals[ancestor_id]].append(ancestor_id)
+        for delta, ids in ids_by_delta.items():
+            Category.objects.filter(id__in=ids).update(
+                active_product_count=F("active_product_count") + delta,
+                has_active_products=Case(
+                    When(active_product_count__gt=-delta, then=Value(True)),
+                    default=Value(False),
+                ),
+            )
+
+        bump_generations(CATEGORIES_SCOPE, *(category_scope(id_) for id_ in changed))
+
+    def reconcile_active_counts(self) -> int:
+        """Recomputes the subtree counters of every category.
+
+        Returns the number of categories whose counters were wrong.
+        """
+        with transaction.atomic():
+            # Lock every category in ID order, the order deltas lock them in,
+            # so deltas wait for the recount and land on top of it.
+            list(Category.objects.select_for_update().order_by("id").values_list("id"))
+            totals = Counter(
+                dict(
+                    Product.objects.filter(
+                        is_active=True,
+                        status=Product.Status.ACTIVE,
+                        category__isnull=False,
+                    )
+                    .values("category_id")
+                    .annotate(count=Count("id"))
+                    .values_list("category_id", "count")
+                )
+            )
+            categories = list(
+                Category.objects.order_by("-level").values_list(
+                    "id", "parent_id", "active_product_count", "has_active_products"
+                )
+            )
+            for category_id, parent_id, _, _ in categories:
+                if parent_id:
+                    totals[parent_id] += totals[category_id]
+
+            changed = [
+                Category(
+                    id=category_id,
+                    active_product_count=totals[category_id],
+                    has_active_products=totals[category_id] > 0,
+                )
+                for category_id, _, count, has_active in categories
+                if count != totals[category_id]
+                or has_active != (totals[category_id] > 0)
+            ]
+            Category.objects.bulk_update(
+                changed,
+                ["active_product_count", "has_active_products"],
+                batch_size=1000,
+            )
+        if changed:
+            bump_generations(CATEGORIES_SCOPE, *(category_scope(c.id) for c in changed))
+        logger.info(f"Fixed active product counts of {len(changed)} categories")
+        return len(changed)
+
+    def reconcile(self) -> int:
+        """Rebuilds every counter from the products table.
+
+        The counter tables are locked before counting. Every delta is written
+        in the transaction of the products it counts, so a writer either
+        committed both before the lock, and the count includes its products,
+        or waits for the rebuild and adds its delta on top. The category
+        subtree counters are rebuilt in the same transaction.
+        """
+        with transaction.atomic():
+            lock_tables(ProductStatusCount, CategoryProductCount)
+            status_counts = dict(
+                Product.objects.values("status")
+                .annotate(count=Count("id"))
+                .values_list("status", "count")
+            )
+            category_counts = (
+                Product.objects.filter(category__isnull=False)
+                .values("category_id")
+                .annotate(
+                    product_count=Count("id"),
+                    **{
+                        column: Count("id", filter=Q(status=status))
+                        for status, column in STATUS_COLUMNS.items()
+                    },
+                )
+            )
+
+            ProductStatusCount.objects.all().delete()
+            ProductStatusCount.objects.bulk_create(
+                [
+                    ProductStatusCount(status=status, product_count=count)
+                    for status, count in status_counts.items()
+                ]
+            )
+            CategoryProductCount.objects.all().delete()
+            created = CategoryProductCount.objects.bulk_create(
+                [CategoryProductCount(**row) for row in category_counts],
+                batch_size=1000,
+            )
+
+            self.reconcile_active_counts()
+
+        logger.info(f"Reconciled product counters of {len(created)} categories")
+        return len(created)
+
+    @staticmethod
+    def status_counts() -> Dict[str, int]:
+        counts = dict(ProductStatusCount.objects.values_list("status", "product_count"))
+        return {
+            "total": sum(counts.values()),
+            "active": counts.get(Product.Status.ACTIVE, 0),
+            "draft": counts.get(Product.Status.DRAFT, 0),
+            "archived": counts.get(Product.Status.ARCHIVED, 0),
+        }
+
+    @staticmethod
+    def popular_categories(limit: int = 10) -> List[PopularCategory]:
+        rows = (
+            CategoryProductCount.objects.filter(product_count__gt=0)
+            .order_by("-product_count", "category_id")
+            .values_list("category_id", "category__title", "product_count")[:limit]
+        )
+        return [
+            PopularCategory(id=category_id, title=title, product_count=count)
+            for category_id, title, count in rows
+        ]
+
+    @staticmethod
+    def _increment(model, lookup: dict, deltas: Dict[str, int]) -> None:
+        rows = model.objects.filter(**lookup)
+        updates = {column: F(column) + delta for column, delta in deltas.items()}
+        if not rows.update(**updates):
+            model.objects.get_or_create(**lookup)
+            rows.update(**updates)
+
+
+@contextmanager
+def deferred_product_stats():
+    """Sums the counter changes of a bulk write and applies them when it ends.
+
+    The changes are applied in the transaction of the write, so they commit
+    together with the products they count.
+    """
+    if getattr(_deferred, "changes", None) is not None:
+        yield
+        return
+
+    _deferred.changes = Counter()
+    try:
+        yield
+        changes, _deferred.changes = _deferred.changes, None
+        if changes:
+            ProductStats().apply(changes)
+    finally:
+        _deferred.changes = None
+
+
+def lock_tables(*models) -> None:
+    """Blocks writes to the tables of ``models`` until the transaction ends.
+
+    ``SHARE ROW EXCLUSIVE`` waits for transactions that already wrote to them
+    and keeps out new writers, so rows counted after it are not changed
+    behind the count.
+    """
+    tables = ", ".join(
+        connection.ops.quote_name(model._meta.db_table) for model in models
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(f"LOCK TABLE {tables} IN SHARE ROW EXCLUSIVE MODE")
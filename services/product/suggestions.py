@@ -0,0 +1,275 @@
+import json
+import logging
+import re
+from typing import Iterable, List, Optional, Set, TypedDict
+
+from django.conf import settings
+from django.db.models import Q, Sum
+from django.utils.translation import get_language
+from django_redis import get_redis_connection
+from modeltranslation.utils import build_localized_fieldname
+
+from main.models import Category, Product
+
+logger = logging.getLogger(__name__)
+
+WORD_RE = re.compile(r"\w+")
+
+VERSION_KEY = "suggest:version"
+NEXT_VERSION_KEY = "suggest:next_version"
+LOCK_KEY = "suggest:lock"
+
+
+class Suggestion(TypedDict):
+    type: str
+    id: Optional[int]
+    text: str
+
+
+def suggestion_terms(text: str) -> List[str]:
+    return WORD_RE.findall((text or "").casefold())
+
+
+class SuggestionIndex:
+    """Prefix index of product names, vendors and category titles in Redis.
+
+    Every prefix of every word gets a sorted set of the entries containing
+    it, scored by views (a product's ``views_count``, or the total of the
+    active products of a vendor or category) and capped at
+    ``max_entries_per_prefix``. A lookup is one ``ZREVRANGE``, or one
+    ``ZINTER`` for several words. Each language has its own index, because
+    names and titles are translated.
+
+    ``build`` rebuilds everything under a new version of the key namespace
+    and then points ``suggest:version`` at it, so lookups see either the old
+    index or the new one, never a partial one. ``update`` re-indexes the
+    given products, their vendors and the given categories after a feed run.
+    Both hold the same lock, so an update waits for a running build and is
+    applied to the index it produced.
+    """
+
+    def __init__(self, max_prefix_length: int = 15, max_entries_per_prefix: int = 100):
+        self.redis = get_redis_connection("default")
+        self.max_prefix_length = max_prefix_length
+        self.max_entries_per_prefix = max_entries_per_prefix
+
+    def suggest(self, text: str, limit: int = 10) -> List[Suggestion]:
+        terms = suggestion_terms(text)
+        if not terms:
+            return []
+
+        namespace = self._namespace(self._version(), get_language())
+        keys = [
+            self._prefix_key(namespace, term[: self.max_prefix_length])
+            for term in terms
+        ]
+        if len(keys) == 1:
+            members = self.redis.zrevrange(keys[0], 0, limit - 1)
+        else:
+            members = self.redis.zinter(keys, aggregate="MAX")[::-1][:limit]
+        if not members:
+            return []
+
+        labels = self.redis.hmget(self._labels_key(namespace), members)
+        return [json.loads(label) for label in labels if label]
+
+    def build(self) -> int:
+        """Rebuilds the index of every language and returns the number of entries."""
+        with self.redis.lock(LOCK_KEY, timeout=3600, blocking_timeout=600):
+            previous = self._version()
+            version = str(self.redis.incr(NEXT_VERSION_KEY))
+            try:
+                products = Product.objects.filter(
+                    is_active=True, status=Product.Status.ACTIVE
+                )
+                count = self._index_products(version, products)
+                count += self._index_vendors(
+                    version, products.values_list("vendor", flat=True)
+                )
+                count += self._index_categories(
+                    version, Category.objects.filter(is_active=True)
+                )
+            except Exception:
+                self._drop(version)
+                raise
+            self.redis.set(VERSION_KEY, version)
+
+        self._drop(previous)
+        if previous == "0":
+            # Keys of the unversioned layout, which kept one namespace per language.
+            for language in settings.MODELTRANSLATION_LANGUAGES:
+                self._drop(language)
+        logger.info(f"Built suggestion index version {version} with {count} entries")
+        return count
+
+    def update(
+        self, product_ids: Iterable[int], category_ids: Iterable[int] = ()
+    ) -> None:
+        product_ids, category_ids = set(product_ids), set(category_ids)
+        with self.redis.lock(LOCK_KEY, timeout=600, blocking_timeout=600):
+            version = self._version()
+            self._remove(
+                version, [f"product:{product_id}" for product_id in product_ids]
+            )
+            self._remove(
+                version, [f"category:{category_id}" for category_id in category_ids]
+            )
+
+            self._index_products(
+                version,
+                Product.objects.filter(
+                    id__in=product_ids, is_active=True, status=Product.Status.ACTIVE
+                ),
+            )
+            vendors = set(
+                Product.objects.filter(id__in=product_ids).values_list(
+                    "vendor", flat=True
+                )
+            )
+            self._remove(version, [f"vendor:{vendor}" for vendor in vendors])
+            self._index_vendors(version, vendors)
+            self._index_categories(
+                version, Category.objects.filter(id__in=category_ids, is_active=True)
+            )
+
+    def _index_products(self, version: str, products) -> int:
+        name_fields = [
+            build_localized_fieldname("name", language)
+            for language in settings.MODELTRANSLATION_LANGUAGES
+        ]
+        rows = products.values_list("id", "views_count", "name", *name_fields)
+        count = 0
+        with self.redis.pipeline(transaction=False) as pipe:
+            for product_id, views_count, name, *names in rows.iterator(chunk_size=2000):
+                for language, localized in zip(
+                    settings.MODELTRANSLATION_LANGUAGES, names
+                ):
+                    self._add(
+                        pipe,
+                        self._namespace(version, language),
+                        Suggestion(
+                            type="product", id=product_id, text=localized or name
+                        ),
+                        views_count,
+                    )
+                count += 1
+                if count % 1000 == 0:
+                    pipe.execute()
+            pipe.execute()
+        return count
+
+    def _index_vendors(self, version: str, vendors: Iterable[str]) -> int:
+        vendors = {vendor for vendor in vendors if vendor}
+        if not vendors:
+            return 0
+
+        rows = (
+            Product.objects.filter(
+                vendor__in=vendors, is_active=True, status=Product.Status.ACTIVE
+            )
+            .values("vendor")
+            .annotate(views=Sum("views_count"))
+            .values_list("vendor", "views")
+        )
+        with self.redis.pipeline(transaction=False) as pipe:
+            for vendor, views in rows:
+                for language in settings.MODELTRANSLATION_LANGUAGES:
+                    self._add(
+                        pipe,
+                        self._namespace(version, language),
+                        Suggestion(type="vendor", id=None, text=vendor),
+                        views or 0,
+                    )
+            pipe.execute()
+        return len(rows)
+
+    def _index_categories(self, version: str, categories) -> int:
+        title_fields = [
+            build_localized_fieldname("title", language)
+            for language in settings.MODELTRANSLATION_LANGUAGES
+        ]
+        active = Q(products__is_active=True, products__status=Product.Status.ACTIVE)
+        rows = categories.annotate(
+            views=Sum("products__views_count", filter=active)
+        ).values_list("id", "views", "title", *title_fields)
+        count = 0
+        with self.redis.pipeline(transaction=False) as pipe:
+            for category_id, views, title, *titles in rows:
+                for language, localized in zip(
+                    settings.MODELTRANSLATION_LANGUAGES, titles
+                ):
+                    self._add(
+                        pipe,
+                        self._namespace(version, language),
+                        Suggestion(
+                            type="category", id=category_id, text=localized or title
+                        ),
+                        views or 0,
+                    )
+                count += 1
+            pipe.execute()
+        return count
+
+    def _add(self, pipe, namespace: str, suggestion: Suggestion, score: int) -> None:
+        member = self._member(suggestion)
+        prefixes = sorted(self._prefixes(suggestion["text"]))
+        for prefix in prefixes:
+            key = self._prefix_key(namespace, prefix)
+            pipe.zadd(key, {member: score})
+            pipe.zremrangebyrank(key, 0, -self.max_entries_per_prefix - 1)
+        pipe.hset(self._labels_key(namespace), member, json.dumps(suggestion))
+        pipe.hset(self._prefixes_key(namespace), member, json.dumps(prefixes))
+
+    def _remove(self, version: str, members: List[str]) -> None:
+        if not members:
+            return
+
+        for language in settings.MODELTRANSLATION_LANGUAGES:
+            namespace = self._namespace(version, language)
+            stored = self.redis.hmget(self._prefixes_key(namespace), members)
+            with self.redis.pipeline(transaction=False) as pipe:
+                for member, prefixes in zip(members, stored):
+                    for prefix in json.loads(prefixes or "[]"):
+                        pipe.zrem(self._prefix_key(namespace, prefix), member)
+                pipe.hdel(self._labels_key(namespace), *members)
+                pipe.hdel(self._prefixes_key(namespace), *members)
+                pipe.execute()
+
+    def _prefixes(self, text: str) -> Set[str]:
+        return {
+            term[:length]
+            for term in suggestion_terms(text)
+            for length in range(1, min(len(term), self.max_prefix_length) + 1)
+        }
+
+    @staticmethod
+    def _member(suggestion: Suggestion) -> str:
+        if suggestion["type"] == "vendor":
+            return f"vendor:{suggestion['text']}"
+        return f"{suggestion['type']}:{suggestion['id']}"
+
+    def _drop(self, version: str) -> None:
+        keys = list(self.redis.scan_iter(match=f"suggest:{version}:*", count=1000))
+        for start in range(0, len(keys), 1000):
+            self.redis.delete(*keys[start : start + 1000])
+
+    def _version(self) -> str:
+        """The version of the live index; ``0`` until the first build."""
+        version = self.redis.get(VERSION_KEY)
+        return version.decode() if version else "0"
+
+    @staticmethod
+    def _namespace(version: str, language: str) -> str:
+        return f"suggest:{version}:{language}"
+
+    @staticmethod
+    def _prefix_key(namespace: str, prefix: str) -> str:
+        return f"{namespace}:p:{prefix}"
+
+    @staticmethod
+    def _labels_key(namespace: str) -> str:
+        return f"{namespace}:labels"
+
+    @staticmethod
+    def _prefixes_key(namespace: str) -> str:
+        return f"{namespace}:prefixes"
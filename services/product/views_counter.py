@@ -0,0 +1,106 @@
+import logging
+from typing import Dict, Iterable, Optional
+
+from django.db import transaction
+from django.db.models import Case, F, IntegerField, Value, When
+from django_redis import get_redis_connection
+from redis.exceptions import ResponseError
+
+from main.models import Product
+from services.product.detail_cache import ProductDetailCache
+from services.product.leaderboard import ViewsLeaderboard
+
+logger = logging.getLogger(__name__)
+
+PENDING_KEY = "product_views:pending"
+FLUSHING_KEY = "product_views:flushing"
+FLUSH_LOCK_KEY = "product_views:flush_lock"
+
+
+class ViewsCounter:
+    """Buffers product views in a Redis hash and flushes them in bulk.
+
+    Views are counted with ``HINCRBY`` so the detail endpoint never writes to
+    the database. ``flush`` moves the hash aside with ``RENAME`` and adds the
+    buffered counts to ``Product.views_count`` with one ``UPDATE`` per batch,
+    all in one transaction, so a failed flush is retried without counting
+    any batch twice. Readers add the buffered views, including the ones
+    being flushed, to the cached ``views_count``; once they are written the
+    cached payloads of the flushed products are invalidated.
+    """
+
+    def __init__(self, batch_size: int = 1000):
+        self.redis = get_redis_connection("default")
+        self.batch_size = batch_size
+
+    def increment(self, product_id: int, category_id: Optional[int] = None) -> int:
+        """Records a view and returns the number of views not yet flushed.
+
+        The view is also added to the ``ViewsLeaderboard`` sets, in the same
+        ``MULTI``, so a leaderboard snapshot sees either all of it or none.
+        """
+        pipe = self.redis.pipeline()
+        pipe.hincrby(PENDING_KEY, product_id, 1)
+        ViewsLeaderboard().record(pipe, product_id, category_id)
+        return pipe.execute()[0]
+
+    def pending(self, product_ids: Iterable[int]) -> Dict[int, int]:
+        product_ids = list(product_ids)
+        if not product_ids:
+            return {}
+
+        pipe = self.redis.pipeline(transaction=False)
+        pipe.hmget(PENDING_KEY, product_ids)
+        pipe.hmget(FLUSHING_KEY, product_ids)
+        pending, flushing = pipe.execute()
+        return {
+            product_id: int(new or 0) + int(in_flight or 0)
+            for product_id, new, in_flight in zip(product_ids, pending, flushing)
+        }
+
+    def flush(self) -> Dict[int, int]:
+        """Writes buffered views to the database and returns the flushed counts."""
+        lock = self.redis.lock(FLUSH_LOCK_KEY, timeout=300)
+        if not lock.acquire(blocking=False):
+            logger.info("Another worker is flushing product views")
+            return {}
+        try:
+            return self._flush()
+        finally:
+            lock.release()
+
+    def _flush(self) -> Dict[int, int]:
+        # A leftover hash means the previous flush died halfway: retry it
+        # before taking new views.
+        if not self.redis.exists(FLUSHING_KEY):
+            try:
+                self.redis.rename(PENDING_KEY, FLUSHING_KEY)
+            except ResponseError:
+                return {}
+
+        counts = {
+            int(product_id): int(views)
+            for product_id, views in self.redis.hgetall(FLUSHING_KEY).items()
+        }
+        items = list(counts.items())
+        with transaction.atomic():
+            for start in range(0, len(items), self.batch_size):
+                batch = items[start : start + self.batch_size]
+                Product.objects.filter(
+                    id__in=[product_id for product_id, _ in batch]
+                ).update(
+                    views_count=F("views_count")
+                    + Case(
+                        *[
+                            When(id=product_id, then=Value(views))
+                            for product_id, views in batch
+                        ],
+                        default=Value(0),
+                        output_field=IntegerField(),
+                    )
+                )
+
+        self.redis.delete(FLUSHING_KEY)
+        ProductDetailCache().invalidate(counts)
+        logger.info(f"Flushed {sum(counts.values())} views of {len(counts)} products")
+        return counts
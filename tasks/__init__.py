@@ -1,8 +1,33 @@
 from .image_processing import download_product_images
-from .tasks import process_all_feeds, process_feed
+from .tasks import (
+    flush_product_views,
+    generate_partner_feed,
+    process_all_feeds,
+    process_feed,
+    prune_feed_snapshots,
+    rebuild_category_facets,
+    rebuild_product_bitmap_index,
+    rebuild_suggestions,
+    rebuild_views_leaderboard,
+    reconcile_stats,
+    refresh_category_facets,
+    update_product_bitmap_index,
+    update_suggestions,
+)
 
 __all__ = [
     "process_all_feeds",
     "process_feed",
+    "flush_product_views",
+    "refresh_category_facets",
+    "rebuild_category_facets",
+    "update_product_bitmap_index",
+    "rebuild_product_bitmap_index",
+    "update_suggestions",
+    "rebuild_suggestions",
+    "rebuild_views_leaderboard",
+    "reconcile_stats",
+    "prune_feed_snapshots",
+    "generate_partner_feed",
     "download_product_images",
 ]
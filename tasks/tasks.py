@@ -1,14 +1,25 @@
 import logging
 import tempfile
+from typing import List
 
 import requests
 from celery import group, shared_task
+from django.conf import settings
 from django.core.exceptions import ObjectDoesNotExist
 from django.db import transaction
 from django.utils import timezone
 
 from main.models import FeedSource, Product
 from services.feed.core.manager import FeedManager
+from services.feed.core.report import FeedRunStats
+from services.feed.generator import RozetkaFeedGenerator
+from services.feed.snapshot import prune_snapshots
+from services.product.bitmap_index import ProductBitmapIndex
+from services.product.facets import FacetEngine
+from services.product.leaderboard import ViewsLeaderboard
+from services.product.stats import ProductStats
+from services.product.suggestions import SuggestionIndex
+from services.product.views_counter import ViewsCounter
 
 logger = logging.getLogger(__name__)
 
@@ -46,3 +57,65 @@ def process_all_feeds():
     result = tasks.apply_async()
 
     return {"dispatched_tasks": len(result.results)}
+
+
+@shared_task
+def flush_product_views():
+    flushed = ViewsCounter().flush()
+    return {"products": len(flushed), "views": sum(flushed.values())}
+
+
+@shared_task
+def refresh_category_facets(category_ids: List[int]):
+    facets = FacetEngine.refresh(category_ids)
+    return {"categories": len(category_ids), "facets": facets}
+
+
+@shared_task
+def rebuild_category_facets():
+    return {"facets": FacetEngine.build()}
+
+
+@shared_task
+def update_product_bitmap_index(product_ids: List[int]):
+    changed = ProductBitmapIndex().update(product_ids)
+    return {"products": len(product_ids), "bitmaps": changed}
+
+
+@shared_task
+def rebuild_product_bitmap_index():
+    return {"bitmaps": ProductBitmapIndex().build()}
+
+
+@shared_task
+def update_suggestions(product_ids: List[int], category_ids: List[int]):
+    SuggestionIndex().update(product_ids, category_ids)
+    return {"products": len(product_ids), "categories": len(category_ids)}
+
+
+@shared_task
+def rebuild_suggestions():
+    return {"entries": SuggestionIndex().build()}
+
+
+@shared_task
+def rebuild_views_leaderboard():
+    return {"products": ViewsLeaderboard().build()}
+
+
+@shared_task
+def reconcile_stats():
+    return {
+        "categories": ProductStats().reconcile(),
+        "feeds": FeedRunStats().reconcile(),
+    }
+
+
+@shared_task
+def prune_feed_snapshots():
+    return {"snapshots": prune_snapshots(settings.FEED_SNAPSHOT_RETENTION_DAYS)}
+
+
+@shared_task
+def generate_partner_feed():
+    return RozetkaFeedGenerator().generate()
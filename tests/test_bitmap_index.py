@@ -0,0 +1,83 @@
+import pytest
+from model_bakery import baker
+from rest_framework.test import APIClient
+
+from main.models import Category
+from services.product.bitmap_index import Bitmap, ProductBitmapIndex
+
+
+def test_bitmap_operations_across_containers():
+    left = Bitmap.from_ids([1, 5, 70000, 140000])
+    right = Bitmap.from_ids([5, 70000, 200000])
+
+    assert list((left & right).iter_after()) == [5, 70000]
+    assert list((left | right).iter_after(5)) == [70000, 140000, 200000]
+    assert list((left - right).iter_after()) == [1, 140000]
+    assert len(left) == 4 and 140000 in left and 2 not in left
+
+    restored = Bitmap.from_bytes(left.to_bytes())
+    assert list(restored.iter_after()) == [1, 5, 70000, 140000]
+
+    assert left.discard(Bitmap.from_ids([1, 3]))
+    assert not left.discard(Bitmap.from_ids([3]))
+    assert list(left.iter_after()) == [5, 70000, 140000]
+
+
+def test_bitmap_switches_between_array_and_bitset_containers():
+    dense = Bitmap.from_ids(range(1, 10001))
+    sparse = Bitmap.from_ids([3, 9999, 20000, 70001])
+    assert isinstance(dense.containers[0], int)
+    assert not isinstance(sparse.containers[0], int)
+
+    assert list((dense & sparse).iter_after()) == [3, 9999]
+    assert len(dense | sparse) == 10002
+    assert len(dense - sparse) == 9998
+    assert not isinstance(
+        (dense - Bitmap.from_ids(range(10, 10001))).containers[0], int
+    )
+    assert list((sparse - dense).iter_after()) == [20000, 70001]
+    assert list(sparse.iter_after(9999)) == [20000, 70001]
+    assert 70001 in sparse and 70002 not in sparse
+
+    restored = Bitmap.from_bytes((dense | sparse).to_bytes())
+    assert list(restored.iter_after(9998)) == [9999, 10000, 20000, 70001]
+
+
+@pytest.mark.django_db
+def test_index_filters_category_subtree_and_attributes(django_assert_num_queries):
+    parent = baker.make("main.Category", is_active=True)
+    child = baker.make("main.Category", parent=parent, is_active=True)
+    Category.objects.rebuild()
+    color = baker.make("main.Attribute", label="color")
+    red = baker.make("main.AttributeValue", attribute=color, title="Red")
+
+    in_parent = baker.make("main.Product", category=parent, is_active=True)
+    in_child = baker.make("main.Product", category=child, is_active=True)
+    baker.make("main.Product", category=child, is_active=False)
+    for product in (in_parent, in_child):
+        baker.make("main.ProductAttribute", product=product, attribute=color, value=red)
+
+    index = ProductBitmapIndex()
+    index.build()
+    matched = index.filter([(color.id, [red.id])], category_id=parent.id)
+    assert list(matched.iter_after()) == [in_parent.id, in_child.id]
+
+    loaded = index._bitmaps()
+    with django_assert_num_queries(0):
+        index.filter([(color.id, [red.id])], category_id=parent.id)
+
+    in_child.is_active = False
+    in_child.save()
+    index.update([in_child.id])
+    matched = index.filter([(color.id, [red.id])], category_id=parent.id)
+    assert list(matched.iter_after()) == [in_parent.id]
+    reloaded = index._bitmaps()
+    assert reloaded[index.ACTIVE_KEY] is not loaded[index.ACTIVE_KEY]
+    assert reloaded[index.value_key(red.id)] is loaded[index.value_key(red.id)]
+
+    client = APIClient()
+    response = client.get(
+        f"/uk/api/v1/products/indexed/?category={parent.id}&attrs=color:Red"
+    )
+    assert response.data["count"] == 1
+    assert [item["id"] for item in response.data["results"]] == [in_parent.id]
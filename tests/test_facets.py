@@ -0,0 +1,102 @@
+import pytest
+from model_bakery import baker
+from rest_framework.test import APIClient
+
+from main.models import CategoryAttributeConfig
+from services.product.facets import FacetEngine
+from tasks.tasks import refresh_category_facets
+
+
+@pytest.fixture
+def catalog():
+    category = baker.make("main.Category", is_active=True)
+    color = baker.make("main.Attribute", label="color", title="Color")
+    size = baker.make("main.Attribute", label="size", title="Size")
+    weight = baker.make("main.Attribute", label="weight", title="Weight")
+    for sort_order, attribute in enumerate([color, size]):
+        baker.make(
+            "main.CategoryAttributeConfig",
+            category=category,
+            attribute=attribute,
+            is_filterable=True,
+            sort_order=sort_order,
+        )
+    baker.make(
+        "main.CategoryAttributeConfig",
+        category=category,
+        attribute=weight,
+        is_filterable=False,
+        sort_order=2,
+    )
+
+    values = {
+        title: baker.make("main.AttributeValue", attribute=attribute, title=title)
+        for attribute, title in [
+            (color, "Red"),
+            (color, "Blue"),
+            (size, "M"),
+            (size, "L"),
+            (weight, "1kg"),
+        ]
+    }
+    for product_values in [("Red", "M"), ("Red", "L"), ("Blue", "M"), ("Red", "1kg")]:
+        product = baker.make("main.Product", category=category, is_active=True)
+        for title in product_values:
+            value = values[title]
+            baker.make(
+                "main.ProductAttribute",
+                product=product,
+                attribute=value.attribute,
+                value=value,
+            )
+    return category
+
+
+def _counts(facets):
+    return {
+        facet["label"]: {value["title"]: value["count"] for value in facet["values"]}
+        for facet in facets
+    }
+
+
+@pytest.mark.django_db
+def test_refresh_stores_counts_of_filterable_attributes(catalog):
+    assert FacetEngine.refresh([catalog.id]) == 4
+
+    assert _counts(FacetEngine(catalog).facets([])) == {
+        "color": {"Red": 3, "Blue": 1},
+        "size": {"M": 2, "L": 1},
+    }
+
+
+@pytest.mark.django_db
+def test_build_and_config_changes_refresh_stored_counts(
+    catalog, django_capture_on_commit_callbacks, monkeypatch
+):
+    monkeypatch.setattr(refresh_category_facets, "delay", refresh_category_facets)
+    assert FacetEngine.build() == 4
+
+    config = CategoryAttributeConfig.objects.get(
+        category=catalog, attribute__label="weight"
+    )
+    config.is_filterable = True
+    with django_capture_on_commit_callbacks(execute=True):
+        config.save()
+
+    assert _counts(FacetEngine(catalog).facets([]))["weight"] == {"1kg": 1}
+
+
+@pytest.mark.django_db
+def test_facets_count_each_attribute_against_the_other_filters(catalog):
+    client = APIClient()
+    response = client.get(
+        f"/uk/api/v1/products/facets/?category={catalog.id}&attrs=size:M"
+    )
+
+    assert response.status_code == 200
+    assert _counts(response.data) == {
+        "color": {"Red": 1, "Blue": 1},
+        "size": {"M": 2, "L": 1},
+    }
+    size = next(facet for facet in response.data if facet["label"] == "size")
+    assert [value["selected"] for value in size["values"]] == [True, False]
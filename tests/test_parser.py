@@ -1,6 +1,10 @@
+from types import SimpleNamespace
+
 import pytest
 
+from services.feed.parser.parallel import ParallelRozetkaFeedParser
 from services.feed.parser.rozetka import RozetkaFeedParser
+from services.feed.parser.types import FrozenFeedOffer, iter_attributes
 
 
 @pytest.mark.django_db
@@ -36,3 +40,64 @@ def sample_feed_content():
       </shop>
     </yml_catalog>
     """
+
+
+def test_parallel_parser_matches_sequential_parser(tmp_path, monkeypatch):
+    offers = "".join(f"""
+          <offer id="{i}" available="true">
+            <name>Товар {i}</name>
+            <price>{100 + i}</price>
+            <categoryId>1</categoryId>
+            <param name="Колір">Чорний</param>
+          </offer>""" for i in range(1, 41))
+    content = f"""<?xml version="1.0" encoding="utf-8"?>
+    <yml_catalog date="2024-01-01 00:00">
+      <shop>
+        <name>Test Shop</name>
+        <categories>
+          <category id="1">Смартфони</category>
+        </categories>
+        <offers>{offers}
+        </offers>
+      </shop>
+    </yml_catalog>
+    """
+    feed_path = tmp_path / "feed.xml"
+    feed_path.write_text(content, encoding="utf-8")
+
+    expected = RozetkaFeedParser(content).parse()
+    parser = ParallelRozetkaFeedParser(feed_path, workers=2, chunk_size=512)
+
+    assert len(parser._split_offer_ranges(feed_path.read_bytes())) > 1
+    assert parser.parse() == expected
+
+    # Celery prefork workers are daemonic and cannot start a pool.
+    monkeypatch.setattr(
+        "services.feed.parser.parallel.multiprocessing.current_process",
+        lambda: SimpleNamespace(daemon=True),
+    )
+    monkeypatch.setattr("services.feed.parser.parallel.ProcessPoolExecutor", None)
+    assert parser.parse() == expected
+
+
+def test_compact_parser_returns_frozen_offers():
+    content = """
+    <yml_catalog>
+      <shop>
+        <offers>
+          <offer id="1">
+            <name>Футболка</name>
+            <price>300</price>
+            <param name="Розмір">M</param>
+            <param name="Розмір">L</param>
+            <param name="Колір">Білий</param>
+          </offer>
+        </offers>
+      </shop>
+    </yml_catalog>
+    """
+    _, _, offers = RozetkaFeedParser(content, compact=True).parse()
+
+    assert isinstance(offers[0], FrozenFeedOffer)
+    assert offers[0].attributes == (("Розмір", ("M", "L")), ("Колір", "Білий"))
+    assert dict(iter_attributes(offers[0].attributes))["Колір"] == "Білий"
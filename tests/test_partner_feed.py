@@ -0,0 +1,68 @@
+import pytest
+from model_bakery import baker
+
+from main.models import Product
+from services.feed.generator import RozetkaFeedGenerator
+from services.feed.parser.rozetka import RozetkaFeedParser
+
+
+@pytest.mark.django_db
+def test_partner_feed_round_trips_and_rewrites_only_changed_shards(tmp_path):
+    phones = baker.make("main.Category", is_active=True, title="Phones")
+    laptops = baker.make("main.Category", is_active=True, title="Laptops")
+    phone = baker.make(
+        "main.Product",
+        category=phones,
+        is_active=True,
+        status=Product.Status.ACTIVE,
+        name="Phone & Case",
+        price="100.50",
+        stock_quantity=3,
+    )
+    baker.make(
+        "main.ProductAttribute",
+        product=phone,
+        attribute__title="Колір",
+        value__title="Чорний",
+    )
+    baker.make(
+        "main.Product",
+        category=laptops,
+        is_active=True,
+        status=Product.Status.ACTIVE,
+        _quantity=2,
+    )
+    baker.make("main.Product", category=phones, status=Product.Status.DRAFT)
+    generator = RozetkaFeedGenerator(root=str(tmp_path))
+
+    result = generator.generate()
+    assert (result["categories"], result["regenerated"], result["offers"]) == (2, 2, 3)
+
+    _, categories, offers = RozetkaFeedParser(generator.path.read_text()).parse()
+    assert {category.name for category in categories} >= {"Phones", "Laptops"}
+    offer = next(offer for offer in offers if offer.external_id == str(phone.id))
+    assert offer.name == "Phone & Case"
+    assert str(offer.price) == "100.50"
+    assert offer.category_id == str(phones.id)
+    assert offer.attributes == {"Колір": "Чорний"}
+    assert len(offers) == 3
+
+    assert generator.generate()["regenerated"] == 0
+
+    phone.price = 90
+    phone.save()
+    assert generator.generate()["regenerated"] == 1
+
+    baker.make("main.ProductImage", product=phone, image="products/phone.jpg")
+    assert generator.generate()["regenerated"] == 1
+    color = phone.product_attributes.get().attribute
+    color.title = "Колір корпусу"
+    color.save()
+    assert generator.generate()["regenerated"] == 1
+
+    laptops.is_active = False
+    laptops.save()
+    result = generator.generate()
+    assert (result["regenerated"], result["removed"], result["offers"]) == (0, 1, 1)
+    _, _, offers = RozetkaFeedParser(generator.path.read_text()).parse()
+    assert [offer.external_id for offer in offers] == [str(phone.id)]
@@ -0,0 +1,54 @@
+import gzip
+import io
+import uuid
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import pytest
+from django.utils.translation import gettext_lazy
+from model_bakery import baker
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from api.v1.parsers import FastJSONParser
+from api.v1.renderers import FastJSONRenderer
+
+
+def test_fast_json_renderer_matches_json_renderer():
+    data = {
+        "price": Decimal("12.50"),
+        "created": datetime(2025, 1, 2, 3, 4, 5, 123456, tzinfo=timezone.utc),
+        "title": gettext_lazy("Active"),
+        "uuid": uuid.UUID(int=1),
+        "name": "Смартфон ",
+        1: None,
+    }
+
+    assert FastJSONRenderer().render(data) == JSONRenderer().render(data)
+    assert FastJSONParser().parse(io.BytesIO(b'{"a": [1, "\xd1\x97"]}')) == {
+        "a": [1, "ї"]
+    }
+
+
+@pytest.mark.django_db
+def test_large_responses_are_compressed_when_accepted(settings):
+    settings.RESPONSE_COMPRESSION_MIN_LENGTH = 100
+    baker.make("main.Product", _quantity=5, is_active=True)
+    client = APIClient()
+
+    plain = client.get("/uk/api/v1/products/")
+    assert not plain.has_header("Content-Encoding")
+
+    response = client.get("/uk/api/v1/products/", HTTP_ACCEPT_ENCODING="br;q=0, gzip")
+    assert response["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in response["Vary"]
+    assert gzip.decompress(response.content) == plain.content
+
+    response = client.get("/uk/api/v1/products/", HTTP_ACCEPT_ENCODING="gzip;q=0")
+    assert not response.has_header("Content-Encoding")
+
+    # Pages that carry CSRF tokens are never compressed.
+    for url in ("/uk/api/v1/products/?format=api", "/uk/admin/login/"):
+        response = client.get(url, HTTP_ACCEPT_ENCODING="gzip")
+        assert len(response.content) >= 100
+        assert not response.has_header("Content-Encoding")
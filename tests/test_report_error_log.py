@@ -0,0 +1,27 @@
+import pytest
+from model_bakery import baker
+
+from services.feed.core.report import ReportErrorLog
+
+
+@pytest.mark.django_db
+def test_error_log_groups_messages_and_caps_groups():
+    report = baker.make("main.FeedParsingReport")
+    error_log = ReportErrorLog(report, max_groups=2, max_samples=2)
+
+    for i in range(5):
+        error_log.add(f"a{i}", "value too long")
+    error_log.flush()
+    error_log.add("b0", "invalid price")
+    error_log.add("a5", "value too long")
+    error_log.add("c0", "unknown category")
+    error_log.add("d0", "duplicate key")
+    error_log.close()
+
+    items = {item.error_message: item for item in report.items.all()}
+    assert items["value too long"].occurrences == 6
+    assert items["value too long"].sample_external_ids == ["a0", "a1"]
+    assert items["invalid price"].occurrences == 1
+    assert len(items) == 3
+    assert report.items.first().error_message == "value too long"
+    assert report.items.get(product_external_id="").occurrences == 2
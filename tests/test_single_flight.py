@@ -0,0 +1,70 @@
+import pytest
+from django_redis import get_redis_connection
+from model_bakery import baker
+from rest_framework.test import APIClient
+
+from services.cache.single_flight import METRICS_KEY, SingleFlight
+
+
+@pytest.fixture
+def single_flight():
+    redis = get_redis_connection("default")
+    redis.delete(METRICS_KEY, "single_flight:lock:test-key")
+    yield SingleFlight("test", lease=5, wait=1, poll_interval=0.01)
+    redis.delete(METRICS_KEY, "single_flight:lock:test-key")
+
+
+def test_single_flight_coalesces_while_leader_holds_the_lock(single_flight):
+    computed = []
+
+    def compute():
+        computed.append(1)
+        return "fresh"
+
+    lock = single_flight.redis.lock("single_flight:lock:test-key", timeout=5)
+    assert lock.acquire(blocking=False)
+    try:
+        assert single_flight.run("test-key", compute, lambda: None, stale="old") == (
+            "old",
+            "stale",
+        )
+        assert single_flight.run("test-key", compute, lambda: "shared") == (
+            "shared",
+            "coalesced",
+        )
+        assert computed == []
+    finally:
+        lock.release()
+
+    assert single_flight.run("test-key", compute, lambda: None) == ("fresh", "leader")
+    assert computed == [1]
+    assert SingleFlight.metrics()["test"] == {
+        "leader": 1,
+        "stale": 1,
+        "coalesced": 1,
+        "fallback": 0,
+    }
+
+
+def test_single_flight_falls_back_when_leader_gives_up(single_flight):
+    lock = single_flight.redis.lock("single_flight:lock:test-key", timeout=1)
+    assert lock.acquire(blocking=False)
+
+    assert single_flight.run("test-key", lambda: "own", lambda: None) == (
+        "own",
+        "fallback",
+    )
+
+
+@pytest.mark.django_db
+def test_stats_endpoint_is_served_from_cache():
+    baker.make("main.Product", _quantity=2)
+    client = APIClient()
+
+    first = client.get("/uk/api/v1/stats/products/counts/")
+    assert first["X-Cache"] == "MISS"
+    assert first.data["total"] == 2
+
+    second = client.get("/uk/api/v1/stats/products/counts/")
+    assert second["X-Cache"] == "HIT"
+    assert second.data == first.data
@@ -0,0 +1,210 @@
+import mmap
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+import pytest
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.utils import timezone
+from model_bakery import baker
+
+from main.models import Attribute, FeedParsingReport, Product
+from services.feed.core.manager import FeedManager
+from services.feed.exceptions import FeedParsingError
+from services.feed.parser.types import FeedCategory, FeedOffer, ShopInfo
+from services.feed.snapshot import (
+    FOOTER,
+    MAGIC,
+    FeedSnapshotReader,
+    prune_snapshots,
+    write_snapshot,
+)
+
+
+@pytest.fixture
+def parsed_feed():
+    shop_info = ShopInfo(
+        name="Test Shop",
+        company="Test Company",
+        url="http://example.com",
+        date=datetime(2024, 1, 1),
+    )
+    categories = [FeedCategory(external_id="1", name="Смартфони")]
+    offers = [
+        FeedOffer(
+            external_id=str(i),
+            available=True,
+            url="http://example.com/product",
+            price=Decimal("5000.50"),
+            currency="UAH",
+            category_id="1",
+            name=f"Тестовий смартфон {i}",
+            attributes={"Колір": ["Чорний", "Білий"]},
+        )
+        for i in range(3)
+    ]
+    return shop_info, categories, offers
+
+
+def test_snapshot_round_trip(tmp_path, parsed_feed):
+    shop_info, categories, offers = parsed_feed
+    path = tmp_path / "feed.snapshot"
+    with open(path, "wb") as f:
+        write_snapshot(f, shop_info, categories, offers)
+
+    with FeedSnapshotReader(path) as snapshot:
+        assert snapshot.offers_count == 3
+        assert snapshot.read() == (
+            shop_info,
+            categories,
+            [offer.freeze() for offer in offers],
+        )
+
+
+def test_invalid_snapshot_is_rejected_and_unmapped(tmp_path, monkeypatch):
+    mapped = []
+
+    class TrackedMap(mmap.mmap):
+        def __new__(cls, *args, **kwargs):
+            data = super().__new__(cls, *args, **kwargs)
+            mapped.append(data)
+            return data
+
+    monkeypatch.setattr("services.feed.snapshot.mmap.mmap", TrackedMap)
+    contents = [
+        b"",
+        b"<yml_catalog/>" * 4,
+        MAGIC + b"garbage" + FOOTER.pack(len(MAGIC), 7) + MAGIC,
+    ]
+    for index, content in enumerate(contents):
+        path = tmp_path / f"{index}.snapshot"
+        path.write_bytes(content)
+        with pytest.raises(FeedParsingError):
+            FeedSnapshotReader(path)
+
+    assert len(mapped) == 2
+    assert all(data.closed for data in mapped)
+
+
+@pytest.mark.django_db
+def test_replay_snapshot_upserts_products(tmp_path, parsed_feed):
+    feed_source = baker.make("main.FeedSource")
+    baker.make("main.Category", title="Смартфони", is_active=True)
+    missing = baker.make(
+        "main.Product", feed_source=feed_source, external_id="missing", is_active=True
+    )
+    path = tmp_path / "feed.snapshot"
+    with open(path, "wb") as f:
+        write_snapshot(f, *parsed_feed)
+
+    report = FeedManager(feed_source).replay_snapshot(path)
+
+    assert report.products_added == 3
+    assert Product.objects.filter(feed_source=feed_source).count() == 4
+    archived = Product.objects.get(id=missing.id)
+    assert archived.status == Product.Status.ARCHIVED
+    assert archived.modified > missing.modified
+
+
+@pytest.mark.django_db
+def test_diff_feed_reports_changes_without_writing(tmp_path, parsed_feed):
+    feed_source = baker.make("main.FeedSource")
+    category = baker.make("main.Category", title="Смартфони", is_active=True)
+    baker.make(
+        "main.Product",
+        feed_source=feed_source,
+        external_id="0",
+        category=category,
+        price=Decimal("100"),
+    )
+    baker.make(
+        "main.Product",
+        feed_source=feed_source,
+        external_id="gone",
+        category=category,
+        is_active=True,
+        status=Product.Status.ACTIVE,
+    )
+    path = tmp_path / "feed.snapshot"
+    with open(path, "wb") as f:
+        write_snapshot(f, *parsed_feed)
+
+    diff = FeedManager(feed_source).diff_feed(path)
+
+    assert sorted(diff.to_add) == ["1", "2"]
+    assert "price" in diff.to_update["0"]
+    assert diff.to_archive == ["gone"]
+    assert diff.categories["Смартфони"].added == 2
+    assert diff.categories["Смартфони"].archived == 1
+    assert Product.objects.filter(feed_source=feed_source).count() == 2
+
+
+@pytest.mark.django_db
+def test_diff_feed_resolves_categories_and_attributes_like_the_import(
+    tmp_path, parsed_feed
+):
+    cache.delete_pattern("category_match_*")
+    cache.delete_pattern("attr_*")
+    shop_info, _, offers = parsed_feed
+    feed_source = baker.make("main.FeedSource")
+    category = baker.make(
+        "main.Category", title="Смартфони", keywords=["смартфон"], is_active=True
+    )
+    color = baker.make("main.Attribute", title="Колір", is_active=True)
+    product = baker.make(
+        "main.Product",
+        feed_source=feed_source,
+        external_id="0",
+        category=category,
+        name=offers[0].name,
+        price=offers[0].price,
+        currency="UAH",
+        available=True,
+        url=offers[0].url,
+        vendor="",
+        article="",
+        description="",
+        stock_quantity=0,
+        status=Product.Status.DRAFT,
+    )
+    for title in ("Чорний", "Білий"):
+        baker.make(
+            "main.ProductAttribute",
+            product=product,
+            attribute=color,
+            value=baker.make(
+                "main.AttributeValue", attribute=color, title=title, is_active=True
+            ),
+        )
+    offers[0].attributes = {"Колір": ["Чорний", "Білий", "Синій"], "Вага": "150 г"}
+    path = tmp_path / "feed.snapshot"
+    with open(path, "wb") as f:
+        write_snapshot(f, shop_info, [FeedCategory("1", "Телефони")], offers)
+
+    diff = FeedManager(feed_source).diff_feed(path)
+
+    assert "0" not in diff.to_update
+    assert diff.attribute_changes["0"] == [("Вага", "150 г"), ("Колір", "Синій")]
+    assert diff.categories["Смартфони"].added == 2
+    assert diff.categories["Смартфони"].unchanged == 1
+    assert not Attribute.objects.filter(title="Вага").exists()
+
+
+@pytest.mark.django_db
+def test_prune_snapshots_removes_only_expired_files(settings, tmp_path):
+    settings.MEDIA_ROOT = str(tmp_path)
+    old, recent = baker.make("main.FeedParsingReport", _quantity=2)
+    for report in (old, recent):
+        report.snapshot.save(f"feed_{report.id}.snapshot", ContentFile(b"data"))
+    FeedParsingReport.objects.filter(id=old.id).update(
+        started_at=timezone.now() - timedelta(days=15)
+    )
+    old_name = old.snapshot.name
+
+    assert prune_snapshots(14) == 1
+    old.refresh_from_db()
+    recent.refresh_from_db()
+    assert not old.snapshot
+    assert not (tmp_path / old_name).exists()
+    assert recent.snapshot and (tmp_path / recent.snapshot.name).exists()
+    assert prune_snapshots(14) == 0
@@ -0,0 +1,147 @@
+import pytest
+from django.db import transaction
+from django.utils import timezone
+from model_bakery import baker
+from rest_framework.test import APIClient
+
+from main.models import (
+    Category,
+    CategoryProductCount,
+    FeedParsingReport,
+    FeedRunSummary,
+    Product,
+)
+from services.feed.core.report import FeedRunStats
+from services.product.stats import ProductStats, deferred_product_stats
+
+
+def category_counts(category):
+    return CategoryProductCount.objects.values(
+        "product_count", "active_count", "draft_count", "archived_count"
+    ).get(category=category)
+
+
+@pytest.mark.django_db
+def test_product_counters_follow_product_writes():
+    phones = baker.make("main.Category", title="Phones")
+    laptops = baker.make("main.Category", title="Laptops")
+    phone = baker.make("main.Product", category=phones, status=Product.Status.ACTIVE)
+    baker.make("main.Product", category=phones, status=Product.Status.DRAFT)
+
+    assert ProductStats.status_counts() == {
+        "total": 2,
+        "active": 1,
+        "draft": 1,
+        "archived": 0,
+    }
+
+    phone.category = laptops
+    phone.status = Product.Status.ARCHIVED
+    phone.save()
+
+    assert category_counts(phones) == {
+        "product_count": 1,
+        "active_count": 0,
+        "draft_count": 1,
+        "archived_count": 0,
+    }
+    assert category_counts(laptops) == {
+        "product_count": 1,
+        "active_count": 0,
+        "draft_count": 0,
+        "archived_count": 1,
+    }
+
+    phone.delete()
+    assert ProductStats.status_counts()["total"] == 1
+    assert category_counts(laptops)["product_count"] == 0
+
+    expected = ProductStats.status_counts()
+    ProductStats().reconcile()
+    assert ProductStats.status_counts() == expected
+    assert ProductStats.popular_categories() == [
+        {"id": phones.id, "title": "Phones", "product_count": 1}
+    ]
+
+
+@pytest.mark.django_db
+def test_deferred_product_counters_are_applied_once_in_the_transaction():
+    category = baker.make("main.Category")
+    feed = baker.make("main.FeedSource")
+
+    with transaction.atomic():
+        with deferred_product_stats():
+            for index in range(5):
+                Product.objects.create(
+                    feed_source=feed,
+                    external_id=str(index),
+                    vendor="Vendor",
+                    name=f"Product {index}",
+                    price=10,
+                    category=category,
+                )
+            assert not CategoryProductCount.objects.filter(category=category).exists()
+        assert category_counts(category)["draft_count"] == 5
+
+    assert category_counts(category)["draft_count"] == 5
+
+
+@pytest.mark.django_db
+def test_feed_run_summary_follows_reports():
+    feed = baker.make("main.FeedSource", name="Main feed")
+    report = baker.make(
+        "main.FeedParsingReport", feed=feed, status=FeedParsingReport.Status.STARTED
+    )
+    finished_at = timezone.now()
+    report.status = FeedParsingReport.Status.SUCCESS
+    report.finished_at = finished_at
+    report.save()
+    baker.make(
+        "main.FeedParsingReport",
+        feed=feed,
+        status=FeedParsingReport.Status.ERROR,
+        finished_at=finished_at,
+    )
+
+    summary = FeedRunSummary.objects.get(feed=feed)
+    assert (summary.total, summary.success, summary.error) == (2, 1, 1)
+    assert summary.last_success_at == finished_at
+
+    FeedRunStats().reconcile()
+    response = APIClient().get("/uk/api/v1/stats/feeds/summary/")
+    row = next(item for item in response.data if item["feed_id"] == feed.id)
+    assert (row["total"], row["success"], row["error"]) == (2, 1, 1)
+
+
+@pytest.mark.django_db
+def test_category_active_counts_roll_up_to_ancestors():
+    root = baker.make("main.Category", title="Electronics")
+    child = baker.make("main.Category", title="Phones", parent=root)
+    other = baker.make("main.Category", title="Books")
+    Category.objects.rebuild()
+
+    phone = baker.make(
+        "main.Product", category=child, status=Product.Status.ACTIVE, is_active=True
+    )
+    baker.make(
+        "main.Product", category=child, status=Product.Status.DRAFT, is_active=True
+    )
+
+    counts = dict(
+        Category.objects.filter(id__in=[root.id, child.id, other.id]).values_list(
+            "id", "active_product_count"
+        )
+    )
+    assert counts == {root.id: 1, child.id: 1, other.id: 0}
+    assert Category.objects.get(id=root.id).has_active_products
+
+    phone.is_active = False
+    phone.save()
+
+    root.refresh_from_db()
+    assert (root.active_product_count, root.has_active_products) == (0, False)
+
+    Category.objects.filter(id=root.id).update(active_product_count=5)
+    assert ProductStats().reconcile_active_counts() == 1
+    root.refresh_from_db()
+    assert root.active_product_count == 0
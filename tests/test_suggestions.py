@@ -0,0 +1,78 @@
+import pytest
+from model_bakery import baker
+from rest_framework.test import APIClient
+
+from main.models import Product
+from services.product.suggestions import SuggestionIndex
+
+
+@pytest.mark.django_db
+def test_suggestions_match_word_prefixes_ranked_by_views(monkeypatch):
+    category = baker.make("main.Category", is_active=True, title="Smartphones")
+    popular = baker.make(
+        "main.Product",
+        category=category,
+        is_active=True,
+        status=Product.Status.ACTIVE,
+        name="Samsung Galaxy S24",
+        vendor="Samsung",
+        views_count=50,
+    )
+    other = baker.make(
+        "main.Product",
+        category=category,
+        is_active=True,
+        status=Product.Status.ACTIVE,
+        name="Samsung Galaxy A15",
+        vendor="Samsung",
+        views_count=5,
+    )
+    baker.make(
+        "main.Product",
+        is_active=True,
+        status=Product.Status.DRAFT,
+        name="Samsung draft",
+        vendor="Samsung",
+    )
+    SuggestionIndex().build()
+    client = APIClient()
+
+    response = client.get("/uk/api/v1/suggest/?q=sam")
+    assert response.data == [
+        {"type": "vendor", "id": None, "text": "Samsung"},
+        {"type": "product", "id": popular.id, "text": "Samsung Galaxy S24"},
+        {"type": "product", "id": other.id, "text": "Samsung Galaxy A15"},
+    ]
+
+    response = client.get("/uk/api/v1/suggest/?q=galaxy a1")
+    assert [item["id"] for item in response.data] == [other.id]
+
+    response = client.get("/uk/api/v1/suggest/?q=smart")
+    assert response.data == [
+        {"type": "category", "id": category.id, "text": "Smartphones"}
+    ]
+
+    popular.status = Product.Status.ARCHIVED
+    popular.save()
+    SuggestionIndex().update([popular.id])
+    response = client.get("/uk/api/v1/suggest/?q=s24")
+    assert response.data == []
+
+    # A rebuild fills a new namespace while lookups keep reading the old one.
+    index = SuggestionIndex()
+    index_categories = SuggestionIndex._index_categories
+    previous = index._version()
+
+    def index_categories_during_build(self, version, categories):
+        assert version != previous
+        assert [item["text"] for item in self.suggest("smart")] == ["Smartphones"]
+        return index_categories(self, version, categories)
+
+    monkeypatch.setattr(
+        SuggestionIndex, "_index_categories", index_categories_during_build
+    )
+    index.build()
+    assert index._version() != previous
+    assert not list(index.redis.scan_iter(match=f"suggest:{previous}:*"))
+    response = client.get("/uk/api/v1/suggest/?q=galaxy")
+    assert [item["id"] for item in response.data] == [other.id]
@@ -1,7 +1,15 @@
+import gzip
+import json
+
 import pytest
 from model_bakery import baker
 from rest_framework.test import APIClient
 
+from main.models import Category, Product
+from services.cache.generations import CacheGenerations, category_scope
+from services.product.leaderboard import ALL_TIME_KEY, ViewsLeaderboard
+from services.product.views_counter import ViewsCounter
+
 
 @pytest.mark.django_db
 def test_product_list_view():
@@ -49,3 +57,466 @@ def test_popular_categories_view_returns_sorted_results():
         {"id": category1.id, "title": category1.title, "product_count": 2},
         {"id": category2.id, "title": category2.title, "product_count": 1},
     ]
+
+
+@pytest.mark.django_db
+def test_product_detail_view_buffers_views_until_flush():
+    product = baker.make("main.Product", is_active=True, views_count=5)
+    client = APIClient()
+
+    client.get(f"/uk/api/v1/products/{product.id}/")
+    response = client.get(f"/uk/api/v1/products/{product.id}/")
+
+    assert response.data["views_count"] == 7
+    product.refresh_from_db()
+    assert product.views_count == 5
+
+    flushed = ViewsCounter().flush()
+
+    assert flushed[product.id] == 2
+    product.refresh_from_db()
+    assert product.views_count == 7
+    response = client.get(f"/uk/api/v1/products/{product.id}/")
+    assert response.data["views_count"] == 8
+
+
+@pytest.mark.django_db
+def test_product_detail_view_serves_cached_payload_with_etag(
+    django_capture_on_commit_callbacks,
+):
+    product = baker.make("main.Product", is_active=True, name="Old name")
+    client = APIClient()
+    url = f"/uk/api/v1/products/{product.id}/"
+
+    response = client.get(url)
+    etag = response["ETag"]
+    assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+
+    with django_capture_on_commit_callbacks(execute=True):
+        product.name = "New name"
+        product.save()
+
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+    assert response.data["name"] == "New name"
+    assert response["ETag"] != etag
+
+
+@pytest.mark.django_db
+def test_product_list_view_cursor_pagination_walks_ties():
+    products = baker.make("main.Product", _quantity=5, is_active=True, views_count=3)
+    baker.make("main.Product", is_active=True, views_count=10)
+    client = APIClient()
+
+    url = "/uk/api/v1/products/?paginate=cursor&limit=2"
+    seen = []
+    while url:
+        response = client.get(url)
+        assert response.status_code == 200
+        assert "count" not in response.data
+        seen.extend(item["id"] for item in response.data["results"])
+        url = response.data["next"]
+
+    assert len(seen) == 6
+    assert seen[1:] == sorted(product.id for product in products)
+
+
+@pytest.mark.django_db
+def test_product_list_view_returns_requested_fields():
+    product = baker.make("main.Product", is_active=True, price="12.5", views_count=7)
+    baker.make("main.Product", is_active=True, views_count=3)
+    client = APIClient()
+
+    response = client.get("/uk/api/v1/products/")
+    assert (
+        response.data["results"][0]
+        == client.get(
+            f"/uk/api/v1/products/?fields={','.join(response.data['results'][0])}"
+        ).data["results"][0]
+    )
+    assert response.data["results"][0]["price"] == "12.50"
+
+    url = "/uk/api/v1/products/?paginate=cursor&limit=1&fields=price,id"
+    response = client.get(url)
+    assert response.data["results"] == [{"id": product.id, "price": "12.50"}]
+    assert len(client.get(response.data["next"]).data["results"]) == 1
+
+    response = client.get("/uk/api/v1/products/?fields=id,secret")
+    assert response.status_code == 400
+    assert "fields" in response.data
+
+
+@pytest.mark.django_db
+def test_product_detail_view_returns_requested_fields():
+    product = baker.make("main.Product", is_active=True, name="Phone")
+    client = APIClient()
+    url = f"/uk/api/v1/products/{product.id}/"
+
+    full = client.get(url)
+    assert "name_en" not in full.data
+
+    response = client.get(f"{url}?fields=name,views_count")
+    assert response.status_code == 200
+    assert response.data == {"name": "Phone", "views_count": 2}
+    assert response["ETag"] != full["ETag"]
+    assert (
+        client.get(f"{url}?fields=name", HTTP_IF_NONE_MATCH=full["ETag"]).status_code
+        == 200
+    )
+    assert client.get(f"{url}?fields=price,nope").status_code == 400
+
+
+@pytest.mark.django_db
+def test_product_export_streams_filtered_products():
+    category = baker.make("main.Category")
+    products = baker.make(
+        "main.Product", _quantity=3, is_active=True, category=category, price="5"
+    )
+    baker.make("main.Product", is_active=True)
+    baker.make("main.Product", is_active=False, category=category)
+    client = APIClient()
+    url = f"/uk/api/v1/products/export/?category={category.id}"
+
+    response = client.get(url, HTTP_ACCEPT="application/x-ndjson")
+    assert response.status_code == 200
+    assert response["Content-Type"] == "application/x-ndjson"
+    rows = [
+        json.loads(line) for line in b"".join(response.streaming_content).splitlines()
+    ]
+    assert sorted(row["id"] for row in rows) == sorted(p.id for p in products)
+    assert {row["price"] for row in rows} == {"5.00"}
+
+    response = client.get(f"{url}&output=csv&fields=id,price&gzip=1")
+    lines = gzip.decompress(b"".join(response.streaming_content)).decode().splitlines()
+    assert response["Content-Disposition"].endswith('products.csv.gz"')
+    assert lines[0] == "id,price"
+    assert len(lines) == 4
+
+    assert client.get(f"{url}&output=xml").status_code == 400
+
+
+@pytest.mark.django_db
+def test_product_batch_view_keeps_request_order_and_uses_the_detail_cache(
+    django_assert_num_queries, settings
+):
+    first, second = baker.make("main.Product", _quantity=2, is_active=True)
+    inactive = baker.make("main.Product", is_active=False)
+    ViewsCounter().increment(second.id)
+    client = APIClient()
+    url = f"/uk/api/v1/products/batch/?ids={second.id},{inactive.id},{first.id},{second.id}"
+
+    response = client.get(url)
+    assert response.status_code == 200
+    assert [item["id"] for item in response.data["results"]] == [second.id, first.id]
+    assert response.data["missing"] == [inactive.id]
+    assert response.data["results"][0]["views_count"] == second.views_count + 1
+
+    with django_assert_num_queries(0):
+        response = client.get(
+            f"/uk/api/v1/products/batch/?ids={second.id},{first.id}&fields=id,name"
+        )
+    assert response.data["results"][1] == {"id": first.id, "name": first.name}
+    assert ViewsCounter().pending([first.id]) == {first.id: 0}
+
+    response = client.get(
+        f"/uk/api/v1/products/batch/?ids={inactive.id}&fields=id,name"
+    )
+    assert response.status_code == 200
+    assert response.data == {"results": [], "missing": [inactive.id]}
+    assert (
+        client.get(f"/uk/api/v1/products/batch/?ids={first.id}&fields=id,x").status_code
+        == 400
+    )
+
+    settings.PRODUCT_BATCH_MAX_IDS = 2
+    assert client.get("/uk/api/v1/products/batch/?ids=1,2,3").status_code == 400
+    assert client.get("/uk/api/v1/products/batch/?ids=1,x").status_code == 400
+
+
+@pytest.mark.django_db
+def test_top_viewed_products_are_ranked_by_redis_leaderboards(
+    django_assert_num_queries,
+):
+    phones, laptops = baker.make("main.Category", _quantity=2)
+    laptop = baker.make(
+        "main.Product", is_active=True, category=laptops, views_count=100
+    )
+    phone = baker.make("main.Product", is_active=True, category=phones, views_count=5)
+    baker.make("main.Product", is_active=False, views_count=1000)
+    client = APIClient()
+    url = "/uk/api/v1/stats/top-viewed-products/"
+
+    response = client.get(url)
+    assert [item["id"] for item in response.data] == [laptop.id, phone.id]
+
+    leaderboard = ViewsLeaderboard()
+    assert leaderboard.build() == 2
+    for _ in range(3):
+        ViewsCounter().increment(phone.id, phones.id)
+
+    with django_assert_num_queries(1):
+        assert leaderboard.top(5) == [laptop, phone]
+
+    response = client.get(f"{url}?window=7")
+    assert [item["id"] for item in response.data] == [phone.id]
+    assert response.data[0]["views_count"] == 8
+
+    response = client.get(f"{url}?category_id={phones.id}&limit=5")
+    assert [item["id"] for item in response.data] == [phone.id]
+
+    laptop.is_active = False
+    laptop.save()
+    response = client.get(f"{url}?limit=1")
+    assert [item["id"] for item in response.data] == [phone.id]
+
+    assert client.get(f"{url}?window=3").status_code == 400
+    assert client.get(f"{url}?window=7&days=3").status_code == 400
+
+
+@pytest.mark.django_db
+def test_views_leaderboard_build_keeps_views_recorded_meanwhile(monkeypatch):
+    category = baker.make("main.Category")
+    phone = baker.make("main.Product", is_active=True, category=category, views_count=5)
+    leaderboard = ViewsLeaderboard()
+    leaderboard.build()
+    ViewsCounter().increment(phone.id, category.id)
+
+    leaderboard.build()
+    assert leaderboard.redis.zscore(ALL_TIME_KEY, phone.id) == 6
+
+    # A view landing after the snapshot but before the merge is kept.
+    leaderboard.redis.zunionstore(f"{ALL_TIME_KEY}:snapshot", [ALL_TIME_KEY])
+    ViewsCounter().increment(phone.id, category.id)
+    leaderboard._merge(ALL_TIME_KEY, {phone.id: 6})
+    assert leaderboard.redis.zscore(ALL_TIME_KEY, phone.id) == 7
+
+    def unavailable(*args, **kwargs):
+        raise ConnectionError("Redis is down")
+
+    monkeypatch.setattr(ViewsLeaderboard, "top", unavailable)
+    response = APIClient().get("/uk/api/v1/stats/top-viewed-products/")
+    assert [item["id"] for item in response.data] == [phone.id]
+
+
+@pytest.mark.django_db
+def test_product_list_view_without_count(monkeypatch):
+    baker.make("main.Product", _quantity=3, is_active=True)
+    client = APIClient()
+
+    response = client.get("/uk/api/v1/products/?count=none&limit=2")
+    assert response.data["count"] is None
+    assert len(response.data["results"]) == 2
+    assert response.data["next"]
+
+    response = client.get(response.data["next"])
+    assert len(response.data["results"]) == 1
+    assert response.data["next"] is None
+
+    response = client.get("/uk/api/v1/products/?count=estimate")
+    assert isinstance(response.data["count"], int)
+
+    # Links follow the rows actually found, whatever the planner estimates.
+    monkeypatch.setattr("api.v1.pagination.estimate_count", lambda queryset: 1)
+    response = client.get("/uk/api/v1/products/?count=estimate&limit=2")
+    assert response.data["count"] == 1
+    response = client.get(response.data["next"])
+    assert len(response.data["results"]) == 1
+    assert response.data["previous"]
+
+    monkeypatch.setattr("api.v1.pagination.estimate_count", lambda queryset: 100)
+    response = client.get("/uk/api/v1/products/?count=estimate&limit=3")
+    assert response.data["count"] == 100
+    assert response.data["next"] is None
+
+
+@pytest.mark.django_db
+def test_product_list_view_filters_by_all_attributes():
+    color = baker.make("main.Attribute", label="color")
+    size = baker.make("main.Attribute", label="size")
+    red = baker.make("main.AttributeValue", attribute=color, title="Red")
+    blue = baker.make("main.AttributeValue", attribute=color, title="Blue")
+    medium = baker.make("main.AttributeValue", attribute=size, title="M")
+
+    both, red_only, blue_medium = baker.make(
+        "main.Product", _quantity=3, is_active=True
+    )
+    for product, attribute, value in [
+        (both, color, red),
+        (both, size, medium),
+        (red_only, color, red),
+        (blue_medium, color, blue),
+        (blue_medium, size, medium),
+    ]:
+        baker.make(
+            "main.ProductAttribute", product=product, attribute=attribute, value=value
+        )
+
+    client = APIClient()
+    response = client.get("/uk/api/v1/products/?attrs=color:Red,Blue&attrs=size:M")
+    assert {item["id"] for item in response.data["results"]} == {
+        both.id,
+        blue_medium.id,
+    }
+
+    # Repeated parameters of one attribute are ANDed, not merged.
+    baker.make("main.ProductAttribute", product=both, attribute=color, value=blue)
+    response = client.get("/uk/api/v1/products/?attrs=color:Red&attrs=color:Blue")
+    assert [item["id"] for item in response.data["results"]] == [both.id]
+
+
+@pytest.mark.django_db
+def test_product_list_view_search_ranks_and_falls_back_to_trigrams():
+    in_name = baker.make(
+        "main.Product", is_active=True, name="Samsung Galaxy phone", views_count=1
+    )
+    in_description = baker.make(
+        "main.Product",
+        is_active=True,
+        name="Case",
+        description="Fits a Samsung phone",
+        views_count=100,
+    )
+    baker.make("main.Product", is_active=True, name="Apple iPhone")
+    client = APIClient()
+
+    response = client.get("/uk/api/v1/products/?search=samsung")
+    assert [item["id"] for item in response.data["results"]] == [
+        in_name.id,
+        in_description.id,
+    ]
+
+    response = client.get("/uk/api/v1/products/?search=galaxi")
+    assert [item["id"] for item in response.data["results"]] == [in_name.id]
+
+
+@pytest.mark.django_db
+def test_category_detail_view_cache_follows_data_changes(
+    django_capture_on_commit_callbacks,
+):
+    with django_capture_on_commit_callbacks(execute=True):
+        category = baker.make("main.Category", title="Кешовані", is_active=True)
+    Category.objects.rebuild()
+    client = APIClient()
+    url = f"/uk/api/v1/categories/{category.id}/"
+
+    first = client.get(url)
+    assert first["X-Cache"] == "MISS"
+    assert first.data["products"] == []
+
+    cached = client.get(url)
+    assert cached["X-Cache"] == "HIT"
+
+    with django_capture_on_commit_callbacks(execute=True):
+        product = baker.make("main.Product", category=category, is_active=True)
+
+    refreshed = client.get(url)
+    assert refreshed["X-Cache"] == "MISS"
+    assert [item["id"] for item in refreshed.data["products"]] == [product.id]
+
+    with django_capture_on_commit_callbacks(execute=True):
+        child = baker.make("main.Category", parent=category, is_active=True)
+    Category.objects.rebuild()
+    assert client.get(url)["X-Cache"] == "MISS"
+    assert client.get(url)["X-Cache"] == "HIT"
+
+    # A product of a descendant bumps the scopes of its ancestors.
+    with django_capture_on_commit_callbacks(execute=True):
+        nested = baker.make(
+            "main.Product", category=child, is_active=True, views_count=-1
+        )
+    refreshed = client.get(url)
+    assert refreshed["X-Cache"] == "MISS"
+    assert [item["id"] for item in refreshed.data["products"]] == [
+        product.id,
+        nested.id,
+    ]
+
+
+@pytest.mark.django_db
+def test_moving_a_product_invalidates_both_categories(
+    django_capture_on_commit_callbacks,
+):
+    old, new = baker.make("main.Category", _quantity=2)
+    product = baker.make("main.Product", category=old, status=Product.Status.DRAFT)
+    scopes = [category_scope(old.id), category_scope(new.id)]
+    before = CacheGenerations().get_many(scopes)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        product.category = new
+        product.save()
+
+    after = CacheGenerations().get_many(scopes)
+    assert all(after[scope] > before[scope] for scope in scopes)
+
+
+@pytest.mark.django_db
+def test_category_products_cover_the_subtree():
+    root = baker.make("main.Category", is_active=True)
+    child = baker.make("main.Category", parent=root, is_active=True)
+    Category.objects.rebuild()
+    first = baker.make("main.Product", category=root, is_active=True, views_count=30)
+    second = baker.make("main.Product", category=child, is_active=True, views_count=20)
+    third = baker.make("main.Product", category=child, is_active=True, views_count=10)
+    baker.make("main.Product", category=child, is_active=False, views_count=40)
+    client = APIClient()
+
+    response = client.get(f"/uk/api/v1/categories/{root.id}/products/?limit=2")
+    assert [item["id"] for item in response.data["results"]] == [first.id, second.id]
+    response = client.get(response.data["next"])
+    assert [item["id"] for item in response.data["results"]] == [third.id]
+    assert response.data["next"] is None
+
+    detail = client.get(f"/uk/api/v1/categories/{root.id}/?limit=1")
+    assert [item["id"] for item in detail.data["products"]] == [first.id]
+    assert f"/categories/{root.id}/products/?" in detail.data["products_next"]
+    response = client.get(detail.data["products_next"])
+    assert [item["id"] for item in response.data["results"]] == [second.id]
+    assert response.data["next"] is not None
+
+    response = client.get(f"/uk/api/v1/categories/{child.id}/products/")
+    assert [item["id"] for item in response.data["results"]] == [second.id, third.id]
+
+
+@pytest.mark.django_db
+def test_category_tree_view_serves_gzipped_tree_with_etag(
+    django_capture_on_commit_callbacks,
+):
+    with django_capture_on_commit_callbacks(execute=True):
+        root = baker.make("main.Category", title="Електроніка", is_active=True)
+        child = baker.make("main.Category", title="Телефони", parent=root)
+        baker.make("main.Category", title="Приховані", parent=root, is_active=False)
+    Category.objects.rebuild()
+    client = APIClient()
+
+    response = client.get("/uk/api/v1/categories/tree/", HTTP_ACCEPT_ENCODING="gzip")
+    assert response["Content-Encoding"] == "gzip"
+    tree = json.loads(gzip.decompress(response.content))
+    node = next(item for item in tree if item["id"] == root.id)
+    assert node["title"] == "Електроніка"
+    assert [item["id"] for item in node["children"]] == [child.id]
+
+    gzip_etag = response["ETag"]
+    assert gzip_etag.endswith('-gz"')
+    response = client.get(
+        "/uk/api/v1/categories/tree/",
+        HTTP_ACCEPT_ENCODING="gzip",
+        HTTP_IF_NONE_MATCH=f'"other", {gzip_etag}',
+    )
+    assert response.status_code == 304
+
+    response = client.get("/uk/api/v1/categories/tree/", HTTP_IF_NONE_MATCH=gzip_etag)
+    assert response.status_code == 200
+    etag = response["ETag"]
+    assert etag != gzip_etag
+    response = client.get("/uk/api/v1/categories/tree/", HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 304
+    response = client.get("/uk/api/v1/categories/tree/", HTTP_IF_NONE_MATCH=f"W/{etag}")
+    assert response.status_code == 304
+
+    with django_capture_on_commit_callbacks(execute=True):
+        child.title = "Смартфони"
+        child.save()
+    response = client.get("/uk/api/v1/categories/tree/", HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+    assert response["ETag"] != etag
+    assert "Смартфони" in response.content.decode()